@@ -6,6 +6,7 @@ from vani.audio import record_audio_block, save_wav_temp, speak, set_language_co
 from vani.commands import handle_text_command
 from vani.wake import wait_for_wake
 from vani.stt import transcribe_audio_with_lang
+from vani.stt_stream import listen, stream_available
 
 
 def wake_word_loop():
@@ -20,6 +21,18 @@ def wake_word_loop():
 def active_session_loop(active_until_ts: float):
     while time.time() < active_until_ts:
         speak("I'm listening.")
+        if stream_available():
+            # Recognized while spoken and finished at end of speech instead of a fixed 5 s clip
+            hyp = listen(timeout=5.0)
+            text, lang_code = (hyp.text, hyp.language) if hyp else ("", None)
+            print(f"Heard: {text} | language_code={lang_code}")
+            if not text:
+                speak("Sorry, I didn't catch that.")
+                continue
+            if lang_code:
+                set_language_code(lang_code)
+            handle_text_command(text)
+            continue
         audio = record_audio_block(duration_sec=5.0)
         tmp = "./active.wav"
         save_wav_temp(audio, tmp)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Load test: async /github/repos vs the previous blocking (sync def + requests) route.
+
+Starts a fake GitHub API with fixed latency and the vani FastAPI app (uvicorn) in separate
+processes, then drives both routes with the same concurrency from this process. Example:
+
+    python bench/bench_api_github.py --concurrency 200 --requests 2000 --latency 0.1
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve_fake_github(port: int, latency: float) -> None:
+    body = json.dumps([{"full_name": f"bench/repo-{i}", "name": f"repo-{i}"} for i in range(20)]).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        # listen() backlog; the default of 5 drops connection bursts
+        request_queue_size = 1024
+
+    Server(("127.0.0.1", port), Handler).serve_forever()
+
+
+def serve_api(port: int, github_port: int, concurrency: int) -> None:
+    # Configure vani before import: fake upstream, no caching so every call reaches it
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{github_port}"
+    os.environ["GITHUB_TOKEN"] = "bench-token"
+    os.environ["GITHUB_CACHE_TTL"] = "0"
+    os.environ.setdefault("GITHUB_POOL_SIZE", "40")
+    os.environ.setdefault("GITHUB_ASYNC_MAX_CONNECTIONS", str(concurrency))
+    sys.path.insert(0, ROOT)
+
+    import uvicorn
+    from vani.api import app
+    from vani.github_client import get_client
+
+    @app.get("/bench/sync-repos")
+    def sync_repos():
+        # The pre-async route shape: sync def on Starlette's threadpool, blocking requests call
+        r = get_client().get("/user/repos")
+        return {"ok": True, "repos": r.json()}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=60, backlog=4096)
+
+
+async def wait_ready(url: str) -> None:
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def hammer(url: str, total: int, concurrency: int) -> float:
+    import httpx
+
+    gate = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def one():
+            async with gate:
+                r = await client.get(url)
+                r.raise_for_status()
+
+        # Warm up connections on both sides before timing
+        await asyncio.gather(*(one() for _ in range(min(concurrency, total))))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.1, help="fake GitHub latency per call (s)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--github-port", type=int, default=8766)
+    args = parser.parse_args()
+
+    procs = [
+        multiprocessing.Process(target=serve_fake_github, args=(args.github_port, args.latency), daemon=True),
+        multiprocessing.Process(target=serve_api, args=(args.port, args.github_port, args.concurrency), daemon=True),
+    ]
+    for p in procs:
+        p.start()
+    try:
+        base = f"http://127.0.0.1:{args.port}"
+        asyncio.run(wait_ready(f"{base}/healthz"))
+        print(f"fake GitHub latency={args.latency}s concurrency={args.concurrency} requests={args.requests}")
+        sync_rps = asyncio.run(hammer(f"{base}/bench/sync-repos", args.requests, args.concurrency))
+        print(f"sync  (threadpool) /bench/sync-repos : {sync_rps:8.1f} req/s")
+        async_rps = asyncio.run(hammer(f"{base}/github/repos", args.requests, args.concurrency))
+        print(f"async (httpx)      /github/repos     : {async_rps:8.1f} req/s")
+        print(f"speedup: {async_rps / sync_rps:.2f}x")
+    finally:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
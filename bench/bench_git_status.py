@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark git status on a large synthetic repo: human `git status` vs porcelain v2 parsing,
+with and without the untracked cache / fsmonitor. Example:
+
+    python bench/bench_git_status.py --files 100000 --repeat 5
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def build_repo(path: str, files: int, per_dir: int, modified: int, untracked: int) -> None:
+    subprocess.run(["git", "init", "-q", path], check=True)
+    for i in range(files):
+        d = os.path.join(path, f"d{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"f{i:07d}.txt"), "w") as f:
+            f.write(f"file {i}\n")
+    subprocess.run(["git", "add", "-A"], cwd=path, check=True, env=_ENV)
+    subprocess.run(["git", "commit", "-q", "-m", "bench"], cwd=path, check=True, env=_ENV)
+    step = max(1, files // max(1, modified))
+    for i in range(0, min(files, modified * step), step):
+        with open(os.path.join(path, f"d{i // per_dir:05d}", f"f{i:07d}.txt"), "a") as f:
+            f.write("changed\n")
+    os.makedirs(os.path.join(path, "new"), exist_ok=True)
+    for i in range(untracked):
+        with open(os.path.join(path, "new", f"u{i}.txt"), "w") as f:
+            f.write("new\n")
+
+
+def timed(fn, repeat: int) -> float:
+    fn()  # warm the page cache and the index stat data
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--per-dir", type=int, default=500)
+    parser.add_argument("--modified", type=int, default=50)
+    parser.add_argument("--untracked", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--repo", help="benchmark an existing repo instead of building one")
+    args = parser.parse_args()
+
+    from vani.git_status import read_status
+    from vani.repo_pool import get_repo
+
+    tmp = None
+    path = args.repo
+    if not path:
+        tmp = tempfile.mkdtemp(prefix="vani-status-bench-")
+        path = os.path.join(tmp, "repo")
+        started = time.perf_counter()
+        build_repo(path, args.files, args.per_dir, args.modified, args.untracked)
+        print(f"built {args.files} files in {time.perf_counter() - started:.1f}s at {path}")
+    try:
+        repo = get_repo(path)
+        status = read_status(path, untracked_cache=False, fsmonitor=False)
+        print(f"status: {status.summary()}")
+        cases = [
+            ("git status (human, previous)", lambda: repo.git.status()),
+            ("porcelain v2 + parse", lambda: read_status(path, untracked_cache=False, fsmonitor=False)),
+            ("porcelain v2 + untracked cache", lambda: read_status(path, untracked_cache=True, fsmonitor=False)),
+            ("porcelain v2 + untracked cache + fsmonitor", lambda: read_status(path, untracked_cache=True, fsmonitor=True)),
+        ]
+        for name, fn in cases:
+            print(f"{name:45s} {timed(fn, args.repeat):8.1f} ms (median of {args.repeat})")
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Compare intent prompt profiles: prompt size, completion tokens, latency and intent accuracy.
+
+Prompt sizes are always reported (tiktoken counts when installed, else ~4 chars per token).
+Latency and accuracy need SARVAM_API_KEY and/or OPENAI_API_KEY; each configured backend is
+measured separately. Example:
+
+    python bench/bench_intent_prompts.py --repeat 3 --profiles legacy,compact,minimal
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (utterance, expected intent, expected operation or None)
+SAMPLES = [
+    ("git status", "git_operation", "status"),
+    ("commit with message fix login bug", "git_operation", "commit"),
+    ("push my changes", "git_operation", "push"),
+    ("switch to branch feature/login", "git_operation", "checkout"),
+    ("fetch all repos in my workspace", "git_operation", "workspace_fetch"),
+    ("list open pull requests", "github_operation", "list_prs"),
+    ("merge pull request 42", "github_operation", "merge_pr"),
+    ("create a private repo called voice-demo", "github_operation", "create_repo"),
+    ("close issue 7", "github_operation", "close_issue"),
+    ("create a react vite app in typescript called shop", "terminal_task", None),
+    ("stage everything, commit with message tidy up and push", "plan", None),
+    ("what's the weather like", "misc", None),
+]
+
+
+def count_tokens(text: str) -> int:
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        return max(1, len(text) // 4)
+
+
+def _matches(parsed, intent: str, operation) -> bool:
+    if parsed.intent != intent:
+        return False
+    return operation is None or parsed.args.get("operation") == operation
+
+
+def bench_backend(name, call, profile, repeat: int) -> dict:
+    from vani.intent import _intent_from_content
+
+    latencies, completion, correct, errors = [], [], 0, 0
+    for _ in range(repeat):
+        for text, intent, operation in SAMPLES:
+            t0 = time.perf_counter()
+            try:
+                content, usage = call(profile, text)
+            except Exception as e:
+                errors += 1
+                print(f"  {name}/{profile.name} error on {text!r}: {e}")
+                continue
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if usage.get("completion_tokens") is not None:
+                completion.append(usage["completion_tokens"])
+            correct += _matches(_intent_from_content(content or ""), intent, operation)
+    runs = repeat * len(SAMPLES)
+    return {
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 1) if latencies else None,
+        "completion_tokens": round(statistics.mean(completion), 1) if completion else None,
+        "accuracy": round(correct / runs, 3) if runs else None,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default="legacy,compact,minimal")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    from vani import intent as intent_mod
+    from vani.prompts import PROFILES
+
+    profiles = [PROFILES[p.strip()] for p in args.profiles.split(",") if p.strip()]
+    print(f"{'profile':<10} {'system tokens':>13} {'user tokens':>11} {'max_tokens':>10} {'json':>5}")
+    for p in profiles:
+        user = statistics.mean(count_tokens(p.user(t)) for t, _, _ in SAMPLES)
+        print(f"{p.name:<10} {count_tokens(p.system):>13} {user:>11.1f} {p.max_tokens:>10} {str(p.json_mode):>5}")
+
+    backends = []
+    if intent_mod.sarvam_client is not None:
+        backends.append(("sarvam", intent_mod._sarvam_content))
+    if intent_mod.client is not None:
+        backends.append(("openai", intent_mod._openai_content))
+    if not backends:
+        print("\nNo LLM backend configured (SARVAM_API_KEY / OPENAI_API_KEY); skipping latency runs.")
+        return
+    print(f"\n{'backend':<8} {'profile':<10} {'p50 ms':>8} {'p95 ms':>8} {'compl tok':>9} {'accuracy':>8} {'errors':>6}")
+    for name, call in backends:
+        for p in profiles:
+            r = bench_backend(name, call, p, args.repeat)
+            print(
+                f"{name:<8} {p.name:<10} {str(r['p50_ms']):>8} {str(r['p95_ms']):>8} "
+                f"{str(r['completion_tokens']):>9} {str(r['accuracy']):>8} {r['errors']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Time from end of speech to the final transcript: batch STT on the finished utterance vs the
+streaming recognizer fed in real time. Needs a 16 kHz mono WAV of one spoken command and a
+configured backend (local Whisper, or SARVAM_API_KEY for --backend sarvam). Example:
+
+    python bench/bench_stt_stream.py command.wav --backend whisper --repeat 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def run_stream(audio: np.ndarray, backend: str, block_ms: int, realtime: bool):
+    from vani.config import SAMPLE_RATE
+    from vani.stt_stream import open_stream
+
+    rec = open_stream(backend)
+    if rec is None:
+        sys.exit(f"no streaming backend for '{backend}' (install openai-whisper or use Sarvam streaming)")
+    block = SAMPLE_RATE * block_ms // 1000
+    partials, first = 0, None
+    t0 = time.perf_counter()
+    for i in range(0, len(audio), block):
+        rec.feed(audio[i:i + block])
+        hyp = rec.partial()
+        if hyp is not None:
+            partials += 1
+            first = first if first is not None else (time.perf_counter() - t0) * 1000
+        if realtime:
+            # Sleep out the rest of the block so decoding overlaps with "speaking" as it would live
+            lag = (i + block) / SAMPLE_RATE - (time.perf_counter() - t0)
+            if lag > 0:
+                time.sleep(lag)
+    end = time.perf_counter()
+    final = rec.finish()
+    return final, (time.perf_counter() - end) * 1000, partials, first
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav")
+    parser.add_argument("--backend", default="auto", help="auto, sarvam or whisper")
+    parser.add_argument("--block-ms", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-realtime", action="store_true", help="feed as fast as possible")
+    args = parser.parse_args()
+
+    from vani.stt import transcribe_array
+
+    audio, sr = sf.read(args.wav, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if sr != 16000:
+        sys.exit(f"expected 16 kHz audio, got {sr} Hz")
+    # Trailing silence as the endpointer would see it before declaring end of speech
+    audio = np.concatenate([audio, np.zeros(int(0.7 * sr), dtype=np.float32)])
+
+    batch_ms, stream_ms = [], []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        text, _ = transcribe_array(audio)
+        batch_ms.append((time.perf_counter() - t0) * 1000)
+        final, ms, partials, first = run_stream(audio, args.backend, args.block_ms, not args.no_realtime)
+        stream_ms.append(ms)
+        print(f"batch:  {text!r}")
+        print(f"stream: {final.text!r} ({final.backend}, {partials} partials, first after {first and round(first)} ms)")
+    print(f"\n{'mode':<8} {'p50 ms after end of speech':>27}")
+    print(f"{'batch':<8} {statistics.median(batch_ms):>27.1f}")
+    print(f"{'stream':<8} {statistics.median(stream_ms):>27.1f}")
+
+
+if __name__ == "__main__":
+    main()
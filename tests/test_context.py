@@ -0,0 +1,27 @@
+from vani.context import SessionContext, fill_args
+
+
+def _ctx():
+    ctx = SessionContext()
+    ctx.remember(owner="me", repo="x", pr_number=12, issue_number=3)
+    return ctx
+
+
+def test_follow_up_fills_repo_and_number():
+    args = {"operation": "merge_pr"}
+    fill_args("github_operation", args, _ctx())
+    assert args == {"operation": "merge_pr", "owner": "me", "repo": "x", "number": 12}
+
+
+def test_number_is_not_applied_to_another_repo():
+    merge = {"operation": "merge_pr", "owner": "me", "repo": "y"}
+    close = {"operation": "close_issue", "owner": "other", "repo": "x"}
+    fill_args("github_operation", merge, _ctx())
+    fill_args("github_operation", close, _ctx())
+    assert "number" not in merge and "number" not in close
+
+
+def test_number_fills_when_the_named_repo_is_the_remembered_one():
+    args = {"operation": "close_issue", "owner": "Me", "repo": "X"}
+    fill_args("github_operation", args, _ctx())
+    assert args["number"] == 3
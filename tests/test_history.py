@@ -0,0 +1,22 @@
+from vani.history import CommandHistory
+from vani.intent import ParsedIntent
+
+
+def _history(tmp_path):
+    return CommandHistory(path=str(tmp_path / "history.jsonl"), max_entries=10)
+
+
+def test_last_is_per_session(tmp_path):
+    h = _history(tmp_path)
+    h.add("open vs code", ParsedIntent("open_app", {"app": "vscode"}))
+    h.add("push", ParsedIntent("git_operation", {"operation": "push"}), session_id="api-1")
+    assert h.last()["text"] == "open vs code"
+    assert h.last("default")["text"] == "open vs code"
+    assert h.last("api-1")["text"] == "push"
+
+
+def test_session_without_history_gets_none(tmp_path):
+    h = _history(tmp_path)
+    h.add("delete the branch", ParsedIntent("git_operation", {"operation": "delete_branch"}), session_id="api-1")
+    assert h.last() is None
+    assert h.last("api-2") is None
@@ -0,0 +1,17 @@
+from vani.intent import _heuristic_plan
+
+
+def test_chained_commands_become_a_plan():
+    parsed = _heuristic_plan("stage everything, commit with message tidy up and push")
+    assert parsed.intent == "plan"
+    assert [s["args"]["operation"] for s in parsed.args["steps"]] == ["add", "commit", "push"]
+
+
+def test_partly_understood_chain_is_not_reduced_to_its_last_verb():
+    parsed = _heuristic_plan("open a pr and merge it")
+    assert parsed.intent == "misc"
+    assert "open a pr" in parsed.args["error"]
+
+
+def test_single_command_is_unchanged():
+    assert _heuristic_plan("merge pull request 42").args == {"operation": "merge_pr", "number": 42}
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from vani.macros import MacroRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    # No macros file: the built-in defaults are used
+    return MacroRegistry(path=os.path.join(tmp_path, "missing.json"), threshold=0.85)
+
+
+@pytest.mark.parametrize("text", ["skip it", "chip it", "sip it", "okay skip it", "shop it", "sink", "sync it up now please"])
+def test_near_misses_do_not_trigger_builtin_macros(registry, text):
+    assert registry.match(text) is None
+
+
+@pytest.mark.parametrize("text, name", [("ship it", "ship"), ("hello vani, ship it please", "ship"), ("Sync up.", "sync")])
+def test_exact_triggers_still_match(registry, text, name):
+    macro, score = registry.match(text)
+    assert (macro.name, score) == (name, 1.0)
+
+
+def test_user_macros_match_fuzzily_on_the_same_first_word(tmp_path):
+    path = tmp_path / "macros.json"
+    path.write_text('[{"name": "deploy", "triggers": ["deploy staging"], "steps": [{"intent": "misc"}]}]')
+    registry = MacroRegistry(path=str(path), threshold=0.85)
+    assert registry.match("deploy stagin")[0].name == "deploy"
+    assert registry.match("redeploy staging") is None
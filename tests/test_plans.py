@@ -0,0 +1,25 @@
+import subprocess
+
+from vani.intent import ParsedIntent
+from vani.plans import ordering_key
+
+
+def test_create_repo_and_push_share_a_lane(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    create = ParsedIntent("github_operation", {"operation": "create_repo", "name": "foo"})
+    link = ParsedIntent("github_operation", {"operation": "link_remote", "owner": "me", "name": "foo"})
+    push = ParsedIntent("git_operation", {"operation": "push"})
+    assert ordering_key(create) == ordering_key(link) == ordering_key(push) is not None
+
+
+def test_checkout_git_ops_share_a_lane_with_its_github_repo(tmp_path, monkeypatch):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "remote", "add", "origin", "git@github.com:Me/X.git"], check=True)
+    monkeypatch.chdir(tmp_path)
+    push = ParsedIntent("git_operation", {"operation": "push"})
+    pr = ParsedIntent("github_operation", {"operation": "create_pr", "owner": "me", "repo": "x"})
+    assert ordering_key(push) == ordering_key(pr) == "github:me/x"
+
+
+def test_list_repos_is_independent():
+    assert ordering_key(ParsedIntent("github_operation", {"operation": "list_repos"})) is None
@@ -0,0 +1,29 @@
+import pytest
+
+from vani import stt_stream
+
+
+@pytest.fixture
+def no_backends(monkeypatch):
+    monkeypatch.setattr(stt_stream, "sarvam_streaming_available", lambda: False)
+    monkeypatch.setattr(stt_stream, "whisper_available", lambda: False)
+
+
+def test_no_recognizer_without_a_backend(no_backends):
+    # The wake and command loops keep the fixed-clip path when nothing can stream
+    assert stt_stream.streaming_enabled("auto")
+    assert not stt_stream.stream_available("auto")
+    assert stt_stream.open_stream("auto") is None
+
+
+def test_whisper_backend_streams(no_backends, monkeypatch):
+    monkeypatch.setattr(stt_stream, "whisper_available", lambda: True)
+    assert stt_stream.stream_available("auto")
+    assert not stt_stream.stream_available("sarvam")
+    assert not stt_stream.stream_available("off")
+    assert isinstance(stt_stream.open_stream("whisper"), stt_stream.WhisperWindowRecognizer)
+
+
+def test_recognizer_must_implement_finish():
+    with pytest.raises(TypeError):
+        stt_stream.StreamingRecognizer()
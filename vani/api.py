@@ -1,28 +1,41 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import uuid
+from functools import partial
+
+from fastapi import FastAPI, HTTPException, Header, WebSocket
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
 from .commands import handle_text_command
+from .context import drop_context, get_context
+from .history import get_history
+from .macros import get_registry
+from .intent import get_router
 from .git_ops import perform_git_operation
 from .terminal_ops import run_terminal_task
-from .github_ops import (
-    create_repo,
-    delete_repo,
-    link_remote,
-    list_repos,
-    list_open_prs,
-    create_pull_request,
-    merge_pull_request,
-    list_issues,
-    create_issue,
-    close_issue,
-)
+from .executors import PtyExecutor, get_executor
+from .scaffold_cache import get_cache as get_scaffold_cache
+from .clarify import clarify_stats
+from .github_ops import link_remote, client_stats
+from . import github_async as gh
+from .github_client import close_async_client, get_async_client
+from .pools import GIT_EXECUTOR, run_in, shutdown as shutdown_pools
+from .jobs import Job, QueueFull, get_manager
+from .voice_ws import voice_endpoint
+from .batch import run_batch
+from .repo_locks import lock_stats
+from .workspace import OPERATIONS as WORKSPACE_OPERATIONS, discover_repos, index_stats, workspace_root
+from .config import BATCH_MAX_ITEMS
 
 app = FastAPI(title="Vani Agent API", version="0.1.0")
 
 
 class TextCommand(BaseModel):
     text: str
+    # Follow-ups ("merge it") in the same session reuse the repo, branch and numbers named earlier
+    session_id: Optional[str] = None
 
 
 class GitOp(BaseModel):
@@ -40,6 +53,23 @@ class TerminalTask(BaseModel):
     command: Optional[str] = None
 
 
+class WorkspaceOp(BaseModel):
+    operation: str = "status"
+    root: Optional[str] = None
+    timeout: Optional[float] = None
+
+
+class BatchItem(BaseModel):
+    text: Optional[str] = None
+    intent: Optional[str] = None
+    args: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    concurrency: Optional[int] = None
+
+
 class CreateRepo(BaseModel):
     name: str
     private: Optional[bool] = True
@@ -108,84 +138,285 @@ def healthz() -> Dict[str, Any]:
     return {"status": "healthy"}
 
 
-@app.post("/command")
-def command(cmd: TextCommand) -> Dict[str, Any]:
-    handle_text_command(cmd.text)
-    return {"ok": True}
+def _enqueue(kind: str, fn, arg: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue fn(arg) as a background job and return where to follow it."""
+    try:
+        job = get_manager().submit(kind, fn, arg, params=params)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "ok": True,
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+    }
 
 
-@app.post("/git")
-def git(op: GitOp) -> Dict[str, Any]:
-    perform_git_operation(op.dict())
-    return {"ok": True}
+@app.post("/command", status_code=202)
+async def command(cmd: TextCommand, x_session_id: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    # Callers without a session get their own, so they never share context or "repeat" history
+    # with the local agent; pass the returned session_id back to continue the conversation
+    session_id = cmd.session_id or x_session_id or f"api-{uuid.uuid4().hex[:12]}"
+    return {
+        **_enqueue(
+            "command", partial(handle_text_command, session_id=session_id), cmd.text, {"text": cmd.text, "session_id": session_id}
+        ),
+        "session_id": session_id,
+    }
 
 
-@app.post("/terminal")
-def terminal(task: TerminalTask) -> Dict[str, Any]:
-    run_terminal_task(task.dict())
-    return {"ok": True}
+@app.get("/macros")
+def macros() -> Dict[str, Any]:
+    """Macro triggers matched locally before intent parsing."""
+    return {"ok": True, "macros": get_registry().list()}
+
+
+@app.get("/llm/router")
+def llm_router() -> Dict[str, Any]:
+    """Per-backend EWMA latency and error rates plus the most recent routing decisions."""
+    router = get_router()
+    if router is None:
+        return {"ok": True, "backends": [], "note": "no LLM backend configured; intents use heuristics"}
+    return {"ok": True, **router.stats()}
+
+
+@app.get("/history")
+def history(limit: int = 20) -> Dict[str, Any]:
+    """Recently parsed commands; 'repeat last' replays the newest one for the session."""
+    return {"ok": True, "commands": get_history().recent(max(1, min(limit, 200)))}
+
+
+@app.get("/sessions/{session_id}/context")
+def session_context(session_id: str) -> Dict[str, Any]:
+    """Entities the session's follow-up commands can refer to, with seconds until each expires."""
+    return {"ok": True, "session_id": session_id, "context": get_context(session_id).snapshot()}
+
+
+@app.delete("/sessions/{session_id}/context")
+def clear_session_context(session_id: str) -> Dict[str, Any]:
+    return {"ok": True, "session_id": session_id, "dropped": drop_context(session_id)}
+
+
+@app.post("/commands/batch")
+async def commands_batch(req: BatchRequest) -> Dict[str, Any]:
+    """Run many commands in one request; same-repo items keep submission order."""
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"at most {BATCH_MAX_ITEMS} items per batch")
+    items = []
+    for i, item in enumerate(req.items):
+        if not item.text and not item.intent:
+            raise HTTPException(status_code=422, detail=f"item {i} needs 'text' or 'intent'")
+        items.append(item.dict())
+    return await run_batch(items, req.concurrency)
+
+
+@app.post("/git", status_code=202)
+async def git(op: GitOp) -> Dict[str, Any]:
+    payload = op.dict()
+    return _enqueue("git", perform_git_operation, payload, payload)
+
+
+@app.get("/git/locks")
+def git_locks() -> Dict[str, Any]:
+    """Per-repo lock contention: acquisitions, waits, timeouts and current holders."""
+    return {"ok": True, **lock_stats()}
+
+
+@app.get("/workspace/repos")
+def workspace_repos(root: Optional[str] = None) -> Dict[str, Any]:
+    """Repos discovered under the workspace root (served from the mtime-refreshed index)."""
+    repos = discover_repos(root)
+    return {"ok": True, "root": workspace_root(root), "count": len(repos), "repos": repos, "index": index_stats()}
+
+
+@app.post("/workspace", status_code=202)
+async def workspace(op: WorkspaceOp) -> Dict[str, Any]:
+    """status/fetch/pull across all repos under root; the job result is the aggregated report."""
+    if op.operation not in WORKSPACE_OPERATIONS:
+        raise HTTPException(status_code=422, detail=f"operation must be one of {sorted(WORKSPACE_OPERATIONS)}")
+    payload = {**op.dict(), "operation": f"workspace_{op.operation}"}
+    return _enqueue("workspace", perform_git_operation, payload, payload)
+
+
+@app.post("/terminal", status_code=202)
+async def terminal(task: TerminalTask) -> Dict[str, Any]:
+    payload = task.dict()
+    return _enqueue("terminal", run_terminal_task, payload, payload)
+
+
+def _pty_executor() -> PtyExecutor:
+    executor = get_executor()
+    if not isinstance(executor, PtyExecutor):
+        raise HTTPException(status_code=409, detail=f"the {executor.name} backend does not track services")
+    return executor
+
+
+@app.get("/terminal/services")
+def terminal_services() -> Dict[str, Any]:
+    """Long-running steps (dev servers) left running by the PTY backend."""
+    return {"ok": True, "services": _pty_executor().services()}
+
+
+@app.post("/terminal/services/{pid}/stop")
+def stop_terminal_service(pid: int) -> Dict[str, Any]:
+    service = _pty_executor().stop_service(pid)
+    if service is None:
+        raise HTTPException(status_code=404, detail="service not found")
+    return {"ok": True, "service": service}
+
+
+@app.get("/terminal/scaffolds")
+def terminal_scaffolds() -> Dict[str, Any]:
+    """Cached Vite/Next scaffolds with hit/miss/fill/eviction counters."""
+    return {"ok": True, **get_scaffold_cache().info()}
+
+
+@app.get("/clarify/stats")
+def clarify_metrics() -> Dict[str, Any]:
+    """Listen rounds spent filling missing details, per task."""
+    return {"ok": True, "tasks": clarify_stats()}
+
+
+@app.get("/jobs/metrics")
+def jobs_metrics() -> Dict[str, Any]:
+    return {"ok": True, "jobs": get_manager().metrics()}
+
+
+def _get_job(job_id: str) -> Job:
+    job = get_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str, events: bool = False) -> Dict[str, Any]:
+    return {"ok": True, "job": _get_job(job_id).to_dict(include_events=events)}
+
+
+@app.post("/jobs/{job_id}/cancel")
+def job_cancel(job_id: str) -> Dict[str, Any]:
+    job = _get_job(job_id)
+    get_manager().cancel(job_id)
+    return {"ok": True, "job": job.to_dict()}
+
+
+async def _sse_stream(job: Job, start: int):
+    seq = start
+    idle = 0.0
+    while True:
+        batch = job.events_since(seq)
+        for event in batch:
+            seq = event["seq"] + 1
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+            if event["type"] == "finished":
+                return
+        if batch:
+            idle = 0.0
+        else:
+            await asyncio.sleep(0.1)
+            idle += 0.1
+            if idle >= 15:
+                # Comment line keeps proxies from closing a quiet stream
+                yield ": keep-alive\n\n"
+                idle = 0.0
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, last_event_id: Optional[str] = Header(default=None)) -> StreamingResponse:
+    """Server-Sent Events: queued/started/intent/spoken/progress/finished for one job."""
+    job = _get_job(job_id)
+    start = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+    return StreamingResponse(
+        _sse_stream(job, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/ws/voice")
+async def ws_voice(ws: WebSocket) -> None:
+    """Stream 16 kHz int16 PCM in; receive VAD, partial/final transcripts, intent and job results."""
+    await voice_endpoint(ws)
 
 
 @app.post("/github/create")
-def github_create(req: CreateRepo) -> Dict[str, Any]:
-    result = create_repo(name=req.name, private=req.private, org=req.org, description=req.description)
+async def github_create(req: CreateRepo) -> Dict[str, Any]:
+    result = await gh.create_repo(name=req.name, private=req.private, org=req.org, description=req.description)
     owner = result.get("owner", {}).get("login")
     if req.repo_path:
-        link_remote(repo_path=req.repo_path, owner=owner, name=req.name, protocol=req.protocol)
+        await run_in(GIT_EXECUTOR, link_remote, repo_path=req.repo_path, owner=owner, name=req.name, protocol=req.protocol)
     return {"ok": True, "repo": result}
 
 
 @app.post("/github/delete")
-def github_delete(req: DeleteRepo) -> Dict[str, Any]:
+async def github_delete(req: DeleteRepo) -> Dict[str, Any]:
     if not req.confirm:
         return {"ok": False, "error": "confirm must be true"}
-    delete_repo(owner=req.owner, name=req.name)
+    await gh.delete_repo(owner=req.owner, name=req.name)
     return {"ok": True}
 
 
 @app.post("/github/link")
-def github_link(req: LinkRemote) -> Dict[str, Any]:
-    url = link_remote(repo_path=req.repo_path, owner=req.owner, name=req.name, protocol=req.protocol)
+async def github_link(req: LinkRemote) -> Dict[str, Any]:
+    url = await run_in(GIT_EXECUTOR, link_remote, repo_path=req.repo_path, owner=req.owner, name=req.name, protocol=req.protocol)
     return {"ok": True, "remote_url": url}
 
 
 @app.get("/github/repos")
-def github_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> Dict[str, Any]:
-    repos = list_repos(org=org, visibility=visibility)
+async def github_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> Dict[str, Any]:
+    repos = await gh.list_repos(org=org, visibility=visibility)
     return {"ok": True, "repos": repos}
 
 
 @app.get("/github/prs")
-def github_prs(owner: str, repo: str) -> Dict[str, Any]:
-    prs = list_open_prs(owner, repo)
+async def github_prs(owner: str, repo: str) -> Dict[str, Any]:
+    prs = await gh.list_open_prs(owner, repo)
     return {"ok": True, "prs": prs}
 
 
 @app.post("/github/prs")
-def github_create_pr(req: PRCreate) -> Dict[str, Any]:
-    pr = create_pull_request(req.owner, req.repo, req.title, req.head, req.base, req.body)
+async def github_create_pr(req: PRCreate) -> Dict[str, Any]:
+    pr = await gh.create_pull_request(req.owner, req.repo, req.title, req.head, req.base, req.body)
     return {"ok": True, "pr": pr}
 
 
 @app.post("/github/prs/merge")
-def github_merge_pr(req: PRMerge) -> Dict[str, Any]:
-    result = merge_pull_request(req.owner, req.repo, req.number, req.commit_title)
+async def github_merge_pr(req: PRMerge) -> Dict[str, Any]:
+    result = await gh.merge_pull_request(req.owner, req.repo, req.number, req.commit_title)
     return {"ok": True, "result": result}
 
 
 @app.get("/github/issues")
-def github_list_issues(owner: str, repo: str, state: Optional[str] = "open") -> Dict[str, Any]:
-    issues = list_issues(owner, repo, state)
+async def github_list_issues(owner: str, repo: str, state: Optional[str] = "open") -> Dict[str, Any]:
+    issues = await gh.list_issues(owner, repo, state)
     return {"ok": True, "issues": issues}
 
 
 @app.post("/github/issues")
-def github_create_issue(req: IssueCreate) -> Dict[str, Any]:
-    issue = create_issue(req.owner, req.repo, req.title, req.body, req.labels)
+async def github_create_issue(req: IssueCreate) -> Dict[str, Any]:
+    issue = await gh.create_issue(req.owner, req.repo, req.title, req.body, req.labels)
     return {"ok": True, "issue": issue}
 
 
 @app.post("/github/issues/close")
-def github_close_issue(req: IssueClose) -> Dict[str, Any]:
-    result = close_issue(req.owner, req.repo, req.number)
-    return {"ok": True, "result": result}
\ No newline at end of file
+async def github_close_issue(req: IssueClose) -> Dict[str, Any]:
+    result = await gh.close_issue(req.owner, req.repo, req.number)
+    return {"ok": True, "result": result}
+
+
+@app.get("/github/snapshot")
+async def github_snapshot(owner: str, repo: str) -> Dict[str, Any]:
+    snapshot = await gh.repo_snapshot(owner, repo)
+    return {"ok": True, "snapshot": snapshot}
+
+
+@app.get("/github/stats")
+def github_stats() -> Dict[str, Any]:
+    return {"ok": True, "client": client_stats(), "async_client": get_async_client().stats()}
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await close_async_client()
+    shutdown_pools()
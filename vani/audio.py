@@ -3,10 +3,13 @@ import soundfile as sf
 import numpy as np
 import os
 import base64
+import queue
 import tempfile
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Optional
 
 from .config import SAMPLE_RATE, CHANNELS, BLOCK_DURATION, TTS_VOICE, sarvam_client, SARVAM_TTS_MODEL
+from .events import bind_sink, current_sink, emit, speech_muted
 
 # Track last detected language code for TTS responses (default English India)
 CURRENT_LANGUAGE_CODE: Optional[str] = None
@@ -69,14 +72,34 @@ def record_audio_block(duration_sec: float = BLOCK_DURATION) -> np.ndarray:
     return audio
 
 
+def microphone_blocks(block_sec: float = 0.1) -> Iterator[np.ndarray]:
+    """Yield float32 mono blocks from the microphone as they are captured (not peak-normalized,
+    so an energy VAD sees real levels). Capture continues while the consumer is busy decoding.
+    """
+    blocks: "queue.Queue" = queue.Queue()
+
+    def callback(indata, frames, time_info, status) -> None:
+        blocks.put(indata[:, 0].copy())
+
+    with sd.InputStream(
+        samplerate=SAMPLE_RATE, channels=CHANNELS, dtype="float32",
+        blocksize=int(block_sec * SAMPLE_RATE), callback=callback,
+    ):
+        while True:
+            yield blocks.get()
+
+
 def save_wav_temp(audio: np.ndarray, path: str) -> None:
     sf.write(path, audio, SAMPLE_RATE)
 
 
 def speak(text: str) -> None:
     """Speak text using Sarvam TTS in the current detected language when possible.
-    Falls back to macOS 'say'.
+    Falls back to macOS 'say'. Inside an API job the text is also recorded as a 'spoken' event.
     """
+    emit("spoken", text=text)
+    if speech_muted():
+        return
     lang_raw = (CURRENT_LANGUAGE_CODE or "en-IN")
     lang = _normalize_tts_lang(lang_raw)
     # Prefer Sarvam TTS
@@ -134,4 +157,19 @@ def speak(text: str) -> None:
             print(f"Sarvam TTS error: {e}")
     # Final fallback: macOS say
     safe = text.replace("\"", "'")
-    os.system(f"say -v {TTS_VOICE} \"{safe}\"")
\ No newline at end of file
+    os.system(f"say -v {TTS_VOICE} \"{safe}\"")
+
+
+# One speech thread so queued utterances never overlap and keep their order
+_SPEECH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vani-speech")
+
+
+def speak_async(text: str) -> Future:
+    """Queue text for speech and return immediately; the caller's job sink still records it."""
+    sink = current_sink()
+
+    def run() -> None:
+        with bind_sink(sink):
+            speak(text)
+
+    return _SPEECH_EXECUTOR.submit(run)
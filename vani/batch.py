@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .commands import prepare_intent, dispatch_intent
+from .config import BATCH_CONCURRENCY
+from .events import bind_sink
+from .intent import ParsedIntent
+from .plans import ordering_key
+from .pools import BATCH_EXECUTOR, run_in
+
+
+class _ItemLog:
+    """Event sink for one batch item: records spoken replies instead of playing them."""
+
+    mute_speech = True
+
+    def __init__(self):
+        self.events: List[dict] = []
+
+    def emit(self, kind: str, data: dict) -> None:
+        self.events.append({"type": kind, **data})
+
+    def cancelled(self) -> bool:
+        return False
+
+    def spoken(self) -> List[str]:
+        return [e.get("text") for e in self.events if e["type"] == "spoken"]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _parse(item: Dict[str, Any]) -> ParsedIntent:
+    if item.get("text"):
+        return prepare_intent(item["text"])[1]
+    return ParsedIntent(intent=item["intent"], args=dict(item.get("args") or {}))
+
+
+def _execute(intent: ParsedIntent) -> tuple:
+    log = _ItemLog()
+    with bind_sink(log):
+        result = dispatch_intent(intent)
+    return result, log.spoken()
+
+
+async def run_batch(items: List[Dict[str, Any]], concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """Parse and run items (each {"text": ...} or {"intent": ..., "args": {...}}) concurrently.
+    At most `concurrency` items run at once; items sharing an ordering_key run one after another
+    in submission order. Returns per-item results and timings in input order.
+    """
+    limit = max(1, min(concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY))
+    gate = asyncio.Semaphore(limit)
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = [{"index": i, "ok": False} for i in range(len(items))]
+    intents: List[Optional[ParsedIntent]] = [None] * len(items)
+
+    # Phase 1: parse everything concurrently (text items may cost an LLM call each)
+    async def parse(i: int) -> None:
+        async with gate:
+            t0 = time.perf_counter()
+            try:
+                intents[i] = await run_in(BATCH_EXECUTOR, _parse, items[i])
+            except Exception as e:
+                results[i]["error"] = f"parse failed: {e}"
+            results[i]["parse_ms"] = _ms(time.perf_counter() - t0)
+
+    await asyncio.gather(*(parse(i) for i in range(len(items))))
+
+    # Phase 2: one lane per ordering key; lanes run concurrently, items within a lane sequentially.
+    # Keys may read a checkout's git remote, so they are computed off the event loop too.
+    parsed = [i for i, intent in enumerate(intents) if intent is not None]
+    keys = await asyncio.gather(*(run_in(BATCH_EXECUTOR, ordering_key, intents[i]) for i in parsed))
+    lanes: "OrderedDict[Any, List[int]]" = OrderedDict()
+    for i, key in zip(parsed, keys):
+        intent = intents[i]
+        results[i].update({"intent": intent.intent, "args": intent.args, "key": key})
+        lanes.setdefault(key if key is not None else ("independent", i), []).append(i)
+
+    async def run_lane(indexes: List[int]) -> None:
+        for i in indexes:
+            queued = time.perf_counter()
+            async with gate:
+                t0 = time.perf_counter()
+                try:
+                    result, spoken = await run_in(BATCH_EXECUTOR, _execute, intents[i])
+                    # Handlers report failures as {"ok": False, ...} rather than raising
+                    ok = not (isinstance(result, dict) and result.get("ok") is False)
+                    results[i].update({"ok": ok, "result": result, "spoken": spoken})
+                except Exception as e:
+                    results[i]["error"] = str(e) or e.__class__.__name__
+            results[i]["wait_ms"] = _ms(t0 - queued)
+            results[i]["run_ms"] = _ms(time.perf_counter() - t0)
+
+    await asyncio.gather(*(run_lane(indexes) for indexes in lanes.values()))
+    return {
+        "ok": all(r["ok"] for r in results),
+        "count": len(items),
+        "concurrency": limit,
+        "lanes": len(lanes),
+        "elapsed_ms": _ms(time.perf_counter() - started),
+        "items": results,
+    }
@@ -0,0 +1,106 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .config import CLARIFY_MAX_ROUNDS, client, sarvam_client
+from .events import emit
+from .intent import parse_intent
+
+
+@dataclass
+class Slot:
+    """A missing detail: how to ask for it (a noun phrase) and how to pick it out of a free-form answer."""
+    name: str
+    question: str
+    extract: Callable[[str], Optional[str]]
+    default: Optional[str] = None
+    # Key to read from the intent parser's args for this slot, if any
+    intent_arg: Optional[str] = None
+
+
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, dict] = {}
+
+
+def _record(task: str, rounds: int, asked: int) -> None:
+    with _STATS_LOCK:
+        s = _STATS.setdefault(task, {"tasks": 0, "rounds": 0, "slots_asked": 0, "max_rounds": 0})
+        s["tasks"] += 1
+        s["rounds"] += rounds
+        s["slots_asked"] += asked
+        s["max_rounds"] = max(s["max_rounds"], rounds)
+
+
+def clarify_stats() -> Dict[str, dict]:
+    """Per task: clarified tasks, total listen rounds, slots asked and the mean rounds per task."""
+    with _STATS_LOCK:
+        return {
+            task: {**s, "rounds_per_task": round(s["rounds"] / s["tasks"], 2) if s["tasks"] else 0.0}
+            for task, s in _STATS.items()
+        }
+
+
+def _prompt(questions: List[str]) -> str:
+    if len(questions) == 1:
+        return f"Please tell me {questions[0]}."
+    return "Please tell me " + "; ".join(questions[:-1]) + "; and " + questions[-1] + "."
+
+
+def _from_intent_parser(answer: str, slots: List[Slot], context: str) -> Dict[str, str]:
+    # The local heuristic parser fills defaults rather than leaving slots empty, so only
+    # an LLM-backed parse is trusted here; the slot extractors cover the offline case.
+    if client is None and sarvam_client is None:
+        return {}
+    parsed = parse_intent(f"{context}: {answer}")
+    found = {}
+    for slot in slots:
+        value = parsed.args.get(slot.intent_arg) if slot.intent_arg else None
+        if isinstance(value, str) and value.strip():
+            found[slot.name] = value.strip()
+    return found
+
+
+def clarify(
+    task: str,
+    slots: List[Slot],
+    ask: Callable[[str, float], str],
+    context: str = "",
+    max_rounds: int = CLARIFY_MAX_ROUNDS,
+) -> Dict[str, str]:
+    """Fill the given (missing) slots by asking for all of them in one prompt, then following up
+    only on those the answer did not cover. Slots still empty after max_rounds get their defaults.
+    """
+    values: Dict[str, str] = {}
+    pending = list(slots)
+    rounds = 0
+    while pending and rounds < max(1, max_rounds):
+        rounds += 1
+        # Longer answers are expected when several details are asked at once
+        answer = (ask(_prompt([s.question for s in pending]), 3.0 + 1.5 * len(pending)) or "").strip()
+        if answer:
+            found = _from_intent_parser(answer, pending, context)
+            for slot in pending:
+                value = slot.extract(found[slot.name].lower()) if slot.name in found else None
+                value = value or slot.extract(answer.lower())
+                if value:
+                    values[slot.name] = value
+        pending = [s for s in pending if s.name not in values]
+    for slot in pending:
+        if slot.default is not None:
+            values[slot.name] = slot.default
+    _record(task, rounds, len(slots))
+    print(f"Clarified {task} in {rounds} round(s): {values}")
+    emit("clarify", task=task, rounds=rounds, asked=[s.name for s in slots], values=values, defaulted=[s.name for s in pending])
+    return values
+
+
+def name_from_answer(answer: str, ignore: List[str]) -> Optional[str]:
+    """Project name from 'called X' / 'named X', else the words left after removing known keywords."""
+    m = re.search(r"\b(?:called|named|name is|name it)\s+([\w\-]+(?:\s+[\w\-]+)*?)(?=\s+(?:and|with|in|using)\b|[^\w\s-]|$)", answer)
+    words = m.group(1).split() if m else [w for w in re.findall(r"[\w\-]+", answer) if w not in ignore]
+    words = words[:4]
+    if not words:
+        return None
+    name = "-".join(words).lower()
+    return name if len(name) >= 2 else None
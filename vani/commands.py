@@ -1,15 +1,49 @@
-from .intent import parse_intent
+from typing import Any, Optional, Tuple
+
+from .intent import parse_intent, ParsedIntent
 from .git_ops import perform_git_operation
 from .terminal_ops import run_terminal_task
 from .github_ops import handle_github_operation
 from .audio import speak, get_language_code
 from .config import sarvam_client
+from .events import emit
+from .context import fill_args, get_context, record
+from .plans import plan_steps, run_plan
+from .history import get_history, is_repeat, replay_last
+from .macros import get_registry
+
+
+def _local_intent(text: str, session_id: Optional[str]) -> Optional[ParsedIntent]:
+    """'repeat last' and macro triggers resolve without the intent parser; None when neither applies."""
+    if is_repeat(text):
+        intent = replay_last(session_id)
+        if intent is None:
+            return ParsedIntent(intent="misc", args={"raw": text, "error": "no previous command to repeat"})
+        print(f"Repeating last command: {intent.intent}")
+        emit("replay", intent=intent.intent)
+        return intent
+    found = get_registry().match(text)
+    if found is None:
+        return None
+    macro, score = found
+    print(f"Matched macro '{macro.name}' (score {score})")
+    emit("macro", name=macro.name, score=score)
+    intent = macro.to_intent()
+    get_history().add(text, intent, session_id, source="macro")
+    return intent
 
 
-def handle_text_command(text: str) -> None:
+def prepare_intent(
+    text: str, lang: Optional[str] = None, session_id: Optional[str] = None, parsed: Optional[ParsedIntent] = None
+) -> Tuple[str, ParsedIntent]:
+    """Translate to English when needed and parse into an intent; returns (english_text, intent).
+    Macro triggers and 'repeat last' are answered locally without calling the intent parser.
+    parsed is an intent already parsed from this same English text (an early guess made on a
+    partial transcript) and is used instead of calling the parser again.
+    """
     # Translate to English for intent parsing if input language is non-English
     english_text = text
-    lang = (get_language_code() or "en-IN").lower()
+    lang = (lang or get_language_code() or "en-IN").lower()
     if sarvam_client is not None and not lang.startswith("en"):
         try:
             resp = sarvam_client.text.translate(
@@ -24,7 +58,11 @@ def handle_text_command(text: str) -> None:
         except Exception:
             english_text = text
 
-    intent = parse_intent(english_text)
+    intent = _local_intent(english_text, session_id)
+    if intent is None:
+        intent = parsed if parsed is not None and english_text == text else parse_intent(english_text)
+        if intent.intent != "misc":
+            get_history().add(english_text, intent, session_id)
     # Debug log for parsed intent
     try:
         print(f"Parsed intent: {intent.intent}, args: {intent.args}")
@@ -34,12 +72,46 @@ def handle_text_command(text: str) -> None:
         intent.args.setdefault("text", english_text)
     except Exception:
         pass
+    return english_text, intent
+
+
+def handle_text_command(text: str, session_id: Optional[str] = None) -> dict:
+    """Translate, parse and dispatch one utterance; returns the parsed intent and its result.
+    Args the utterance left out are filled from the session's recent context ("merge it").
+    """
+    english_text, intent = prepare_intent(text, session_id=session_id)
+    filled, result = dispatch_in_context(intent, session_id)
+    return {"text": english_text, "intent": intent.intent, "args": intent.args, "context": filled, "result": result}
+
+
+def dispatch_in_context(intent: ParsedIntent, session_id: Optional[str] = None) -> Tuple[dict, Any]:
+    """Fill missing args from the session context, dispatch, and remember what the command named.
+    Returns (args filled from context, handler result).
+    """
+    ctx = get_context(session_id)
+    if intent.intent == "plan":
+        emit("intent", intent=intent.intent, args=intent.args)
+        # Each step is completed from (and recorded into) the context when it runs, so a step
+        # can refer to what an earlier one created ("open a PR and merge it")
+        return {}, run_plan(plan_steps(intent), lambda step: dispatch_in_context(step, session_id)[1], ctx=ctx)
+    filled = fill_args(intent.intent, intent.args, ctx)
+    emit("intent", intent=intent.intent, args=intent.args)
+    result = dispatch_intent(intent)
+    record(intent.intent, intent.args, result, ctx)
+    return filled, result
+
+
+def dispatch_intent(intent: ParsedIntent):
+    """Run an already-parsed intent and return the handler's result."""
     if intent.intent == "git_operation":
-        perform_git_operation(intent.args)
+        return perform_git_operation(intent.args)
     elif intent.intent == "terminal_task":
-        run_terminal_task(intent.args)
+        return run_terminal_task(intent.args)
     elif intent.intent == "github_operation":
-        handle_github_operation(intent.args)
+        return handle_github_operation(intent.args)
+    elif intent.intent == "plan":
+        return run_plan(plan_steps(intent), dispatch_intent)
     else:
         print(f"Unrecognized or miscellaneous command: {intent.args}")
-        speak("Sorry, I did not understand. Please rephrase your request.")
\ No newline at end of file
+        speak("Sorry, I did not understand. Please rephrase your request.")
+        return None
\ No newline at end of file
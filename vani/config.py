@@ -38,4 +38,113 @@ BLOCK_DURATION = float(os.getenv("BLOCK_DURATION", "7.0"))  # seconds per record
 client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
 # SarvamAI client (used for speech-to-text)
-sarvam_client = SarvamAI(api_subscription_key=SARVAM_API_KEY) if SARVAM_API_KEY else None
\ No newline at end of file
+sarvam_client = SarvamAI(api_subscription_key=SARVAM_API_KEY) if SARVAM_API_KEY else None
+
+# GitHub HTTP client tuning
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "10"))
+GITHUB_CONNECT_TIMEOUT = float(os.getenv("GITHUB_CONNECT_TIMEOUT", "5"))
+GITHUB_READ_TIMEOUT = float(os.getenv("GITHUB_READ_TIMEOUT", "20"))
+# The async client serves concurrent API callers, so it gets a larger connection ceiling
+GITHUB_ASYNC_MAX_CONNECTIONS = int(os.getenv("GITHUB_ASYNC_MAX_CONNECTIONS", "50"))
+# Freshness window (seconds) for cached GitHub list responses before revalidating
+GITHUB_CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", "30"))
+GITHUB_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "256"))
+# Pagination: concurrent page fetchers and a safety cap on pages per listing
+GITHUB_PAGE_WORKERS = int(os.getenv("GITHUB_PAGE_WORKERS", "4"))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", "50"))
+# Retry/backoff and rate-limit budget handling for GitHub calls
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "3"))
+GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "0.5"))
+GITHUB_BACKOFF_MAX = float(os.getenv("GITHUB_BACKOFF_MAX", "8"))
+GITHUB_MAX_RETRY_WAIT = float(os.getenv("GITHUB_MAX_RETRY_WAIT", "60"))
+GITHUB_RATE_LOW_WATERMARK = int(os.getenv("GITHUB_RATE_LOW_WATERMARK", "50"))
+# Max git.Repo handles kept open by the repo pool (LRU)
+REPO_POOL_SIZE = int(os.getenv("REPO_POOL_SIZE", "16"))
+# Dedicated executors for blocking work offloaded from async API routes
+GIT_WORKERS = int(os.getenv("GIT_WORKERS", "8"))
+AUDIO_WORKERS = int(os.getenv("AUDIO_WORKERS", "2"))
+# Background job queue for API commands
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "64"))
+JOB_RETAIN = int(os.getenv("JOB_RETAIN", "500"))
+# Whether API jobs also play their spoken replies on the host (they are always recorded)
+JOB_SPEAK = os.getenv("JOB_SPEAK", "true").lower() in {"1", "true", "yes", "y"}
+# Streaming voice endpointing (server-side VAD for /ws/voice)
+VAD_ENERGY_THRESHOLD = float(os.getenv("VAD_ENERGY_THRESHOLD", "0.015"))
+VAD_END_SILENCE_MS = int(os.getenv("VAD_END_SILENCE_MS", "700"))
+VAD_MAX_UTTERANCE_SECONDS = float(os.getenv("VAD_MAX_UTTERANCE_SECONDS", "15"))
+# /ws/voice per-connection limits and partial transcript cadence (0 disables partials)
+VOICE_WS_MAX_PENDING_FRAMES = int(os.getenv("VOICE_WS_MAX_PENDING_FRAMES", "64"))
+VOICE_WS_MAX_FRAME_BYTES = int(os.getenv("VOICE_WS_MAX_FRAME_BYTES", "65536"))
+VOICE_PARTIAL_INTERVAL = float(os.getenv("VOICE_PARTIAL_INTERVAL", "2.0"))
+# POST /commands/batch: default/maximum concurrent items and max items per request
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+# Seconds to wait for a per-repo read/write lock before reporting the repo as busy (0 waits forever)
+REPO_LOCK_TIMEOUT = float(os.getenv("REPO_LOCK_TIMEOUT", "30"))
+# git status: opt-in accelerators for very large trees, and a cap on paths returned per category
+GIT_STATUS_UNTRACKED_CACHE = os.getenv("GIT_STATUS_UNTRACKED_CACHE", "false").lower() in {"1", "true", "yes", "y"}
+GIT_STATUS_FSMONITOR = os.getenv("GIT_STATUS_FSMONITOR", "false").lower() in {"1", "true", "yes", "y"}
+GIT_STATUS_MAX_PATHS = int(os.getenv("GIT_STATUS_MAX_PATHS", "200"))
+# Paths per `git add` invocation when staging incrementally
+STAGE_BATCH_SIZE = int(os.getenv("STAGE_BATCH_SIZE", "500"))
+# Multi-repo workspace mode: discovery root/depth, parallel git workers and per-repo timeout (s)
+WORKSPACE_ROOT = os.getenv("WORKSPACE_ROOT")
+WORKSPACE_MAX_DEPTH = int(os.getenv("WORKSPACE_MAX_DEPTH", "3"))
+WORKSPACE_WORKERS = int(os.getenv("WORKSPACE_WORKERS", "8"))
+WORKSPACE_REPO_TIMEOUT = float(os.getenv("WORKSPACE_REPO_TIMEOUT", "60"))
+# Remote git progress: min seconds between progress events, and between spoken updates (0 = never speak)
+GIT_PROGRESS_INTERVAL = float(os.getenv("GIT_PROGRESS_INTERVAL", "0.5"))
+GIT_PROGRESS_SPEAK_INTERVAL = float(os.getenv("GIT_PROGRESS_SPEAK_INTERVAL", "0"))
+# Terminal command executor: auto (AppleScript on macOS, PTY elsewhere), applescript or pty
+TERMINAL_BACKEND = os.getenv("TERMINAL_BACKEND", "auto").lower()
+TERMINAL_STEP_TIMEOUT = float(os.getenv("TERMINAL_STEP_TIMEOUT", "900"))
+TERMINAL_MAX_SESSIONS = int(os.getenv("TERMINAL_MAX_SESSIONS", "4"))
+# Seconds a long-running step (dev server) must stay up before it is left running in the background
+TERMINAL_SERVICE_GRACE = float(os.getenv("TERMINAL_SERVICE_GRACE", "5"))
+TERMINAL_OUTPUT_TAIL = int(os.getenv("TERMINAL_OUTPUT_TAIL", "40"))
+# Scaffold snapshot cache for Vite/Next projects: clone a pre-installed template instead of npm create + install
+SCAFFOLD_CACHE = os.getenv("SCAFFOLD_CACHE", "true").lower() in {"1", "true", "yes", "y"}
+SCAFFOLD_CACHE_DIR = os.getenv("SCAFFOLD_CACHE_DIR", "~/.cache/vani/scaffolds")
+SCAFFOLD_CACHE_MAX_ENTRIES = int(os.getenv("SCAFFOLD_CACHE_MAX_ENTRIES", "8"))
+# Entries older than this are refreshed in the background on their next use
+SCAFFOLD_CACHE_MAX_AGE_DAYS = float(os.getenv("SCAFFOLD_CACHE_MAX_AGE_DAYS", "14"))
+# Seconds to trust a looked-up generator version before asking npm again
+SCAFFOLD_VERSION_TTL = float(os.getenv("SCAFFOLD_VERSION_TTL", "3600"))
+# Listen rounds allowed to fill missing scaffold details (the first round asks for all of them at once)
+CLARIFY_MAX_ROUNDS = int(os.getenv("CLARIFY_MAX_ROUNDS", "2"))
+# Conversational context: seconds an entity (repo, branch, PR/issue number, project) stays usable, sessions kept
+CONTEXT_TTL_SECONDS = float(os.getenv("CONTEXT_TTL_SECONDS", "600"))
+CONTEXT_MAX_SESSIONS = int(os.getenv("CONTEXT_MAX_SESSIONS", "100"))
+# Multi-step plans from one utterance: max steps taken from a plan, and steps run at once
+PLAN_MAX_STEPS = int(os.getenv("PLAN_MAX_STEPS", "8"))
+PLAN_WORKERS = int(os.getenv("PLAN_WORKERS", "4"))
+# Voice macros (JSON, or YAML with PyYAML installed) matched before intent parsing; fuzzy match cutoff 0..1
+MACROS_FILE = os.getenv("MACROS_FILE", "~/.config/vani/macros.json")
+MACRO_FUZZY_THRESHOLD = float(os.getenv("MACRO_FUZZY_THRESHOLD", "0.85"))
+# Parsed command history used by "repeat last"
+HISTORY_FILE = os.getenv("HISTORY_FILE", "~/.local/state/vani/history.jsonl")
+HISTORY_MAX = int(os.getenv("HISTORY_MAX", "200"))
+# Intent parsing prompt profile: compact (default), minimal, or legacy (original long prompt)
+INTENT_PROMPT_PROFILE = os.getenv("INTENT_PROMPT_PROFILE", "compact").lower()
+# Intent LLM routing: latency budget per parse (then heuristics), EWMA smoothing, exploration share,
+# error-rate EWMA above which a backend is skipped, and seconds before it is retried
+LLM_LATENCY_SLO_MS = float(os.getenv("LLM_LATENCY_SLO_MS", "2500"))
+LLM_EWMA_ALPHA = float(os.getenv("LLM_EWMA_ALPHA", "0.2"))
+LLM_EXPLORE_RATE = float(os.getenv("LLM_EXPLORE_RATE", "0.05"))
+LLM_ERROR_THRESHOLD = float(os.getenv("LLM_ERROR_THRESHOLD", "0.5"))
+LLM_COOLDOWN_SECONDS = float(os.getenv("LLM_COOLDOWN_SECONDS", "30"))
+# Minimum seconds between background probes of one backend (exploration and slow-backend refreshes)
+LLM_PROBE_INTERVAL = float(os.getenv("LLM_PROBE_INTERVAL", "30"))
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "4"))
+# Streaming STT for partial transcripts: auto (Sarvam streaming, else local windowed Whisper if installed,
+# else batch STT per utterance), sarvam, whisper, or off; local decode step and window before text is
+# committed; wait for Sarvam's final result. The local wake and command loops only switch from fixed-length
+# clips to end-of-speech listening when one of these recognizers is actually available
+STT_STREAMING = os.getenv("STT_STREAMING", "auto").lower()
+STT_PARTIAL_STEP_MS = int(os.getenv("STT_PARTIAL_STEP_MS", "600"))
+STT_WINDOW_SECONDS = float(os.getenv("STT_WINDOW_SECONDS", "10"))
+STT_STREAM_FINAL_TIMEOUT = float(os.getenv("STT_STREAM_FINAL_TIMEOUT", "1.5"))
+# Parse the intent from a stable partial transcript and reuse it when the final text matches
+STT_EARLY_INTENT = os.getenv("STT_EARLY_INTENT", "true").lower() in {"1", "true", "yes", "y"}
@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import CONTEXT_TTL_SECONDS, CONTEXT_MAX_SESSIONS
+from .events import emit
+
+DEFAULT_SESSION = "default"
+
+# GitHub operations that act on one repository (owner/repo otherwise come from the local remote)
+_REPO_OPS = {"list_prs", "create_pr", "merge_pr", "list_issues", "create_issue", "close_issue", "repo_snapshot"}
+_PR_OPS = {"create_pr", "merge_pr"}
+_ISSUE_OPS = {"create_issue", "close_issue"}
+
+
+class SessionContext:
+    """Entities mentioned recently in one conversation (repo, branch, PR/issue numbers, project).
+    Each entity expires ttl seconds after it was last mentioned.
+    """
+
+    def __init__(self, ttl: float = CONTEXT_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entities: Dict[str, tuple] = {}
+
+    def remember(self, **entities: Any) -> None:
+        expires = time.time() + self.ttl
+        with self._lock:
+            for name, value in entities.items():
+                if value not in (None, ""):
+                    self._entities[name] = (value, expires)
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            item = self._entities.get(name)
+            if item is None:
+                return None
+            if item[1] < time.time():
+                del self._entities[name]
+                return None
+            return item[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            for name in [n for n, (_, exp) in self._entities.items() if exp < now]:
+                del self._entities[name]
+            return {n: {"value": v, "expires_in": round(exp - now, 1)} for n, (v, exp) in self._entities.items()}
+
+    def forget(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._entities.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entities.clear()
+
+
+class ContextStore:
+    """Session id -> SessionContext, keeping the most recently used max_sessions."""
+
+    def __init__(self, ttl: float = CONTEXT_TTL_SECONDS, max_sessions: int = CONTEXT_MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+
+    def session(self, session_id: Optional[str] = None) -> SessionContext:
+        key = session_id or DEFAULT_SESSION
+        with self._lock:
+            ctx = self._sessions.get(key)
+            if ctx is None:
+                ctx = self._sessions[key] = SessionContext(self.ttl)
+                while len(self._sessions) > max(1, self.max_sessions):
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+            return ctx
+
+    def drop(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+
+_STORE = ContextStore()
+
+
+def get_context(session_id: Optional[str] = None) -> SessionContext:
+    return _STORE.session(session_id)
+
+
+def drop_context(session_id: str) -> bool:
+    return _STORE.drop(session_id)
+
+
+def fill_args(intent: str, args: dict, ctx: SessionContext) -> Dict[str, Any]:
+    """Fill args the utterance left out ("merge it", "close that issue") from the session context.
+    Mutates args; returns what was filled.
+    """
+    filled: Dict[str, Any] = {}
+
+    def fill(arg: str, entity: str) -> None:
+        if args.get(arg) in (None, ""):
+            value = ctx.get(entity)
+            if value is not None:
+                args[arg] = filled[arg] = value
+
+    op = args.get("operation")
+    if intent == "github_operation" and op in _REPO_OPS:
+        # Only use a remembered repo as a pair, so owner and repo never come from different repos
+        if not args.get("owner") and not args.get("repo") and ctx.get("owner") and ctx.get("repo"):
+            fill("owner", "owner")
+            fill("repo", "repo")
+        # A remembered number belongs to the remembered repo; never apply it to another one
+        same_repo = (str(args.get("owner") or "").lower(), str(args.get("repo") or "").lower()) == (
+            str(ctx.get("owner") or "").lower(), str(ctx.get("repo") or "").lower()
+        )
+        if op == "merge_pr" and same_repo:
+            fill("number", "pr_number")
+        elif op == "close_issue" and same_repo:
+            fill("number", "issue_number")
+        elif op == "create_pr":
+            fill("head", "branch")
+    elif intent == "git_operation" and op == "checkout":
+        fill("branch_name", "branch")
+    elif intent == "terminal_task":
+        fill("project_name", "project_name")
+    if filled:
+        print(f"Filled from context: {filled}")
+        emit("context", filled=filled)
+    return filled
+
+
+def record(intent: str, args: dict, result: Any, ctx: SessionContext) -> None:
+    """Remember the entities an intent named and its result produced (e.g. a newly created PR)."""
+    op = args.get("operation")
+    res = result if isinstance(result, dict) else {}
+    if res and res.get("ok") is False:
+        return
+    if intent == "github_operation":
+        owner = res.get("owner") or args.get("owner")
+        repo = res.get("repo") or args.get("repo")
+        if op in ("create_repo", "delete_repo") and "/" in (res.get("full_name") or ""):
+            owner, repo = res["full_name"].split("/", 1)
+        if op == "delete_repo":
+            if (ctx.get("owner"), ctx.get("repo")) == (owner, repo):
+                ctx.forget("owner", "repo", "pr_number", "issue_number")
+            return
+        if owner and repo:
+            ctx.remember(owner=owner, repo=repo)
+        number = res.get("number") or args.get("number")
+        if op in _PR_OPS:
+            ctx.remember(pr_number=number, branch=args.get("head"))
+        elif op in _ISSUE_OPS:
+            ctx.remember(issue_number=number)
+        elif op == "create_repo":
+            ctx.remember(project_name=repo)
+    elif intent == "git_operation":
+        ctx.remember(branch=res.get("branch") or args.get("branch_name"))
+    elif intent == "terminal_task":
+        ctx.remember(project_name=args.get("project_name"))
@@ -0,0 +1,43 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Optional
+
+# Per-thread event sink. Code running inside an API job (or any other observer) reports
+# progress through emit() without knowing who is listening; outside a job it is a no-op.
+_local = threading.local()
+
+
+def current_sink() -> Optional[Any]:
+    return getattr(_local, "sink", None)
+
+
+@contextmanager
+def bind_sink(sink: Any):
+    """Route emit() calls made on this thread to sink for the duration of the block."""
+    previous = current_sink()
+    _local.sink = sink
+    try:
+        yield sink
+    finally:
+        _local.sink = previous
+
+
+def emit(kind: str, **data: Any) -> None:
+    sink = current_sink()
+    if sink is not None:
+        try:
+            sink.emit(kind, data)
+        except Exception:
+            pass
+
+
+def speech_muted() -> bool:
+    """True when the bound sink collects spoken messages instead of playing them."""
+    sink = current_sink()
+    return bool(getattr(sink, "mute_speech", False))
+
+
+def cancel_requested() -> bool:
+    sink = current_sink()
+    cancelled = getattr(sink, "cancelled", None)
+    return bool(cancelled()) if callable(cancelled) else False
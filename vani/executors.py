@@ -0,0 +1,317 @@
+import abc
+import os
+import pty
+import re
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from .config import (
+    TERMINAL_BACKEND,
+    TERMINAL_STEP_TIMEOUT,
+    TERMINAL_MAX_SESSIONS,
+    TERMINAL_SERVICE_GRACE,
+    TERMINAL_OUTPUT_TAIL,
+)
+from .events import emit
+from .git_progress import CancelHandle
+
+# Steps that start a server and never exit on their own
+_SERVICE_PATTERN = re.compile(r"\b(npm|pnpm|yarn|bun)\s+(run\s+)?(dev|start|serve)\b|\buvicorn\b|\bflask\s+run\b|\bhttp\.server\b")
+_ANSI = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b\][^\x07]*\x07")
+_CWD_MARKER = "__VANI_CWD__"
+
+
+class CommandExecutor(abc.ABC):
+    """Runs a command plan (list of shell steps executed as if typed into one terminal)."""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def run(self, cmds: List[str], cancel: Optional[CancelHandle] = None) -> dict:
+        """Run the plan and return {"ok", ...} with whatever the backend can observe."""
+
+
+class AppleScriptExecutor(CommandExecutor):
+    """Types the plan into macOS Terminal. Fire-and-forget: no output or exit codes are observed."""
+
+    name = "applescript"
+
+    def run(self, cmds: List[str], cancel: Optional[CancelHandle] = None) -> dict:
+        script = " ; ".join(cmds)
+        # Escape for AppleScript string
+        script_escaped = script.replace("\\", "\\\\").replace("\"", "\\\"")
+        # Reuse existing window if Terminal is open; otherwise create one
+        osa_args = [
+            "osascript",
+            "-e",
+            'tell application "Terminal"',
+            "-e",
+            f'set cmd to "{script_escaped}"',
+            "-e",
+            'if (count of windows) is 0 then',
+            "-e",
+            'do script cmd',
+            "-e",
+            'else',
+            "-e",
+            'do script cmd in front window',
+            "-e",
+            'end if',
+            "-e",
+            'activate',
+            "-e",
+            'end tell',
+        ]
+        ret = subprocess.run(osa_args).returncode
+        if ret != 0:
+            print(f"AppleScript failed with status {ret}.")
+            return {"ok": False, "backend": self.name, "commands": cmds, "error": f"AppleScript exit status {ret}"}
+        print("Opened Terminal with commands:")
+        for c in cmds:
+            print("- ", c)
+        return {"ok": True, "backend": self.name, "commands": cmds}
+
+
+class _Service:
+    def __init__(self, proc: subprocess.Popen, command: str, cwd: str, master_fd: int):
+        self.proc = proc
+        self.command = command
+        self.cwd = cwd
+        self.started_at = time.time()
+        self.master_fd = master_fd
+        self.tail: deque = deque(maxlen=TERMINAL_OUTPUT_TAIL)
+
+    def to_dict(self) -> dict:
+        return {
+            "pid": self.proc.pid,
+            "command": self.command,
+            "cwd": self.cwd,
+            "started_at": self.started_at,
+            "running": self.proc.poll() is None,
+            "exit_code": self.proc.poll(),
+            "output_tail": list(self.tail),
+        }
+
+
+def _kill(proc: subprocess.Popen, grace: float = 2.0) -> None:
+    # Steps run in their own session, so signal the whole process group (npm spawns children)
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        try:
+            proc.wait(timeout=grace)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+class PtyExecutor(CommandExecutor):
+    """Runs each step under a pseudo-terminal (so tools keep their interactive output), streaming
+    output line by line to the console and the job event stream. The working directory carries
+    over between steps like in a single terminal; the plan stops at the first failing step.
+    Server-like steps that are still up after TERMINAL_SERVICE_GRACE are left running as services.
+    """
+
+    name = "pty"
+
+    def __init__(
+        self,
+        step_timeout: float = TERMINAL_STEP_TIMEOUT,
+        max_sessions: int = TERMINAL_MAX_SESSIONS,
+        service_grace: float = TERMINAL_SERVICE_GRACE,
+        shell: Optional[str] = None,
+    ):
+        self.step_timeout = step_timeout
+        self.service_grace = service_grace
+        self.shell = shell or os.environ.get("SHELL") or "/bin/bash"
+        self._sessions = threading.BoundedSemaphore(max(1, max_sessions))
+        self._services: Dict[int, _Service] = {}
+        self._lock = threading.Lock()
+
+    def run(self, cmds: List[str], cancel: Optional[CancelHandle] = None) -> dict:
+        cancel = cancel or CancelHandle()
+        cwd = os.getcwd()
+        steps = []
+        started = time.perf_counter()
+        with self._sessions:
+            for i, command in enumerate(cmds):
+                if cancel.cancelled():
+                    steps.append({"index": i, "command": command, "status": "cancelled"})
+                    continue
+                step = self._run_step(i, command, cwd, cancel)
+                cwd = step.pop("cwd", cwd)
+                steps.append(step)
+                if step["status"] not in ("ok", "service"):
+                    for j, rest in enumerate(cmds[i + 1:], start=i + 1):
+                        steps.append({"index": j, "command": rest, "status": "skipped"})
+                    break
+        failed = next((s for s in steps if s["status"] not in ("ok", "service")), None)
+        return {
+            "ok": failed is None,
+            "backend": self.name,
+            "commands": cmds,
+            "steps": steps,
+            "cwd": cwd,
+            "services": [s["pid"] for s in steps if s["status"] == "service"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            **({"error": f"step {failed['index'] + 1} {failed['status']}: {failed['command']}"} if failed else {}),
+        }
+
+    def _run_step(self, index: int, command: str, cwd: str, cancel: CancelHandle) -> dict:
+        service = bool(_SERVICE_PATTERN.search(command))
+        # Report the final working directory so `cd` persists into the next step
+        wrapped = f"trap 'printf \"\\n{_CWD_MARKER}%s\\n\" \"$PWD\"' EXIT\n{command}"
+        master, slave = pty.openpty()
+        env = {**os.environ, "TERM": os.environ.get("TERM", "xterm-256color")}
+        started = time.perf_counter()
+        print(f"$ {command}")
+        emit("step", index=index, command=command, state="started")
+        try:
+            proc = subprocess.Popen(
+                [self.shell, "-c", wrapped],
+                stdin=slave, stdout=slave, stderr=slave, cwd=cwd, env=env,
+                start_new_session=True, close_fds=True,
+            )
+        except OSError as e:
+            os.close(master)
+            os.close(slave)
+            return {"index": index, "command": command, "status": "failed", "exit_code": None, "error": str(e)}
+        os.close(slave)
+        tail: deque = deque(maxlen=TERMINAL_OUTPUT_TAIL)
+        state = {"cwd": cwd, "buf": b""}
+        deadline = started + (self.service_grace if service else self.step_timeout)
+        status = None
+        while True:
+            self._drain(master, index, tail, state, timeout=0.1)
+            if proc.poll() is not None:
+                while self._drain(master, index, tail, state, timeout=0.05):
+                    pass
+                break
+            if cancel.cancelled():
+                status = "cancelled"
+                _kill(proc)
+                break
+            if time.perf_counter() > deadline:
+                if service:
+                    status = "service"
+                else:
+                    status = "timeout"
+                    _kill(proc)
+                break
+        if status == "service":
+            svc = _Service(proc, command, cwd, master)
+            svc.tail.extend(tail)
+            with self._lock:
+                self._services[proc.pid] = svc
+            threading.Thread(target=self._follow, args=(svc, index), daemon=True).start()
+        else:
+            self._flush(index, tail, state)
+            os.close(master)
+        exit_code = proc.poll()
+        if status is None:
+            status = "ok" if exit_code == 0 else "failed"
+        ms = round((time.perf_counter() - started) * 1000, 1)
+        emit("step", index=index, command=command, state=status, exit_code=exit_code, ms=ms)
+        print(f"[step {index + 1}] {status}" + (f" (exit {exit_code})" if exit_code is not None else "") + f" in {ms} ms")
+        return {
+            "index": index,
+            "command": command,
+            "status": status,
+            "exit_code": exit_code,
+            "ms": ms,
+            "cwd": state["cwd"],
+            "output_tail": list(tail),
+            **({"pid": proc.pid} if status == "service" else {}),
+        }
+
+    def _drain(self, fd: int, index: int, tail: deque, state: dict, timeout: float) -> bool:
+        """Read whatever is available within timeout; False when nothing (more) can be read."""
+        try:
+            ready, _, _ = select.select([fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        if not ready:
+            return False
+        try:
+            chunk = os.read(fd, 65536)
+        except OSError:
+            # EIO once the child side of the PTY is closed
+            return False
+        if not chunk:
+            return False
+        state["buf"] += chunk
+        *lines, state["buf"] = re.split(rb"\r?\n", state["buf"])
+        for raw in lines:
+            self._line(raw, index, tail, state)
+        return True
+
+    def _flush(self, index: int, tail: deque, state: dict) -> None:
+        if state["buf"]:
+            self._line(state["buf"], index, tail, state)
+            state["buf"] = b""
+
+    def _line(self, raw: bytes, index: int, tail: deque, state: dict) -> None:
+        # Progress bars redraw with \r; keep only the last frame of the line
+        line = _ANSI.sub("", raw.decode("utf-8", "replace")).split("\r")[-1].rstrip()
+        if line.startswith(_CWD_MARKER):
+            state["cwd"] = line[len(_CWD_MARKER):] or state["cwd"]
+            return
+        if not line:
+            return
+        tail.append(line)
+        print(line)
+        emit("output", step=index, line=line)
+
+    def _follow(self, svc: _Service, index: int) -> None:
+        # Keep draining a background service's PTY so it never blocks on a full buffer
+        state = {"cwd": svc.cwd, "buf": b""}
+        while svc.proc.poll() is None:
+            self._drain(svc.master_fd, index, svc.tail, state, timeout=0.5)
+        while self._drain(svc.master_fd, index, svc.tail, state, timeout=0.05):
+            pass
+        try:
+            os.close(svc.master_fd)
+        except OSError:
+            pass
+
+    def services(self) -> List[dict]:
+        with self._lock:
+            for pid in [p for p, s in self._services.items() if s.proc.poll() is not None and time.time() - s.started_at > 3600]:
+                del self._services[pid]
+            return [s.to_dict() for s in self._services.values()]
+
+    def stop_service(self, pid: int) -> Optional[dict]:
+        with self._lock:
+            svc = self._services.get(pid)
+        if svc is None:
+            return None
+        _kill(svc.proc)
+        return svc.to_dict()
+
+
+_EXECUTORS: Dict[str, CommandExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(name: Optional[str] = None) -> CommandExecutor:
+    """Executor backend by name ('applescript', 'pty' or 'auto' = AppleScript on macOS, PTY elsewhere)."""
+    name = (name or TERMINAL_BACKEND or "auto").lower()
+    if name == "auto":
+        name = "applescript" if sys.platform == "darwin" else "pty"
+    with _EXECUTORS_LOCK:
+        if name not in _EXECUTORS:
+            if name == "applescript":
+                _EXECUTORS[name] = AppleScriptExecutor()
+            elif name == "pty":
+                _EXECUTORS[name] = PtyExecutor()
+            else:
+                raise ValueError(f"unknown terminal backend: {name}")
+        return _EXECUTORS[name]
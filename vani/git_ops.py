@@ -1,9 +1,52 @@
 import os
 from git import Repo, GitCommandError
 from .audio import speak
+from .repo_pool import get_repo, invalidate_repo
+from .repo_locks import RepoLockTimeout, repo_lock
+from .git_status import read_status
+from .staging import stage_and_commit
+from .git_progress import GitCancelled, run_remote
+from .workspace import run_workspace
 
+# Operations that only read the working tree share the repo lock; everything else is exclusive
+_READ_OPERATIONS = {"status"}
 
-def perform_git_operation(args: dict) -> None:
+
+def perform_git_operation(args: dict) -> dict:
+    """Run a git operation and return a result dict (operation, ok, and output or error).
+    Holds the per-repo lock so concurrent requests cannot race on .git/index.lock.
+    """
+    operation = args.get("operation", "status")
+    if operation.startswith("workspace_"):
+        return _workspace_operation(operation, args)
+    mode = "read" if operation in _READ_OPERATIONS else "write"
+    try:
+        with repo_lock(args.get("repo_path"), mode):
+            return _run_git_operation(args)
+    except RepoLockTimeout as e:
+        print(f"Git error: {e}")
+        speak("The repository is busy with another operation. Please try again shortly.")
+        return {"operation": operation, "ok": False, "error": str(e)}
+
+
+def _workspace_operation(operation: str, args: dict) -> dict:
+    """status/fetch/pull across every repo under the workspace root (each repo takes its own lock)."""
+    try:
+        kwargs = {"timeout": float(args["timeout"])} if args.get("timeout") else {}
+        result = run_workspace(operation[len("workspace_"):], root=args.get("root") or args.get("repo_path"), **kwargs)
+    except ValueError as e:
+        print(f"Unsupported git operation: {operation}")
+        speak("Unsupported workspace operation.")
+        return {"operation": operation, "ok": False, "error": str(e)}
+    for r in result["repos"]:
+        state = r.get("error") or f"{r.get('branch')} +{r.get('ahead', 0)} -{r.get('behind', 0)}{' dirty' if r.get('dirty') else ''}"
+        print(f"{r['name']:30s} {state}")
+    print(result["summary"])
+    speak(result["summary"])
+    return {"operation": operation, "ok": not result["failed"], "workspace": result}
+
+
+def _run_git_operation(args: dict) -> dict:
     repo_path = args.get("repo_path", os.getcwd())
     operation = args.get("operation", "status")
     files = args.get("files")
@@ -14,48 +57,51 @@ def perform_git_operation(args: dict) -> None:
     if operation == "init":
         try:
             Repo.init(repo_path)
+            invalidate_repo(repo_path)
             print(f"Initialized git repository at {repo_path}")
             speak("Initialized git repository.")
+            return {"operation": operation, "ok": True}
         except Exception as e:
             print(f"Git init error: {e}")
             speak("Failed to initialize git repository.")
-        return
+            return {"operation": operation, "ok": False, "error": str(e)}
 
     try:
-        repo = Repo(repo_path)
+        repo = get_repo(repo_path)
     except Exception as e:
         msg = f"Git error: cannot open repo at {repo_path}: {e}"
         print(msg)
         speak("I could not open a git repository in this folder. Please initialize git first or tell me to link a remote.")
-        return
+        return {"operation": operation, "ok": False, "error": msg}
 
     try:
         if operation == "status":
-            print(repo.git.status())
-            speak("Reported repository status.")
+            status = read_status(repo_path)
+            summary = status.summary()
+            print(summary)
+            speak(summary)
+            return {"operation": operation, "ok": True, "output": summary, "status": status.to_dict()}
         elif operation == "add":
-            if files:
-                repo.index.add(files)
-            else:
-                repo.git.add(".")
-            print("Staged changes.")
-            speak("Staged your changes.")
+            staged = stage_and_commit(repo_path, files=files)
+            print(f"Staged {staged.paths_staged} paths ({staged.bytes_staged} bytes) in {staged.batches} batches.")
+            speak("Staged your changes." if staged.paths_staged else "There was nothing new to stage.")
+            return {"operation": operation, "ok": True, "staging": staged.to_dict()}
         elif operation == "commit":
             repo.index.commit(commit_message)
             print(f"Committed: {commit_message}")
             speak("Committed your changes.")
+            return {"operation": operation, "ok": True, "commit_message": commit_message}
         elif operation == "push":
             # Stage all changes, try to commit with provided message, then push
             try:
-                repo.git.add(".")
-                print("Staged changes.")
-                # Attempt commit; if nothing to commit, continue
-                try:
-                    repo.index.commit(commit_message)
+                # Stage only changed paths; commit only if the index differs from HEAD
+                staged = stage_and_commit(repo_path, commit_message)
+                print(f"Staged {staged.paths_staged} paths ({staged.bytes_staged} bytes).")
+                if staged.committed:
                     print(f"Committed: {commit_message}")
                     speak("Committed your changes.")
-                except Exception as e:
-                    print(f"Commit skipped or failed: {e}")
+                else:
+                    print(f"Commit skipped: {staged.skipped}")
                 # Determine current branch or create main if detached
                 try:
                     current_branch = repo.active_branch.name
@@ -67,33 +113,57 @@ def perform_git_operation(args: dict) -> None:
                     except Exception as e:
                         print(f"Branch setup error: {e}")
                 # Push with upstream set (in case it's a new branch)
-                print(repo.git.push("--set-upstream", "origin", current_branch))
+                output = run_remote(repo, "push", ["--set-upstream", "origin", current_branch])
+                print(output)
                 speak("Pushed to remote.")
+                return {
+                    "operation": operation,
+                    "ok": True,
+                    "branch": current_branch,
+                    "output": output,
+                    "staging": staged.to_dict(),
+                }
             except GitCommandError as e:
                 msg = f"Git command error: {e}"
                 print(msg)
                 speak("There was an error running the git command.")
+                return {"operation": operation, "ok": False, "error": msg}
         elif operation == "pull":
-            print(repo.git.pull())
+            output = run_remote(repo, "pull")
+            print(output)
             speak("Pulled latest changes.")
+            return {"operation": operation, "ok": True, "output": output}
+        elif operation == "fetch":
+            output = run_remote(repo, "fetch", ["--prune"])
+            print(output)
+            speak("Fetched from remote.")
+            return {"operation": operation, "ok": True, "output": output}
         elif operation == "checkout":
             if not branch_name:
                 print("No branch_name provided.")
                 speak("Please provide a branch name.")
-                return
+                return {"operation": operation, "ok": False, "error": "branch_name required"}
             print(repo.git.checkout(branch_name))
             speak(f"Switched to branch {branch_name}.")
+            return {"operation": operation, "ok": True, "branch": branch_name}
         elif operation == "branch":
             if not branch_name:
                 print("No branch_name provided.")
                 speak("Please provide a branch name.")
-                return
+                return {"operation": operation, "ok": False, "error": "branch_name required"}
             print(repo.git.checkout('-b', branch_name))
             speak(f"Created and switched to branch {branch_name}.")
+            return {"operation": operation, "ok": True, "branch": branch_name}
         else:
             print(f"Unsupported git operation: {operation}")
             speak("Unsupported git operation.")
+            return {"operation": operation, "ok": False, "error": "unsupported operation"}
+    except GitCancelled as e:
+        print(str(e))
+        speak(f"Cancelled the {operation}.")
+        return {"operation": operation, "ok": False, "error": "cancelled"}
     except GitCommandError as e:
         msg = f"Git command error: {e}"
         print(msg)
-        speak("There was an error running the git command.")
\ No newline at end of file
+        speak("There was an error running the git command.")
+        return {"operation": operation, "ok": False, "error": msg}
\ No newline at end of file
@@ -0,0 +1,154 @@
+import re
+import threading
+import time
+from typing import List, Optional
+
+from git import GitCommandError, RemoteProgress
+
+from .audio import speak
+from .config import GIT_PROGRESS_INTERVAL, GIT_PROGRESS_SPEAK_INTERVAL
+from .events import bind_sink, cancel_requested, current_sink, emit
+
+_STAGES = {
+    RemoteProgress.COUNTING: "counting objects",
+    RemoteProgress.COMPRESSING: "compressing objects",
+    RemoteProgress.WRITING: "writing objects",
+    RemoteProgress.RECEIVING: "receiving objects",
+    RemoteProgress.RESOLVING: "resolving deltas",
+    RemoteProgress.FINDING_SOURCES: "finding sources",
+    RemoteProgress.CHECKING_OUT: "checking out files",
+}
+_VERBS = {"push": "Pushing", "pull": "Pulling", "fetch": "Fetching", "clone": "Cloning"}
+# "1.20 MiB | 2.05 MiB/s" in the Writing/Receiving objects message
+_RATE = re.compile(r"([\d.]+ \w?i?B)(?: \| ([\d.]+ \w?i?B/s))?")
+
+
+class GitCancelled(Exception):
+    pass
+
+
+class CancelHandle:
+    """Cancels a running remote git command; the process is killed within one poll interval."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def cancelled(self) -> bool:
+        # Also honour cancellation of the API job this runs in
+        return self._event.is_set() or cancel_requested()
+
+
+class ProgressReporter(RemoteProgress):
+    """Throttles git progress into console lines, 'progress' events and optional spoken updates."""
+
+    def __init__(
+        self, operation: str, interval: float = GIT_PROGRESS_INTERVAL, speak_interval: float = GIT_PROGRESS_SPEAK_INTERVAL
+    ):
+        super().__init__()
+        self.operation = operation
+        self.interval = interval
+        self.speak_interval = speak_interval
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+        self._last_spoken = self.started
+        self.events = 0
+
+    def update(self, op_code, cur_count, max_count=None, message="") -> None:
+        now = time.monotonic()
+        final = bool(op_code & self.END)
+        if not final and not (op_code & self.BEGIN) and now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+        stage = _STAGES.get(op_code & self.OP_MASK, "working")
+        percent = round(float(cur_count) * 100 / float(max_count)) if max_count else None
+        data = {
+            "operation": self.operation,
+            "stage": stage,
+            "current": int(cur_count) if cur_count is not None else None,
+            "total": int(max_count) if max_count else None,
+            "percent": percent,
+            "done": final,
+        }
+        m = _RATE.search(message or "")
+        if m:
+            data["transferred"] = m.group(1)
+            data["rate"] = m.group(2)
+        self.events += 1
+        emit("progress", **data)
+        counts = f"{data['current']}/{data['total']}" if data["total"] else f"{data['current']}"
+        pct = f" ({percent}%)" if percent is not None else ""
+        print(f"{_VERBS.get(self.operation, self.operation)}: {stage} {counts}{pct}{' ' + message if message else ''}")
+        if self.speak_interval > 0 and now - self._last_spoken >= self.speak_interval and percent is not None and not final:
+            self._last_spoken = now
+            speak(f"{_VERBS.get(self.operation, self.operation)}, {stage}, {percent} percent.")
+
+
+def _pump(stream, reporter: ProgressReporter, sink) -> None:
+    # Runs on a reader thread, so re-bind the caller's job sink for emit()/speak()
+    with bind_sink(sink):
+        _pump_lines(stream, reporter)
+
+
+def _pump_lines(stream, reporter: ProgressReporter) -> None:
+    # git separates progress updates with \r and finished lines with \n
+    handler = reporter.new_message_handler()
+    buf = b""
+    for chunk in iter(lambda: stream.read1(4096) if hasattr(stream, "read1") else stream.read(4096), b""):
+        buf += chunk
+        parts = re.split(rb"[\r\n]", buf)
+        buf = parts.pop()
+        for part in parts:
+            if part.strip():
+                handler(part.decode("utf-8", "replace"))
+    if buf.strip():
+        handler(buf.decode("utf-8", "replace"))
+
+
+def run_remote(
+    repo,
+    operation: str,
+    args: Optional[List[str]] = None,
+    cancel: Optional[CancelHandle] = None,
+    timeout: Optional[float] = None,
+    reporter: Optional[ProgressReporter] = None,
+) -> str:
+    """Run `git <push|pull|fetch> --progress <args>` streaming throttled progress.
+    Returns git's non-progress output; raises GitCancelled or GitCommandError.
+    """
+    cancel = cancel or CancelHandle()
+    reporter = reporter or ProgressReporter(operation)
+    command = ["git", operation, "--progress", *(args or [])]
+    proc = repo.git.execute(command, as_process=True)
+    out: List[bytes] = []
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stderr, reporter, current_sink()), daemon=True),
+        threading.Thread(target=lambda: out.append(proc.stdout.read()), daemon=True),
+    ]
+    for t in readers:
+        t.start()
+    deadline = time.monotonic() + timeout if timeout else None
+    killed = None
+    while proc.proc.poll() is None:
+        if cancel.cancelled():
+            killed = "cancelled"
+        elif deadline and time.monotonic() > deadline:
+            killed = "timed out"
+        if killed:
+            proc.proc.kill()
+            break
+        time.sleep(0.1)
+    status = proc.proc.wait()
+    for t in readers:
+        t.join(timeout=5)
+    if killed == "cancelled":
+        emit("progress", operation=operation, stage="cancelled", done=True)
+        raise GitCancelled(f"git {operation} cancelled")
+    stdout = b"".join(out).decode("utf-8", "replace").strip()
+    output = "\n".join(line for line in [stdout, *reporter.other_lines] if line.strip())
+    if killed or status != 0:
+        stderr = "\n".join(reporter.error_lines or reporter.other_lines[-5:])
+        raise GitCommandError(command, status if not killed else f"{killed} after {timeout}s", stderr)
+    return output
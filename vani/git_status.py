@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+
+from .config import GIT_STATUS_UNTRACKED_CACHE, GIT_STATUS_FSMONITOR, GIT_STATUS_MAX_PATHS
+from .repo_pool import get_repo
+
+
+@dataclass
+class GitStatus:
+    """Parsed `git status --porcelain=v2 --branch`. Counts are exact; path lists are capped at max_paths."""
+    branch: Optional[str] = None  # None when HEAD is detached
+    oid: Optional[str] = None  # None before the first commit
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    staged_count: int = 0
+    unstaged_count: int = 0
+    untracked_count: int = 0
+    conflicted_count: int = 0
+    staged: List[str] = field(default_factory=list)
+    unstaged: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+    conflicted: List[str] = field(default_factory=list)
+    renamed: List[List[str]] = field(default_factory=list)  # [from, to]
+    truncated: bool = False
+
+    @property
+    def clean(self) -> bool:
+        return not (self.staged_count or self.unstaged_count or self.untracked_count or self.conflicted_count)
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["clean"] = self.clean
+        return d
+
+    def summary(self) -> str:
+        """One or two short sentences suitable for speech."""
+        where = f"On branch {self.branch}" if self.branch else "HEAD is detached"
+        if self.upstream:
+            if self.ahead and self.behind:
+                where += f", {self.ahead} ahead and {self.behind} behind {self.upstream}"
+            elif self.ahead:
+                where += f", {self.ahead} ahead of {self.upstream}"
+            elif self.behind:
+                where += f", {self.behind} behind {self.upstream}"
+            else:
+                where += f", up to date with {self.upstream}"
+        if self.clean:
+            return f"{where}. Working tree clean."
+        parts = []
+        if self.conflicted_count:
+            parts.append(f"{self.conflicted_count} conflicted")
+        if self.staged_count:
+            parts.append(f"{self.staged_count} staged")
+        if self.unstaged_count:
+            parts.append(f"{self.unstaged_count} modified")
+        if self.untracked_count:
+            parts.append(f"{self.untracked_count} untracked")
+        return f"{where}. Changes: " + ", ".join(parts) + "."
+
+
+def _add(status: GitStatus, paths: List[str], path: str, max_paths: int) -> None:
+    if len(paths) < max_paths:
+        paths.append(path)
+    else:
+        status.truncated = True
+
+
+def parse_porcelain_v2(output: str, max_paths: int = GIT_STATUS_MAX_PATHS) -> GitStatus:
+    """Parse NUL-separated `--porcelain=v2 --branch -z` output."""
+    status = GitStatus()
+    entries = output.split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "#":
+            key, _, value = entry[2:].partition(" ")
+            if key == "branch.oid":
+                status.oid = None if value == "(initial)" else value
+            elif key == "branch.head":
+                status.branch = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status.upstream = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                status.ahead, status.behind = int(ahead), abs(int(behind))
+        elif kind in "12":
+            # 1 XY sub mH mI mW hH hI path | 2 XY sub mH mI mW hH hI Xscore path, then origPath as its own entry
+            fields = entry.split(" ", 9 if kind == "2" else 8)
+            xy, path = fields[1], fields[-1]
+            if kind == "2":
+                orig = entries[i] if i < len(entries) else ""
+                i += 1
+                if len(status.renamed) < max_paths:
+                    status.renamed.append([orig, path])
+            if xy[0] != ".":
+                status.staged_count += 1
+                _add(status, status.staged, path, max_paths)
+            if xy[1] != ".":
+                status.unstaged_count += 1
+                _add(status, status.unstaged, path, max_paths)
+        elif kind == "u":
+            status.conflicted_count += 1
+            _add(status, status.conflicted, entry.split(" ", 10)[-1], max_paths)
+        elif kind == "?":
+            status.untracked_count += 1
+            _add(status, status.untracked, entry[2:], max_paths)
+    return status
+
+
+def status_args(
+    untracked_cache: bool = GIT_STATUS_UNTRACKED_CACHE, fsmonitor: bool = GIT_STATUS_FSMONITOR, untracked_all: bool = False
+) -> List[str]:
+    """Full git argv for a porcelain v2 status, with the optional big-tree accelerators.
+    untracked_all lists every untracked file instead of collapsing new directories.
+    """
+    argv = ["git"]
+    if untracked_cache:
+        argv += ["-c", "core.untrackedCache=true"]
+    if fsmonitor:
+        argv += ["-c", "core.fsmonitor=true"]
+    argv += ["status", "--porcelain=v2", "--branch", "-z"]
+    if untracked_all:
+        argv.append("--untracked-files=all")
+    return argv
+
+
+def read_status(
+    repo_path: Optional[str] = None,
+    untracked_cache: bool = GIT_STATUS_UNTRACKED_CACHE,
+    fsmonitor: bool = GIT_STATUS_FSMONITOR,
+    max_paths: int = GIT_STATUS_MAX_PATHS,
+    untracked_all: bool = False,
+    timeout: Optional[float] = None,
+) -> GitStatus:
+    repo = get_repo(repo_path)
+    output = repo.git.execute(
+        status_args(untracked_cache, fsmonitor, untracked_all), strip_newline_in_stdout=False, kill_after_timeout=timeout
+    )
+    return parse_porcelain_v2(output, max_paths)
@@ -0,0 +1,120 @@
+from typing import AsyncIterator, List, Optional
+
+from .config import GITHUB_TOKEN
+from .github_client import AsyncGitHubClient, get_async_client
+from .github_ops import GitHubError, _SNAPSHOT_QUERY, _parse_snapshot
+
+# Async mirrors of the github_ops REST helpers for use from the event loop (vani.api).
+__all__ = [
+    "create_repo",
+    "delete_repo",
+    "list_repos",
+    "iter_repos",
+    "list_open_prs",
+    "create_pull_request",
+    "merge_pull_request",
+    "list_issues",
+    "create_issue",
+    "close_issue",
+    "repo_snapshot",
+]
+
+
+def _client() -> AsyncGitHubClient:
+    if not GITHUB_TOKEN:
+        raise GitHubError("GITHUB_TOKEN not configured")
+    return get_async_client()
+
+
+async def create_repo(name: str, private: bool = True, org: Optional[str] = None, description: Optional[str] = None) -> dict:
+    path = f"/orgs/{org}/repos" if org else "/user/repos"
+    payload = {"name": name, "private": private}
+    if description:
+        payload["description"] = description
+    r = await _client().post(path, json=payload)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub create_repo failed: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def delete_repo(owner: str, name: str) -> None:
+    r = await _client().delete(f"/repos/{owner}/{name}")
+    if r.status_code == 404:
+        raise GitHubError("Repository not found")
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub delete_repo failed: {r.status_code} {r.text}")
+
+
+async def _iter_items(op: str, path: str, params: Optional[dict] = None) -> AsyncIterator[dict]:
+    async for page in _client().iter_pages(path, params=params):
+        if page.status_code >= 300:
+            raise GitHubError(f"GitHub {op} failed: {page.status_code} {page.text}")
+        for item in page.data or []:
+            yield item
+
+
+def iter_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> AsyncIterator[dict]:
+    params = {}
+    if visibility in {"all", "public", "private"}:
+        params["visibility"] = visibility
+    path = f"/orgs/{org}/repos" if org else "/user/repos"
+    return _iter_items("list_repos", path, params)
+
+
+async def list_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> list:
+    return [r async for r in iter_repos(org=org, visibility=visibility)]
+
+
+async def list_open_prs(owner: str, repo: str) -> List[dict]:
+    return [p async for p in _iter_items("list_open_prs", f"/repos/{owner}/{repo}/pulls")]
+
+
+async def create_pull_request(owner: str, repo: str, title: str, head: str, base: str, body: Optional[str] = None) -> dict:
+    payload = {"title": title, "head": head, "base": base}
+    if body:
+        payload["body"] = body
+    r = await _client().post(f"/repos/{owner}/{repo}/pulls", json=payload)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub create_pull_request failed: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def merge_pull_request(owner: str, repo: str, number: int, commit_title: Optional[str] = None) -> dict:
+    payload = {"merge_method": "squash"}
+    if commit_title:
+        payload["commit_title"] = commit_title
+    r = await _client().put(f"/repos/{owner}/{repo}/pulls/{number}/merge", json=payload)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub merge_pull_request failed: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def list_issues(owner: str, repo: str, state: str = "open") -> List[dict]:
+    return [i async for i in _iter_items("list_issues", f"/repos/{owner}/{repo}/issues", {"state": state})]
+
+
+async def create_issue(owner: str, repo: str, title: str, body: Optional[str] = None, labels: Optional[List[str]] = None) -> dict:
+    payload = {"title": title}
+    if body:
+        payload["body"] = body
+    if labels:
+        payload["labels"] = labels
+    r = await _client().post(f"/repos/{owner}/{repo}/issues", json=payload)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub create_issue failed: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def close_issue(owner: str, repo: str, number: int) -> dict:
+    r = await _client().patch(f"/repos/{owner}/{repo}/issues/{number}", json={"state": "closed"})
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub close_issue failed: {r.status_code} {r.text}")
+    return r.json()
+
+
+async def repo_snapshot(owner: str, repo: str, first: int = 5) -> dict:
+    payload = {"query": _SNAPSHOT_QUERY, "variables": {"owner": owner, "name": repo, "first": first}}
+    r = await _client().post("/graphql", json=payload, idempotent=True)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub repo_snapshot failed: {r.status_code} {r.text}")
+    return _parse_snapshot(r.json())
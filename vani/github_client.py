@@ -0,0 +1,736 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlparse, parse_qs
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    GITHUB_TOKEN,
+    GITHUB_API_URL,
+    GITHUB_POOL_SIZE,
+    GITHUB_CONNECT_TIMEOUT,
+    GITHUB_READ_TIMEOUT,
+    GITHUB_CACHE_TTL,
+    GITHUB_CACHE_MAX_ENTRIES,
+    GITHUB_PAGE_WORKERS,
+    GITHUB_MAX_PAGES,
+    GITHUB_MAX_RETRIES,
+    GITHUB_BACKOFF_BASE,
+    GITHUB_BACKOFF_MAX,
+    GITHUB_MAX_RETRY_WAIT,
+    GITHUB_RATE_LOW_WATERMARK,
+    GITHUB_ASYNC_MAX_CONNECTIONS,
+)
+
+_MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_TRANSIENT_STATUSES = {502, 503, 504}
+_REPO_SCOPE = re.compile(r"^/repos/[^/]+/[^/]+")
+
+
+@dataclass
+class CachedResponse:
+    """Minimal response view returned by GitHubClient.get_cached."""
+    status_code: int
+    data: Any = None
+    text: str = ""
+    links: Dict[str, dict] = field(default_factory=dict)
+    from_cache: bool = False
+
+
+@dataclass
+class _CacheEntry:
+    path: str
+    data: Any
+    links: Dict[str, dict]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    """LRU store of GET bodies with their validators; fresh for ttl seconds, then revalidated."""
+
+    def __init__(self, ttl: float = GITHUB_CACHE_TTL, max_entries: int = GITHUB_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "invalidated": 0}
+
+    @staticmethod
+    def key(path: str, params: Optional[dict]) -> str:
+        if not params:
+            return path
+        return f"{path}?{urlencode(sorted(params.items()))}"
+
+    def lookup(self, key: str) -> Tuple[Optional[_CacheEntry], bool]:
+        """Return (entry, is_fresh)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            return entry, (time.time() - entry.fetched_at) < self.ttl
+
+    def store(self, key: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = time.time()
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def invalidate(self, prefixes: Iterable[str]) -> int:
+        prefixes = tuple(p.lower() for p in prefixes)
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if any(_under(e.path.lower(), p) for p in prefixes)]
+            for k in stale:
+                del self._entries[k]
+            self._counters["invalidated"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "ttl": self.ttl, **self._counters}
+
+
+class RequestScheduler:
+    """Rate-limit budget tracking and retry policy shared by the GitHub clients.
+    Holds no transport: clients ask it how long to wait and whether to retry.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = GITHUB_MAX_RETRIES,
+        backoff_base: float = GITHUB_BACKOFF_BASE,
+        backoff_max: float = GITHUB_BACKOFF_MAX,
+        max_wait: float = GITHUB_MAX_RETRY_WAIT,
+        low_watermark: int = GITHUB_RATE_LOW_WATERMARK,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self._budget: Dict[str, dict] = {}
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._counters = {"retries": 0, "rate_limited": 0, "transient": 0, "errors": 0, "gave_up": 0}
+        self._throttled_seconds = 0.0
+
+    @staticmethod
+    def resource_for(path: str) -> str:
+        if path.startswith("/graphql"):
+            return "graphql"
+        if path.startswith("/search"):
+            return "search"
+        return "core"
+
+    @staticmethod
+    def repo_key(method: str, path: str) -> Optional[str]:
+        """Mutating calls on the same repo are serialized under this key."""
+        if method.upper() not in _MUTATING_METHODS:
+            return None
+        m = _REPO_SCOPE.match(path)
+        return m.group(0).lower() if m else None
+
+    def repo_lock(self, method: str, path: str):
+        key = self.repo_key(method, path)
+        if key is None:
+            return nullcontext()
+        with self._lock:
+            return self._repo_locks.setdefault(key, threading.Lock())
+
+    def observe(self, path: str, headers: Mapping[str, str]) -> None:
+        """Record the X-RateLimit-* budget reported by a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource") or self.resource_for(path)
+        try:
+            budget = {
+                "limit": int(headers.get("X-RateLimit-Limit") or 0),
+                "remaining": int(remaining),
+                "reset": float(headers.get("X-RateLimit-Reset") or 0),
+            }
+        except ValueError:
+            return
+        with self._lock:
+            self._budget[resource] = budget
+
+    def throttle_delay(self, path: str) -> float:
+        """Seconds to wait before sending, spreading a low budget evenly until its reset."""
+        with self._lock:
+            budget = self._budget.get(self.resource_for(path))
+        if not budget or budget["remaining"] > self.low_watermark:
+            return 0.0
+        until_reset = budget["reset"] - time.time()
+        if until_reset <= 0:
+            return 0.0
+        delay = until_reset if budget["remaining"] <= 0 else until_reset / budget["remaining"]
+        # Never stall a voice command longer than max_wait; let GitHub reject it instead
+        if delay > self.max_wait:
+            return 0.0
+        return delay
+
+    def note_throttled(self, seconds: float) -> None:
+        with self._lock:
+            self._throttled_seconds += seconds
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, capped exponential]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _is_rate_limited(status: int, headers: Mapping[str, str], text: str) -> bool:
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        return (
+            headers.get("Retry-After") is not None
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in (text or "").lower()
+        )
+
+    def _count(self, *counters: str) -> None:
+        with self._lock:
+            for c in counters:
+                self._counters[c] += 1
+
+    def retry_delay(
+        self, method: str, status: int, headers: Mapping[str, str], text: str, attempt: int, idempotent: Optional[bool] = None
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None to surface it as-is."""
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        if self._is_rate_limited(status, headers, text):
+            # Rate-limited requests were rejected unprocessed, so even POSTs are safe to resend
+            reason = "rate_limited"
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    delay = self._backoff(attempt)
+            elif headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+                delay = max(float(headers["X-RateLimit-Reset"]) - time.time(), 0.0) + 1.0
+            else:
+                # Secondary limit without guidance: jittered backoff, but never sooner than a second
+                delay = max(self._backoff(attempt), 1.0)
+        elif status in _TRANSIENT_STATUSES and idempotent:
+            reason = "transient"
+            delay = self._backoff(attempt)
+        else:
+            return None
+        if attempt >= self.max_retries or delay > self.max_wait:
+            self._count("gave_up")
+            return None
+        self._count("retries", reason)
+        return delay
+
+    def error_delay(self, method: str, attempt: int, idempotent: Optional[bool] = None) -> Optional[float]:
+        """Backoff after a connection error or timeout, or None to re-raise."""
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        if not idempotent or attempt >= self.max_retries:
+            self._count("gave_up")
+            return None
+        self._count("retries", "errors")
+        return self._backoff(attempt)
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            budget = {
+                name: {
+                    "limit": b["limit"],
+                    "remaining": b["remaining"],
+                    "reset_in": max(int(b["reset"] - now), 0),
+                }
+                for name, b in self._budget.items()
+            }
+            return {
+                "budget": budget,
+                "throttled_seconds": round(self._throttled_seconds, 3),
+                **self._counters,
+            }
+
+
+def _default_headers(token: Optional[str]) -> Dict[str, str]:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+        "Connection": "keep-alive",
+        "User-Agent": "vani-agent",
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def _page_number(link: Optional[dict]) -> Optional[int]:
+    """Extract the page query parameter from a parsed Link header entry."""
+    if not link or not link.get("url"):
+        return None
+    try:
+        return int(parse_qs(urlparse(link["url"]).query).get("page", [None])[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def _page_params(params: Optional[dict], max_pages: int, limit: Optional[int]) -> Tuple[dict, int]:
+    """Query params and page cap for iter_pages; a limit shrinks both to what it needs."""
+    base = dict(params or {})
+    base["per_page"] = 100
+    if limit is not None:
+        base["per_page"] = max(1, min(limit, 100))
+        max_pages = min(max_pages, max(1, -(-limit // base["per_page"])))
+    return base, max_pages
+
+
+def _under(path: str, prefix: str) -> bool:
+    """Whether path is prefix itself or lies below it ("/repos/o/r" covers "/repos/o/r/pulls", not "/repos/o/r-other")."""
+    if prefix.endswith("/"):
+        return path.startswith(prefix)
+    return path == prefix or path.startswith((prefix + "/", prefix + "?"))
+
+
+def _invalidation_scope(path: str) -> Tuple[str, ...]:
+    """Cache prefixes made stale by a successful mutating call on path."""
+    m = _REPO_SCOPE.match(path)
+    if m:
+        # PR/issue writes stale that repo's lists; editing or deleting the repo itself stales repo lists too
+        if path.rstrip("/").lower() == m.group(0).lower():
+            return (m.group(0), "/user/repos", "/orgs/")
+        return (m.group(0),)
+    if _under(path.lower(), "/user/repos") or path.lower().startswith("/orgs/"):
+        return ("/user/repos", "/orgs/")
+    return ()
+
+
+class GitHubClient:
+    """Shared GitHub REST client backed by a pooled keep-alive requests.Session."""
+
+    def __init__(
+        self,
+        token: Optional[str] = GITHUB_TOKEN,
+        base_url: str = GITHUB_API_URL,
+        pool_size: int = GITHUB_POOL_SIZE,
+        connect_timeout: float = GITHUB_CONNECT_TIMEOUT,
+        read_timeout: float = GITHUB_READ_TIMEOUT,
+        cache: Optional[ResponseCache] = None,
+        page_workers: int = GITHUB_PAGE_WORKERS,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.cache = cache or ResponseCache()
+        self.scheduler = scheduler or RequestScheduler()
+        # Page fetchers share the connection pool, so never run more of them than sockets
+        self._page_pool = ThreadPoolExecutor(
+            max_workers=max(1, min(page_workers, pool_size)), thread_name_prefix="github-page"
+        )
+        self.session = requests.Session()
+        # One host, so a single pool; maxsize bounds concurrent sockets, block avoids overflow sockets
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update(_default_headers(token))
+
+    def url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}{path}"
+
+    def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Send a request through the scheduler: budget throttling, retries, per-repo write ordering.
+        idempotent overrides the method-based retry policy (e.g. GraphQL queries sent as POST).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        rel = self._path(path)
+        with self.scheduler.repo_lock(method, rel):
+            attempt = 0
+            while True:
+                wait = self.scheduler.throttle_delay(rel)
+                if wait > 0:
+                    self.scheduler.note_throttled(wait)
+                    time.sleep(wait)
+                try:
+                    r = self.session.request(method, self.url(path), **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    delay = self.scheduler.error_delay(method, attempt, idempotent)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                with self._lock:
+                    self._requests += 1
+                self.scheduler.observe(rel, r.headers)
+                # Only 403 bodies are inspected, so skip decoding large list payloads here
+                text = r.text if r.status_code == 403 else ""
+                delay = self.scheduler.retry_delay(method, r.status_code, r.headers, text, attempt, idempotent)
+                if delay is None:
+                    break
+                r.close()
+                time.sleep(delay)
+                attempt += 1
+        if method.upper() in _MUTATING_METHODS and r.status_code < 400:
+            scope = _invalidation_scope(self._path(path))
+            if scope:
+                self.cache.invalidate(scope)
+        return r
+
+    def _path(self, path: str) -> str:
+        if path.startswith(self.base_url):
+            return path[len(self.base_url):]
+        return path
+
+    def get_cached(self, path: str, params: Optional[dict] = None) -> CachedResponse:
+        """GET with TTL freshness and If-None-Match/If-Modified-Since revalidation.
+        304 responses do not count against the GitHub rate limit.
+        """
+        key = ResponseCache.key(self._path(path), params)
+        entry, fresh = self.cache.lookup(key)
+        if entry is not None and fresh:
+            self.cache.count("fresh_hits")
+            return CachedResponse(200, entry.data, links=entry.links, from_cache=True)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        r = self.get(path, params=params, headers=headers)
+        if r.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            self.cache.count("revalidated")
+            return CachedResponse(200, entry.data, links=entry.links, from_cache=True)
+        self.cache.count("misses")
+        if r.status_code >= 300:
+            return CachedResponse(r.status_code, None, text=r.text)
+        data = r.json()
+        links = dict(r.links or {})
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        self.cache.store(key, _CacheEntry(self._path(path), data, links, etag, last_modified, time.time()))
+        return CachedResponse(r.status_code, data, links=links)
+
+    def iter_pages(
+        self, path: str, params: Optional[dict] = None, max_pages: int = GITHUB_MAX_PAGES, limit: Optional[int] = None
+    ) -> Iterator[CachedResponse]:
+        """Yield every page of a list endpoint in order, 100 items per page.
+        Page 1 is fetched first; once its Link header names the last page, the rest are
+        submitted to the bounded page pool before page 1 is yielded, so they load while
+        earlier pages are consumed. A non-2xx page is yielded as-is and ends the iteration.
+        With limit, pages shrink to the limit and only the pages needed to cover it are fetched.
+        """
+        base, max_pages = _page_params(params, max_pages, limit)
+        first = self.get_cached(path, params={**base, "page": 1})
+        if first.status_code >= 300:
+            yield first
+            return
+        last = _page_number(first.links.get("last"))
+        if last is None:
+            # No last link: either a single page or an endpoint that only exposes rel=next
+            yield first
+            page, current = 1, first
+            while "next" in current.links and page < max_pages:
+                page += 1
+                current = self.get_cached(path, params={**base, "page": page})
+                yield current
+                if current.status_code >= 300:
+                    return
+            return
+        last = min(last, max_pages)
+        futures = [
+            self._page_pool.submit(self.get_cached, path, {**base, "page": n})
+            for n in range(2, last + 1)
+        ]
+        try:
+            yield first
+            for fut in futures:
+                page = fut.result()
+                yield page
+                if page.status_code >= 300:
+                    return
+        finally:
+            # Consumer stopped early (or errored): drop pages nobody will read
+            for fut in futures:
+                fut.cancel()
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def stats(self) -> dict:
+        """Connection reuse counters: requests sent vs sockets opened by the pool."""
+        connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections += getattr(pool, "num_connections", 0)
+        with self._lock:
+            sent = self._requests
+        return {
+            "requests": sent,
+            "connections_opened": connections,
+            "connections_reused": max(sent - connections, 0),
+            "cache": self.cache.stats(),
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def close(self) -> None:
+        self._page_pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_CLIENT: Optional[GitHubClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> GitHubClient:
+    """Return the process-wide GitHub client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = GitHubClient()
+    return _CLIENT
+
+
+class AsyncGitHubClient:
+    """Non-blocking counterpart of GitHubClient on httpx.AsyncClient.
+    Shares the response cache and rate-limit scheduler with the sync client, so both
+    paths see one budget and one set of cached list bodies.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = GITHUB_TOKEN,
+        base_url: str = GITHUB_API_URL,
+        max_connections: int = GITHUB_ASYNC_MAX_CONNECTIONS,
+        connect_timeout: float = GITHUB_CONNECT_TIMEOUT,
+        read_timeout: float = GITHUB_READ_TIMEOUT,
+        page_workers: int = GITHUB_PAGE_WORKERS,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache or ResponseCache()
+        self.scheduler = scheduler or RequestScheduler()
+        self.page_workers = max(1, page_workers)
+        self._requests = 0
+        self._repo_locks: Dict[str, asyncio.Lock] = {}
+        self.http = httpx.AsyncClient(
+            headers=_default_headers(token),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}{path}"
+
+    def _path(self, path: str) -> str:
+        if path.startswith(self.base_url):
+            return path[len(self.base_url):]
+        return path
+
+    def _repo_lock(self, method: str, path: str):
+        key = self.scheduler.repo_key(method, path)
+        if key is None:
+            return _NullAsyncLock()
+        return self._repo_locks.setdefault(key, asyncio.Lock())
+
+    async def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        rel = self._path(path)
+        async with self._repo_lock(method, rel):
+            attempt = 0
+            while True:
+                wait = self.scheduler.throttle_delay(rel)
+                if wait > 0:
+                    self.scheduler.note_throttled(wait)
+                    await asyncio.sleep(wait)
+                try:
+                    r = await self.http.request(method, self.url(path), **kwargs)
+                except httpx.TransportError:
+                    delay = self.scheduler.error_delay(method, attempt, idempotent)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                self._requests += 1
+                self.scheduler.observe(rel, r.headers)
+                text = r.text if r.status_code == 403 else ""
+                delay = self.scheduler.retry_delay(method, r.status_code, r.headers, text, attempt, idempotent)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+                attempt += 1
+        if method.upper() in _MUTATING_METHODS and r.status_code < 400:
+            scope = _invalidation_scope(rel)
+            if scope:
+                self.cache.invalidate(scope)
+        return r
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def get_cached(self, path: str, params: Optional[dict] = None) -> CachedResponse:
+        key = ResponseCache.key(self._path(path), params)
+        entry, fresh = self.cache.lookup(key)
+        if entry is not None and fresh:
+            self.cache.count("fresh_hits")
+            return CachedResponse(200, entry.data, links=entry.links, from_cache=True)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        r = await self.get(path, params=params, headers=headers)
+        if r.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            self.cache.count("revalidated")
+            return CachedResponse(200, entry.data, links=entry.links, from_cache=True)
+        self.cache.count("misses")
+        if r.status_code >= 300:
+            return CachedResponse(r.status_code, None, text=r.text)
+        data = r.json()
+        links = dict(r.links or {})
+        self.cache.store(
+            key,
+            _CacheEntry(self._path(path), data, links, r.headers.get("ETag"), r.headers.get("Last-Modified"), time.time()),
+        )
+        return CachedResponse(r.status_code, data, links=links)
+
+    async def iter_pages(
+        self, path: str, params: Optional[dict] = None, max_pages: int = GITHUB_MAX_PAGES, limit: Optional[int] = None
+    ) -> AsyncIterator[CachedResponse]:
+        """Async version of GitHubClient.iter_pages; remaining pages run as bounded concurrent tasks."""
+        base, max_pages = _page_params(params, max_pages, limit)
+        first = await self.get_cached(path, params={**base, "page": 1})
+        if first.status_code >= 300:
+            yield first
+            return
+        last = _page_number(first.links.get("last"))
+        if last is None:
+            yield first
+            page, current = 1, first
+            while "next" in current.links and page < max_pages:
+                page += 1
+                current = await self.get_cached(path, params={**base, "page": page})
+                yield current
+                if current.status_code >= 300:
+                    return
+            return
+        gate = asyncio.Semaphore(self.page_workers)
+
+        async def fetch(n: int) -> CachedResponse:
+            async with gate:
+                return await self.get_cached(path, {**base, "page": n})
+
+        # Created before page 1 is yielded so later pages load while the caller handles it
+        tasks = [asyncio.ensure_future(fetch(n)) for n in range(2, min(last, max_pages) + 1)]
+        try:
+            yield first
+            for task in tasks:
+                page = await task
+                yield page
+                if page.status_code >= 300:
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self._requests,
+            "cache": self.cache.stats(),
+            "scheduler": self.scheduler.stats(),
+        }
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+class _NullAsyncLock:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_ASYNC_CLIENT: Optional[AsyncGitHubClient] = None
+
+
+def get_async_client() -> AsyncGitHubClient:
+    """Return the event-loop-side GitHub client; it shares cache and budget with get_client()."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        sync = get_client()
+        _ASYNC_CLIENT = AsyncGitHubClient(cache=sync.cache, scheduler=sync.scheduler)
+    return _ASYNC_CLIENT
+
+
+async def close_async_client() -> None:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
@@ -1,12 +1,16 @@
 import os
-import requests
-from typing import Optional, List, Tuple
-from git import Repo
+import time
+from itertools import islice
+from typing import Iterator, Optional, List, Tuple
 
 from .config import GITHUB_TOKEN, GITHUB_DEFAULT_VISIBILITY, GITHUB_DEFAULT_ORG, GITHUB_DEFAULT_PROTOCOL
-from .audio import speak
-
-GITHUB_API = "https://api.github.com"
+from .audio import speak, speak_async
+from .github_client import GitHubClient, get_client
+from .repo_pool import get_repo, repo_info
+from .repo_locks import repo_lock
+from .staging import StageResult, stage_and_commit
+from .git_progress import run_remote
+from .taskgraph import Step, run_graph, timings
 
 class GitHubError(Exception):
     pass
@@ -17,33 +21,45 @@ __all__ = [
     "delete_repo",
     "link_remote",
     "list_repos",
+    "iter_repos",
     "list_open_prs",
+    "iter_open_prs",
     "create_pull_request",
     "merge_pull_request",
     "list_issues",
+    "iter_issues",
     "create_issue",
     "close_issue",
+    "repo_snapshot",
     "push_local_repo",
+    "client_stats",
+    "clear_cache",
 ]
 
 
-def _headers():
+def _client() -> GitHubClient:
     if not GITHUB_TOKEN:
         raise GitHubError("GITHUB_TOKEN not configured")
-    return {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
+    return get_client()
+
+
+def client_stats() -> dict:
+    """Connection pool, response cache, rate-limit budget and retry counters for the shared GitHub client."""
+    return get_client().stats()
+
+
+def clear_cache() -> None:
+    """Drop all cached list responses (next reads go to GitHub)."""
+    get_client().cache.clear()
 
 
 def create_repo(name: str, private: bool = True, org: Optional[str] = None, description: Optional[str] = None) -> dict:
     """Create a GitHub repository under user or org."""
     path = f"/orgs/{org}/repos" if org else "/user/repos"
-    url = f"{GITHUB_API}{path}"
     payload = {"name": name, "private": private}
     if description:
         payload["description"] = description
-    r = requests.post(url, headers=_headers(), json=payload, timeout=20)
+    r = _client().post(path, json=payload)
     if r.status_code >= 300:
         raise GitHubError(f"GitHub create_repo failed: {r.status_code} {r.text}")
     return r.json()
@@ -51,8 +67,7 @@ def create_repo(name: str, private: bool = True, org: Optional[str] = None, desc
 
 def delete_repo(owner: str, name: str) -> None:
     """Delete a GitHub repository. Requires delete_repo scope."""
-    url = f"{GITHUB_API}/repos/{owner}/{name}"
-    r = requests.delete(url, headers=_headers(), timeout=20)
+    r = _client().delete(f"/repos/{owner}/{name}")
     if r.status_code == 404:
         raise GitHubError("Repository not found")
     if r.status_code >= 300:
@@ -61,7 +76,11 @@ def delete_repo(owner: str, name: str) -> None:
 
 def link_remote(repo_path: str, owner: str, name: str, protocol: str = "ssh") -> str:
     """Set git remote 'origin' to the GitHub repo using ssh or https."""
-    repo = Repo(repo_path)
+    with repo_lock(repo_path, "write"):
+        return _set_origin(get_repo(repo_path), owner, name, protocol)
+
+
+def _set_origin(repo, owner: str, name: str, protocol: str) -> str:
     remote_url = (
         f"git@github.com:{owner}/{name}.git" if protocol == "ssh" else f"https://github.com/{owner}/{name}.git"
     )
@@ -75,21 +94,30 @@ def link_remote(repo_path: str, owner: str, name: str, protocol: str = "ssh") ->
     return remote_url
 
 
-def push_local_repo(repo_path: str, commit_message: str = "voice commit") -> None:
-    """Stage, commit (if needed), and push local repo to origin."""
-    repo = Repo(repo_path)
-    # Stage all files
-    try:
-        repo.git.add(".")
-        print("Staged changes.")
-    except Exception as e:
-        print(f"Add error: {e}")
-    # Try to commit; ignore if nothing to commit
-    try:
-        repo.index.commit(commit_message)
+def push_local_repo(repo_path: str, commit_message: str = "voice commit") -> dict:
+    """Stage changed paths, commit (if needed), and push local repo to origin. Returns the staging report."""
+    with repo_lock(repo_path, "write"):
+        try:
+            staged = _stage_local(repo_path, commit_message)
+        except Exception as e:
+            print(f"Stage/commit error: {e}")
+            staged = StageResult()
+        return _push_origin(repo_path, staged)
+
+
+def _stage_local(repo_path: str, commit_message: str) -> StageResult:
+    # Stage only changed paths and commit only if the index differs from HEAD
+    staged = stage_and_commit(repo_path, commit_message)
+    print(f"Staged {staged.paths_staged} paths ({staged.bytes_staged} bytes).")
+    if staged.committed:
         print(f"Committed: {commit_message}")
-    except Exception as e:
-        print(f"Commit skipped or failed: {e}")
+    else:
+        print(f"Commit skipped: {staged.skipped}")
+    return staged
+
+
+def _push_origin(repo_path: str, staged: Optional[StageResult] = None) -> dict:
+    repo = get_repo(repo_path)
     # Ensure we are on a branch
     try:
         branch_name = repo.active_branch.name
@@ -120,7 +148,7 @@ def push_local_repo(repo_path: str, commit_message: str = "voice commit") -> Non
                 # Set temporary URL
                 repo.git.remote("set-url", "origin", auth_url)
                 # Push
-                repo.git.push("--set-upstream", "origin", branch_name)
+                run_remote(repo, "push", ["--set-upstream", "origin", branch_name])
             finally:
                 # Restore original URL
                 try:
@@ -128,121 +156,247 @@ def push_local_repo(repo_path: str, commit_message: str = "voice commit") -> Non
                 except Exception:
                     pass
         else:
-            repo.git.push("--set-upstream", "origin", branch_name)
+            run_remote(repo, "push", ["--set-upstream", "origin", branch_name])
         speak("Pushed your local repository to GitHub.")
+        pushed = True
     except Exception as e:
         print(f"Push error: {e}")
         speak("Failed to push; please check your SSH keys or HTTPS credentials.")
+        pushed = False
+    return {"branch": branch_name, "pushed": pushed, "staging": staged.to_dict() if staged else None}
 
 
-def list_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> list:
-    """List repositories for the authenticated user or a given org.
+def _iter_items(op: str, path: str, params: Optional[dict] = None, limit: Optional[int] = None) -> Iterator[dict]:
+    """Stream items across all pages of a list endpoint as pages arrive (at most limit of them)."""
+    items = _iter_page_items(op, path, params, limit)
+    return islice(items, limit) if limit is not None else items
+
+
+def _iter_page_items(op: str, path: str, params: Optional[dict], limit: Optional[int]) -> Iterator[dict]:
+    for page in _client().iter_pages(path, params=params, limit=limit):
+        if page.status_code >= 300:
+            raise GitHubError(f"GitHub {op} failed: {page.status_code} {page.text}")
+        yield from page.data or []
+
+
+def iter_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> Iterator[dict]:
+    """Yield repositories for the authenticated user or a given org, page by page.
     visibility: one of None, 'all', 'public', 'private'.
     """
     params = {}
     if visibility in {"all", "public", "private"}:
         params["visibility"] = visibility
-    if org:
-        url = f"{GITHUB_API}/orgs/{org}/repos"
-    else:
-        url = f"{GITHUB_API}/user/repos"
-    r = requests.get(url, headers=_headers(), params=params, timeout=20)
-    if r.status_code >= 300:
-        raise GitHubError(f"GitHub list_repos failed: {r.status_code} {r.text}")
-    return r.json()
+    path = f"/orgs/{org}/repos" if org else "/user/repos"
+    return _iter_items("list_repos", path, params)
+
+
+def list_repos(org: Optional[str] = None, visibility: Optional[str] = None) -> list:
+    """List all repositories for the authenticated user or a given org."""
+    return list(iter_repos(org=org, visibility=visibility))
+
+
+def iter_open_prs(owner: str, repo: str, limit: Optional[int] = None) -> Iterator[dict]:
+    return _iter_items("list_open_prs", f"/repos/{owner}/{repo}/pulls", limit=limit)
 
 
 def list_open_prs(owner: str, repo: str) -> List[dict]:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
-    r = requests.get(url, headers=_headers(), timeout=20)
-    if r.status_code >= 300:
-        raise GitHubError(f"GitHub list_open_prs failed: {r.status_code} {r.text}")
-    return r.json()
+    return list(iter_open_prs(owner, repo))
 
 
 def create_pull_request(owner: str, repo: str, title: str, head: str, base: str, body: Optional[str] = None) -> dict:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
     payload = {"title": title, "head": head, "base": base}
     if body:
         payload["body"] = body
-    r = requests.post(url, headers=_headers(), json=payload, timeout=20)
+    r = _client().post(f"/repos/{owner}/{repo}/pulls", json=payload)
     if r.status_code >= 300:
         raise GitHubError(f"GitHub create_pull_request failed: {r.status_code} {r.text}")
     return r.json()
 
 
 def merge_pull_request(owner: str, repo: str, number: int, commit_title: Optional[str] = None) -> dict:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{number}/merge"
     payload = {"merge_method": "squash"}
     if commit_title:
         payload["commit_title"] = commit_title
-    r = requests.put(url, headers=_headers(), json=payload, timeout=20)
+    r = _client().put(f"/repos/{owner}/{repo}/pulls/{number}/merge", json=payload)
     if r.status_code >= 300:
         raise GitHubError(f"GitHub merge_pull_request failed: {r.status_code} {r.text}")
     return r.json()
 
 
+def iter_issues(owner: str, repo: str, state: str = "open", limit: Optional[int] = None) -> Iterator[dict]:
+    return _iter_items("list_issues", f"/repos/{owner}/{repo}/issues", {"state": state}, limit=limit)
+
+
 def list_issues(owner: str, repo: str, state: str = "open") -> List[dict]:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/issues"
-    params = {"state": state}
-    r = requests.get(url, headers=_headers(), params=params, timeout=20)
-    if r.status_code >= 300:
-        raise GitHubError(f"GitHub list_issues failed: {r.status_code} {r.text}")
-    return r.json()
+    return list(iter_issues(owner, repo, state))
 
 
 def create_issue(owner: str, repo: str, title: str, body: Optional[str] = None, labels: Optional[List[str]] = None) -> dict:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/issues"
     payload = {"title": title}
     if body:
         payload["body"] = body
     if labels:
         payload["labels"] = labels
-    r = requests.post(url, headers=_headers(), json=payload, timeout=20)
+    r = _client().post(f"/repos/{owner}/{repo}/issues", json=payload)
     if r.status_code >= 300:
         raise GitHubError(f"GitHub create_issue failed: {r.status_code} {r.text}")
     return r.json()
 
 
 def close_issue(owner: str, repo: str, number: int) -> dict:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{number}"
     payload = {"state": "closed"}
-    r = requests.patch(url, headers=_headers(), json=payload, timeout=20)
+    r = _client().patch(f"/repos/{owner}/{repo}/issues/{number}", json=payload)
     if r.status_code >= 300:
         raise GitHubError(f"GitHub close_issue failed: {r.status_code} {r.text}")
     return r.json()
 
 
+# Only the fields spoken in summaries; one round trip instead of repo + pulls + issues + status calls
+_SNAPSHOT_QUERY = """
+query($owner: String!, $name: String!, $first: Int!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    defaultBranchRef {
+      name
+      target { ... on Commit { statusCheckRollup { state } } }
+    }
+    pullRequests(states: OPEN, first: $first, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      totalCount
+      nodes { number title }
+    }
+    issues(states: OPEN, first: $first, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      totalCount
+      nodes { number title }
+    }
+  }
+}
+"""
+
+_CI_STATES = {
+    "SUCCESS": "passing",
+    "FAILURE": "failing",
+    "ERROR": "failing",
+    "PENDING": "pending",
+    "EXPECTED": "pending",
+}
+
+
+def repo_snapshot(owner: str, repo: str, first: int = 5) -> dict:
+    """Open PRs, open issues, default branch and CI status for a repo in one GraphQL query."""
+    payload = {"query": _SNAPSHOT_QUERY, "variables": {"owner": owner, "name": repo, "first": first}}
+    # GraphQL reads are POSTs but safe to retry
+    r = _client().post("/graphql", json=payload, idempotent=True)
+    if r.status_code >= 300:
+        raise GitHubError(f"GitHub repo_snapshot failed: {r.status_code} {r.text}")
+    return _parse_snapshot(r.json())
+
+
+def _parse_snapshot(body: dict) -> dict:
+    if body.get("errors"):
+        msg = "; ".join(e.get("message", "") for e in body["errors"])
+        raise GitHubError(f"GitHub repo_snapshot failed: {msg}")
+    data = (body.get("data") or {}).get("repository")
+    if not data:
+        raise GitHubError("Repository not found")
+    branch = data.get("defaultBranchRef") or {}
+    rollup = ((branch.get("target") or {}).get("statusCheckRollup") or {}).get("state")
+    prs = data.get("pullRequests") or {}
+    issues = data.get("issues") or {}
+    return {
+        "full_name": data.get("nameWithOwner"),
+        "default_branch": branch.get("name"),
+        "ci_status": _CI_STATES.get(rollup, "unknown") if rollup else None,
+        "open_prs": {"total": prs.get("totalCount", 0), "items": prs.get("nodes") or []},
+        "open_issues": {"total": issues.get("totalCount", 0), "items": issues.get("nodes") or []},
+    }
+
+
+def _snapshot_summary(snap: dict) -> str:
+    parts = [f"{snap.get('full_name')} on {snap.get('default_branch') or 'no default branch'}"]
+    if snap.get("ci_status"):
+        parts[0] += f", CI {snap['ci_status']}"
+    for label, key in (("open PRs", "open_prs"), ("open issues", "open_issues")):
+        group = snap.get(key) or {}
+        titles = [i.get("title") for i in group.get("items", [])[:3]]
+        line = f"{group.get('total', 0)} {label}"
+        if titles:
+            line += ": " + ", ".join(titles)
+        parts.append(line)
+    return ". ".join(parts) + "."
+
+
 def _detect_owner_repo(repo_path: str) -> Tuple[Optional[str], Optional[str]]:
+    # Served from the repo pool; only re-parsed after .git/config or HEAD change
     try:
-        repo = Repo(repo_path)
-        url = None
-        try:
-            url = repo.remotes.origin.url
-        except Exception:
-            try:
-                remotes = list(repo.remotes)
-                url = remotes[0].url if remotes else None
-            except Exception:
-                url = None
-        if not url:
-            return None, None
-        if url.startswith("git@github.com:"):
-            path = url.split("git@github.com:")[-1]
-        elif "github.com/" in url:
-            path = url.split("github.com/")[-1]
-        else:
-            return None, None
-        if path.endswith(".git"):
-            path = path[:-4]
-        parts = path.split("/", 1)
-        if len(parts) != 2:
-            return None, None
-        return parts[0], parts[1]
+        info = repo_info(repo_path)
+        return info.owner, info.name
     except Exception:
         return None, None
 
-def handle_github_operation(args: dict) -> None:
+
+def _create_and_push(
+    name: str,
+    private: bool,
+    org: Optional[str],
+    description: Optional[str],
+    repo_path: str,
+    protocol: str,
+    push_local: bool,
+    commit_message: str,
+) -> dict:
+    """create_repo as a small dependency graph: the API call and local staging/commit run
+    concurrently, link waits for the repo, push waits for link + stage. Speech never blocks a step.
+    """
+    started = time.perf_counter()
+    spoken = []
+
+    def create(_):
+        result = create_repo(name=name, private=private, org=org, description=description)
+        spoken.append(speak_async(f"Created repo {result.get('full_name')}."))
+        return result
+
+    def link(inputs):
+        owner = inputs["create"].get("owner", {}).get("login")
+        url = link_remote(repo_path=repo_path, owner=owner, name=name, protocol=protocol)
+        spoken.append(speak_async("Linked origin to GitHub."))
+        return url
+
+    def stage(_):
+        with repo_lock(repo_path, "write"):
+            return _stage_local(repo_path, commit_message)
+
+    def push(inputs):
+        with repo_lock(repo_path, "write"):
+            return _push_origin(repo_path, inputs["stage"])
+
+    steps = [Step("create", create), Step("link", link, ("create",))]
+    if push_local:
+        steps += [Step("stage", stage), Step("push", push, ("link", "stage"))]
+    results = run_graph(steps)
+    if not results["create"]["ok"]:
+        raise results["create"]["exception"]
+    full_name = results["create"]["value"].get("full_name")
+    url = results["link"].get("value")
+    if not results["link"]["ok"]:
+        spoken.append(speak_async("Repo created; link skipped because no local git repo found here."))
+    elif push_local and not results["push"]["ok"]:
+        spoken.append(speak_async("Link done, but push failed."))
+    # Let queued speech finish so spoken events precede the job's 'finished' event
+    for f in spoken:
+        f.result()
+    return {
+        "operation": "create_repo",
+        "ok": True,
+        "full_name": full_name,
+        "remote_url": url,
+        "push": results.get("push", {}).get("value"),
+        "steps": timings(results),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def handle_github_operation(args: dict) -> dict:
+    """Run a GitHub operation, speak the outcome, and return it as a result dict."""
     op = args.get("operation")
     try:
         if op == "create_repo":
@@ -255,34 +409,27 @@ def handle_github_operation(args: dict) -> None:
             # Default org from env
             org = args.get("org", GITHUB_DEFAULT_ORG)
             description = args.get("description")
-            result = create_repo(name=name, private=private, org=org, description=description)
-            owner = result.get("owner", {}).get("login")
-            full_name = result.get("full_name")
-            speak(f"Created repo {full_name}.")
             # Optionally link local repo (defaults to current directory) and push
-            repo_path = args.get("repo_path", os.getcwd())
-            protocol = args.get("protocol", GITHUB_DEFAULT_PROTOCOL)
-            push_local = bool(args.get("push_local", False))
-            commit_message = args.get("commit_message", "voice commit")
-            try:
-                url = link_remote(repo_path=repo_path, owner=owner, name=name, protocol=protocol)
-                speak("Linked origin to GitHub.")
-                if push_local:
-                    try:
-                        push_local_repo(repo_path=repo_path, commit_message=commit_message)
-                    except Exception:
-                        speak("Link done, but push failed.")
-            except Exception:
-                speak("Repo created; link skipped because no local git repo found here.")
+            return _create_and_push(
+                name=name,
+                private=private,
+                org=org,
+                description=description,
+                repo_path=args.get("repo_path", os.getcwd()),
+                protocol=args.get("protocol", GITHUB_DEFAULT_PROTOCOL),
+                push_local=bool(args.get("push_local", False)),
+                commit_message=args.get("commit_message", "voice commit"),
+            )
         elif op == "delete_repo":
             owner = args.get("owner")
             name = args.get("name")
             # Add explicit confirmation flag to reduce risk
             if not bool(args.get("confirm", False)):
                 speak("Deletion requires confirm=true.")
-                return
+                return {"operation": op, "ok": False, "error": "confirm required"}
             delete_repo(owner=owner, name=name)
             speak(f"Deleted {owner}/{name}.")
+            return {"operation": op, "ok": True, "full_name": f"{owner}/{name}"}
         elif op == "link_remote":
             repo_path = args.get("repo_path", os.getcwd())
             owner = args.get("owner")
@@ -291,15 +438,30 @@ def handle_github_operation(args: dict) -> None:
             try:
                 url = link_remote(repo_path=repo_path, owner=owner, name=name, protocol=protocol)
                 speak("Linked origin to GitHub.")
+                return {"operation": op, "ok": True, "remote_url": url}
             except Exception:
                 speak("Link skipped; no local git repo found here.")
+                return {"operation": op, "ok": False, "error": "no local git repo"}
         elif op == "list_repos":
             org = args.get("org")
             visibility = args.get("visibility")
-            repos = list_repos(org=org, visibility=visibility)
-            top = [r.get("full_name") or r.get("name") for r in repos[:5]]
-            summary = ", ".join(top) if top else "none"
-            speak(f"Found {len(repos)} repos: {summary}.")
+            # Speak the first names as soon as they arrive; later pages keep loading meanwhile
+            top = []
+            count = 0
+            spoke_early = False
+            for r in iter_repos(org=org, visibility=visibility):
+                count += 1
+                if len(top) < 5:
+                    top.append(r.get("full_name") or r.get("name"))
+                elif not spoke_early:
+                    speak(f"Top repos: {', '.join(top)}.")
+                    spoke_early = True
+            if spoke_early:
+                speak(f"Found {count} repos in total.")
+            else:
+                summary = ", ".join(top) if top else "none"
+                speak(f"Found {count} repos: {summary}.")
+            return {"operation": op, "ok": True, "count": count, "top": top}
         elif op == "list_prs":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -309,10 +471,11 @@ def handle_github_operation(args: dict) -> None:
                 repo = repo or r
             if not owner or not repo:
                 speak("Owner/repo not specified and no local git repo detected.")
-                return
-            prs = list_open_prs(owner, repo)
-            titles = [p.get("title") for p in prs[:5]]
+                return {"operation": op, "ok": False, "error": "owner/repo not resolved"}
+            # Only the first five are spoken, so fetch a single five-item page
+            titles = [p.get("title") for p in iter_open_prs(owner, repo, limit=5)]
             speak(f"Open PRs: {', '.join(titles) if titles else 'none'}.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "titles": titles}
         elif op == "create_pr":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -322,16 +485,17 @@ def handle_github_operation(args: dict) -> None:
                 repo = repo or r
             if not owner or not repo:
                 speak("Owner/repo not specified and no local git repo detected.")
-                return
+                return {"operation": op, "ok": False, "error": "owner/repo not resolved"}
             title = args.get("title") or "Voice PR"
             head = args.get("head")
             base = args.get("base")
             body = args.get("body")
             if not head or not base:
                 speak("PR needs head and base branches.")
-                return
+                return {"operation": op, "ok": False, "error": "head and base required"}
             pr = create_pull_request(owner, repo, title, head, base, body)
             speak(f"PR #{pr.get('number')} created.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "number": pr.get("number"), "url": pr.get("html_url")}
         elif op == "merge_pr":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -343,9 +507,10 @@ def handle_github_operation(args: dict) -> None:
             number = int(num_arg) if num_arg is not None else None
             if not owner or not repo or not number:
                 speak("Merge needs owner, repo, and PR number.")
-                return
+                return {"operation": op, "ok": False, "error": "owner, repo and number required"}
             result = merge_pull_request(owner, repo, number)
             speak(f"PR #{number} merged.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "number": number, "sha": result.get("sha")}
         elif op == "list_issues":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -355,11 +520,11 @@ def handle_github_operation(args: dict) -> None:
                 repo = repo or r
             if not owner or not repo:
                 speak("Owner/repo not specified and no local git repo detected.")
-                return
+                return {"operation": op, "ok": False, "error": "owner/repo not resolved"}
             state = args.get("state", "open")
-            issues = list_issues(owner, repo, state)
-            titles = [i.get("title") for i in issues[:5]]
+            titles = [i.get("title") for i in iter_issues(owner, repo, state, limit=5)]
             speak(f"{state.capitalize()} issues: {', '.join(titles) if titles else 'none'}.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "state": state, "titles": titles}
         elif op == "create_issue":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -369,12 +534,13 @@ def handle_github_operation(args: dict) -> None:
                 repo = repo or r
             if not owner or not repo:
                 speak("Owner/repo not specified and no local git repo detected.")
-                return
+                return {"operation": op, "ok": False, "error": "owner/repo not resolved"}
             title = args.get("title") or "Voice Issue"
             body = args.get("body")
             labels = args.get("labels")
             issue = create_issue(owner, repo, title, body, labels)
             speak(f"Issue #{issue.get('number')} created.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "number": issue.get("number"), "url": issue.get("html_url")}
         elif op == "close_issue":
             owner = args.get("owner")
             repo = args.get("repo")
@@ -386,17 +552,34 @@ def handle_github_operation(args: dict) -> None:
             number = int(num_arg) if num_arg is not None else None
             if not owner or not repo or not number:
                 speak("Close needs owner, repo, and issue number.")
-                return
+                return {"operation": op, "ok": False, "error": "owner, repo and number required"}
             close_issue(owner, repo, number)
             speak(f"Issue #{number} closed.")
+            return {"operation": op, "ok": True, "owner": owner, "repo": repo, "number": number}
+        elif op == "repo_snapshot":
+            owner = args.get("owner")
+            repo = args.get("repo")
+            if not owner or not repo:
+                o, r = _detect_owner_repo(args.get("repo_path", os.getcwd()))
+                owner = owner or o
+                repo = repo or r
+            if not owner or not repo:
+                speak("Owner/repo not specified and no local git repo detected.")
+                return {"operation": op, "ok": False, "error": "owner/repo not resolved"}
+            snap = repo_snapshot(owner, repo)
+            speak(_snapshot_summary(snap))
+            return {"operation": op, "ok": True, "snapshot": snap}
         else:
             speak(f"Unsupported GitHub op: {op}.")
+            return {"operation": op, "ok": False, "error": "unsupported operation"}
     except GitHubError as e:
         msg = str(e)
         if "Resource not accessible by personal access token" in msg:
             speak("GitHub token lacks repo create permission; use a classic PAT with repo/public_repo scope or adjust org settings.")
         else:
             speak(f"GitHub error: {msg}")
+        return {"operation": op, "ok": False, "error": msg}
     except Exception as e:
         speak("Unexpected GitHub error.")
-        print(f"Unexpected error: {e}")
\ No newline at end of file
+        print(f"Unexpected error: {e}")
+        return {"operation": op, "ok": False, "error": str(e)}
\ No newline at end of file
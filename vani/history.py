@@ -0,0 +1,98 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Optional
+
+from .config import HISTORY_FILE, HISTORY_MAX
+from .context import DEFAULT_SESSION
+from .intent import ParsedIntent
+
+# "repeat last", "do that again", "run the last command again", "again"
+_REPEAT = re.compile(
+    r"^(?:please\s+)?(?:repeat(?:\s+(?:the\s+)?(?:last|previous)(?:\s+command)?)?|(?:do|run)\s+(?:that|it|the\s+last\s+command)\s+again|again)(?:\s+please)?$"
+)
+
+
+class CommandHistory:
+    """Parsed intents of recent commands, appended to a JSONL file so replays survive restarts."""
+
+    def __init__(self, path: str = HISTORY_FILE, max_entries: int = HISTORY_MAX):
+        self.path = os.path.expanduser(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Optional[List[dict]] = None
+        self._appended = 0
+
+    def _load(self) -> List[dict]:
+        if self._entries is None:
+            entries = []
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue  # torn write from a crash
+            except FileNotFoundError:
+                pass
+            self._entries = entries[-self.max_entries:]
+        return self._entries
+
+    def add(self, text: str, intent: ParsedIntent, session_id: Optional[str] = None, source: str = "parse") -> None:
+        args = {k: v for k, v in (intent.args or {}).items() if k != "text"}
+        entry = {"ts": time.time(), "session": session_id, "text": text, "source": source, "intent": intent.intent, "args": args}
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            entries = self._load()
+            entries.append(json.loads(line))
+            del entries[:-self.max_entries]
+            self._appended += 1
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                # Rewrite the file once it holds twice the retained entries; append otherwise
+                if self._appended >= self.max_entries:
+                    tmp = self.path + ".tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.writelines(json.dumps(e, default=str) + "\n" for e in entries)
+                    os.replace(tmp, self.path)
+                    self._appended = 0
+                else:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+            except OSError as e:
+                print(f"Could not persist command history: {e}")
+
+    def last(self, session_id: Optional[str] = None) -> Optional[dict]:
+        """Most recent entry of this session (None and the default session are the local one);
+        None when it has no history of its own, so a client never replays another's command.
+        """
+        local = session_id in (None, DEFAULT_SESSION)
+        with self._lock:
+            for e in reversed(self._load()):
+                if e.get("session") == session_id or (local and e.get("session") in (None, DEFAULT_SESSION)):
+                    return e
+            return None
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        with self._lock:
+            return list(self._load()[-limit:])
+
+
+_HISTORY = CommandHistory()
+
+
+def get_history() -> CommandHistory:
+    return _HISTORY
+
+
+def is_repeat(text: str) -> bool:
+    return bool(_REPEAT.match(re.sub(r"[^\w\s]", "", (text or "").lower()).strip()))
+
+
+def replay_last(session_id: Optional[str] = None) -> Optional[ParsedIntent]:
+    entry = _HISTORY.last(session_id)
+    if entry is None:
+        return None
+    return ParsedIntent(intent=entry["intent"], args=json.loads(json.dumps(entry.get("args") or {})))
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
 import json
 import re
+import threading
+from typing import Optional, Tuple
 
 from .config import client, GPT_MODEL, sarvam_client, SARVAM_CHAT_MODEL
+from .llm_router import LLMRouter, RouteFallback
+from .prompts import PromptProfile, get_profile
 
 
 @dataclass
@@ -24,9 +28,67 @@ def _extract_json(content: str) -> str:
     return s
 
 
+def _intent_from_json(data: dict) -> ParsedIntent:
+    """A single {"intent", "args"} object, or {"plan": [...]} for several actions in one utterance."""
+    plan = data.get("plan")
+    if isinstance(plan, list):
+        steps = [{"intent": s.get("intent", "misc"), "args": s.get("args") or {}} for s in plan if isinstance(s, dict)]
+        if len(steps) == 1:
+            return ParsedIntent(intent=steps[0]["intent"], args=steps[0]["args"])
+        if steps:
+            return ParsedIntent(intent="plan", args={"steps": steps})
+    return ParsedIntent(intent=data.get("intent", "misc"), args=data.get("args", {}))
+
+
+# Where one utterance chains several commands: ", then", " and then", or " and <verb>"
+_PLAN_SPLIT = re.compile(
+    r"\s*,\s*(?:and\s+)?(?:then\s+)?|\s+(?:and\s+)?then\s+|"
+    r"\s+and\s+(?=(?:stage|add|commit|push|pull|fetch|checkout|switch|create|open|merge|close|list|delete|link)\b)",
+    re.IGNORECASE,
+)
+
+
+def _heuristic_plan(text: str) -> ParsedIntent:
+    """Split chained commands ("stage everything, commit with message fix login and push") into a plan."""
+    parts = [p for p in _PLAN_SPLIT.split(text or "") if p and p.strip()]
+    if len(parts) > 1:
+        steps = [_heuristic_intent(p.strip()) for p in parts]
+        if all(st.intent != "misc" for st in steps):
+            return ParsedIntent(intent="plan", args={"steps": [{"intent": st.intent, "args": st.args} for st in steps]})
+        # Parsing the whole text would keep only the last verb that matched ("open a pr and merge
+        # it" -> a bare merge_pr, filled from context with an unrelated PR); ask to rephrase instead
+        unclear = [p.strip() for p, st in zip(parts, steps) if st.intent == "misc"]
+        return ParsedIntent(intent="misc", args={"raw": text, "error": f"could not understand: {'; '.join(unclear)}"})
+    return _heuristic_intent(text)
+
+
 def _heuristic_intent(text: str) -> ParsedIntent:
     """Best-effort local parser when LLM is unavailable."""
     t = (text or "").lower()
+    # Repo overview ("what's going on in this repo") before the generic status match
+    if any(k in t for k in ["what's going on", "whats going on", "what is going on", "repo snapshot", "repo summary", "summarize the repo"]):
+        return ParsedIntent(intent="github_operation", args={"operation": "repo_snapshot"})
+    # Workspace-wide git ("status of all repos", "fetch every repo") before single-repo matches; needs
+    # a git verb or "workspace", so "list all my repos" still reaches list_repos below
+    git_verb = re.search(r"\b(pull|fetch|status)\b(?!\s+requests?)", t)
+    if ("workspace" in t or git_verb) and any(
+        k in t for k in ["all repos", "all my repos", "every repo", "all repositories", "workspace"]
+    ):
+        op = git_verb.group(1) if git_verb else "status"
+        return ParsedIntent(intent="git_operation", args={"operation": f"workspace_{op}"})
+    # PR merge / issue close, including follow-ups without a number ("merge it", "close that issue")
+    # whose number comes from the session context; before git ops, since "pull request" contains "pull"
+    # Bare "merge it/that/this" only when nothing follows ("merge this branch into main" is a git merge)
+    m = re.search(
+        r"\bmerge\s+(?:(?:it|that|this)(?:\s+(?:now|please))?\W*$|(?:the\s+|that\s+|this\s+)?(?:pr|pull\s+request)\b)(?:\s+(?:number\s+)?#?(\d+))?", t
+    )
+    if m:
+        num = int(m.group(1)) if m.group(1) else None
+        return ParsedIntent(intent="github_operation", args={"operation": "merge_pr", "number": num})
+    m = re.search(r"\bclose\s+(?:the\s+|that\s+|this\s+)?issue\b(?:\s+(?:number\s+)?#?(\d+))?", t)
+    if m:
+        num = int(m.group(1)) if m.group(1) else None
+        return ParsedIntent(intent="github_operation", args={"operation": "close_issue", "number": num})
     # Git operations
     if any(k in t for k in ["git status", "status"]):
         return ParsedIntent(intent="git_operation", args={"operation": "status"})
@@ -35,12 +97,16 @@ def _heuristic_intent(text: str) -> ParsedIntent:
     if "commit" in t:
         # Extract message in quotes
         m = re.search(r"commit( with)?( message)?\s+\"([^\"]+)\"", text, re.IGNORECASE)
-        msg = m.group(3) if m else "voice commit"
+        # Spoken messages rarely come with quotes: "commit with message fix login"
+        m2 = None if m else re.search(r"commit\s+(?:with\s+)?(?:the\s+)?message\s+(.+)", text, re.IGNORECASE)
+        msg = m.group(3) if m else (m2.group(1).strip().rstrip(".") if m2 else "voice commit")
         return ParsedIntent(intent="git_operation", args={"operation": "commit", "commit_message": msg})
     if "push" in t:
         return ParsedIntent(intent="git_operation", args={"operation": "push"})
     if "pull" in t:
         return ParsedIntent(intent="git_operation", args={"operation": "pull"})
+    if "fetch" in t:
+        return ParsedIntent(intent="git_operation", args={"operation": "fetch"})
     if "checkout" in t or "switch" in t:
         m = re.search(r"(checkout|switch)\s+(to\s+)?([\w\-/]+)", t)
         branch = m.group(3) if m else None
@@ -92,86 +158,107 @@ def _heuristic_intent(text: str) -> ParsedIntent:
         return ParsedIntent(intent="github_operation", args={"operation": "list_issues", "state": state})
     if ("create pr" in t) or ("open pr" in t):
         return ParsedIntent(intent="github_operation", args={"operation": "create_pr"})
-    if ("merge pr" in t):
-        m = re.search(r"merge\s+pr\s+(\d+)", t)
-        num = int(m.group(1)) if m else None
-        return ParsedIntent(intent="github_operation", args={"operation": "merge_pr", "number": num} )
     if ("create issue" in t):
         m = re.search(r"create\s+issue(?:\s+(?:called|titled))?\s+\"([^\"]+)\"", text, re.IGNORECASE)
         title = m.group(1) if m else "voice issue"
         return ParsedIntent(intent="github_operation", args={"operation": "create_issue", "title": title})
-    if ("close issue" in t):
-        m = re.search(r"close\s+issue\s+(\d+)", t)
-        num = int(m.group(1)) if m else None
-        return ParsedIntent(intent="github_operation", args={"operation": "close_issue", "number": num})
 
     return ParsedIntent(intent="misc", args={"raw": text})
 
 
-def parse_intent(text: str) -> ParsedIntent:
-    """Use LLM to parse text into an intent and args; fallback to heuristics when unavailable."""
-    SYSTEM_PROMPT = (
-        "You are a voice agent that turns user speech into structured intents. "
-        "Supported intents: 'git_operation', 'terminal_task', 'github_operation', 'misc'. "
-        "For git_operation, args may include: operation (status, add, commit, push, pull, checkout, branch, init), "
-        "branch_name, commit_message, files (list). For terminal_task, args may include: language, framework, command, project_name. "
-        "For github_operation, args may include: operation (create_repo, delete_repo, link_remote, list_repos, list_prs, create_pr, merge_pr, list_issues, create_issue, close_issue), "
-        "name, owner, private (bool), org (string), description, repo_path, protocol (ssh or https), confirm (bool), visibility (public/private/all), "
-        "repo (string), title (string), head (branch), base (branch), body (string), labels (list of strings), number (int), state (open/closed/all), "
-        "push_local (bool), commit_message (string). "
-        "If user asks to create code or project, set intent=terminal_task and provide suggested commands."
+def _sarvam_content(profile: PromptProfile, text: str) -> Tuple[Optional[str], dict]:
+    """Raw completion text and token usage from the Sarvam chat model."""
+    resp = sarvam_client.chat.completions(
+        messages=[{"role": "system", "content": profile.system}, {"role": "user", "content": profile.user(text)}],
+        temperature=profile.temperature,
+        top_p=1,
+        max_tokens=profile.max_tokens,
+        model=SARVAM_CHAT_MODEL,
+        reasoning_effort=profile.reasoning_effort,
     )
-    user_prompt = f"Command: {text}\nReturn JSON only."
-    if sarvam_client is not None:
-        try:
-            resp = sarvam_client.chat.completions(
-                messages=[{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
-                temperature=0.5,
-                top_p=1,
-                max_tokens=800,
-                model=SARVAM_CHAT_MODEL,
-                reasoning_effort="medium",
-            )
-            content = None
-            try:
-                content = resp.choices[0].message.content
-            except Exception:
-                try:
-                    if isinstance(resp, dict):
-                        choices = resp.get("choices") or []
-                        first = choices[0] if choices else {}
-                        msg = first.get("message") or {}
-                        content = msg.get("content") or first.get("content") or resp.get("output") or resp.get("text")
-                except Exception:
-                    content = None
-            if not content:
-                return _heuristic_intent(text)
-            try:
-                payload = _extract_json(content)
-                data = json.loads(payload)
-                intent = data.get("intent", "misc")
-                args = data.get("args", {})
-                return ParsedIntent(intent=intent, args=args)
-            except Exception:
-                return ParsedIntent(intent="misc", args={"raw": content})
-        except Exception:
-            return _heuristic_intent(text)
-    if client is None:
-        return _heuristic_intent(text)
+    content = None
     try:
-        resp = client.chat.completions.create(
-            model=GPT_MODEL,
-            messages=[{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
-            temperature=0
-        )
         content = resp.choices[0].message.content
+    except Exception:
         try:
-            payload = _extract_json(content)
-            data = json.loads(payload)
-            intent = data.get("intent", "misc")
-            args = data.get("args", {})
-            return ParsedIntent(intent=intent, args=args)
+            if isinstance(resp, dict):
+                choices = resp.get("choices") or []
+                first = choices[0] if choices else {}
+                msg = first.get("message") or {}
+                content = msg.get("content") or first.get("content") or resp.get("output") or resp.get("text")
         except Exception:
-            return ParsedIntent(intent="misc", args={"raw": content})
+            content = None
+    return content, _usage(resp)
+
+
+def _openai_content(profile: PromptProfile, text: str) -> Tuple[Optional[str], dict]:
+    """Raw completion text and token usage from the OpenAI chat model (JSON mode when the profile asks)."""
+    kwargs = {"temperature": profile.temperature, "max_tokens": profile.max_tokens}
+    kwargs.update(profile.openai_overrides or {})
+    if profile.json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    resp = client.chat.completions.create(
+        model=GPT_MODEL,
+        messages=[{"role": "system", "content": profile.system}, {"role": "user", "content": profile.user(text)}],
+        **{k: v for k, v in kwargs.items() if v is not None},
+    )
+    return resp.choices[0].message.content, _usage(resp)
+
+
+def _usage(resp) -> dict:
+    usage = getattr(resp, "usage", None)
+    if usage is None and isinstance(resp, dict):
+        usage = resp.get("usage")
+    if usage is None:
+        return {}
+    get = usage.get if isinstance(usage, dict) else lambda k: getattr(usage, k, None)
+    return {k: get(k) for k in ("prompt_tokens", "completion_tokens", "total_tokens") if get(k) is not None}
+
+
+def _intent_from_content(content: str) -> ParsedIntent:
+    try:
+        # JSON mode returns a bare object; otherwise strip fences and surrounding prose
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = json.loads(_extract_json(content))
+        return _intent_from_json(data)
     except Exception:
-        return _heuristic_intent(text)
\ No newline at end of file
+        return ParsedIntent(intent="misc", args={"raw": content})
+
+
+_ROUTER: Optional[LLMRouter] = None
+_ROUTER_LOCK = threading.Lock()
+
+
+def get_router() -> Optional[LLMRouter]:
+    """Router over the configured chat backends; None when neither Sarvam nor OpenAI is set up."""
+    global _ROUTER
+    with _ROUTER_LOCK:
+        if _ROUTER is None:
+            backends = {}
+            if sarvam_client is not None:
+                backends["sarvam"] = _sarvam_content
+            if client is not None:
+                backends["openai"] = _openai_content
+            if backends:
+                _ROUTER = LLMRouter(backends)
+        return _ROUTER
+
+
+def parse_intent(text: str, profile: Optional[PromptProfile] = None) -> ParsedIntent:
+    """Use LLM to parse text into an intent and args; fallback to heuristics when unavailable.
+    The backend is chosen per request by the router (fastest healthy within the latency SLO);
+    the prompt and decoding settings come from the configured prompt profile (see prompts.py).
+    """
+    profile = profile or get_profile()
+    router = get_router()
+    if router is None:
+        return _heuristic_plan(text)
+    try:
+        _, (content, _) = router.call(profile, text)
+    except RouteFallback:
+        return _heuristic_plan(text)
+    if not content:
+        return _heuristic_plan(text)
+    return _intent_from_content(content)
@@ -0,0 +1,224 @@
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RETAIN, JOB_SPEAK
+from .events import bind_sink
+
+_FINISHED = {"succeeded", "failed", "cancelled"}
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    """A queued unit of work plus the event log its progress is reported to."""
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    events: List[dict] = field(default_factory=list)
+    mute_speech: bool = not JOB_SPEAK
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    # Event sink protocol (see vani.events)
+    def emit(self, kind: str, data: dict) -> None:
+        with self._cond:
+            self.events.append({"seq": len(self.events), "ts": time.time(), "type": kind, **data})
+            self._cond.notify_all()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self.emit("cancel_requested", {})
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINISHED
+
+    def events_since(self, seq: int, timeout: float = 0.0) -> List[dict]:
+        """Events with seq >= seq, waiting up to timeout for new ones when none are pending."""
+        with self._cond:
+            if len(self.events) <= seq and not self.done and timeout > 0:
+                self._cond.wait(timeout)
+            return list(self.events[seq:])
+
+    def spoken(self) -> List[str]:
+        with self._cond:
+            return [e.get("text") for e in self.events if e["type"] == "spoken"]
+
+    def to_dict(self, include_events: bool = False) -> dict:
+        wait = (self.started_at or time.time()) - self.created_at
+        run = ((self.finished_at or time.time()) - self.started_at) if self.started_at else None
+        d = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_ms": round(wait * 1000, 1),
+            "run_ms": round(run * 1000, 1) if run is not None else None,
+            "spoken": self.spoken(),
+            "result": self.result,
+            "error": self.error,
+        }
+        if include_events:
+            with self._cond:
+                d["events"] = list(self.events)
+        return d
+
+
+class JobManager:
+    """Bounded FIFO of jobs served by a fixed pool of worker threads."""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queue: int = JOB_QUEUE_SIZE, retain: int = JOB_RETAIN):
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, max_queue))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.retain = retain
+        self._running = 0
+        self._counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "cancelled": 0}
+        self._waits = deque(maxlen=500)
+        self._runs = deque(maxlen=500)
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"vani-job-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(
+        self, kind: str, fn: Callable[..., Any], *args, params: Optional[dict] = None, mute_speech: Optional[bool] = None, **kwargs
+    ) -> Job:
+        """Queue fn(*args, **kwargs) and return its Job immediately. Raises QueueFull when saturated.
+        mute_speech overrides JOB_SPEAK for this job (e.g. remote voice clients hear replies themselves).
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params or {})
+        if mute_speech is not None:
+            job.mute_speech = mute_speech
+        # Register before enqueueing so a fast worker never runs an unknown job
+        with self._lock:
+            self._jobs[job.id] = job
+        job.emit("queued", {"queue_depth": self._queue.qsize() + 1})
+        try:
+            self._queue.put_nowait((job, fn, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+                self._counters["rejected"] += 1
+            raise QueueFull(f"job queue is full ({self._queue.maxsize} pending)")
+        with self._lock:
+            self._counters["submitted"] += 1
+            self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.cancel()
+        return job
+
+    def _evict(self) -> None:
+        # Drop the oldest finished jobs beyond the retention bound; never drop live ones
+        excess = len(self._jobs) - self.retain
+        if excess <= 0:
+            return
+        for jid in [j.id for j in self._jobs.values() if j.done][:excess]:
+            del self._jobs[jid]
+
+    def _worker(self) -> None:
+        while True:
+            job, fn, args, kwargs = self._queue.get()
+            try:
+                self._run(job, fn, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        if job.cancelled():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            job.emit("finished", {"status": job.status})
+            with self._lock:
+                self._counters["cancelled"] += 1
+            return
+        job.started_at = time.time()
+        job.status = "running"
+        with self._lock:
+            self._running += 1
+            self._waits.append(job.started_at - job.created_at)
+        job.emit("started", {"wait_ms": round((job.started_at - job.created_at) * 1000, 1)})
+        try:
+            with bind_sink(job):
+                job.result = fn(*args, **kwargs)
+            job.status = "cancelled" if job.cancelled() else "succeeded"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e) or e.__class__.__name__
+            print(f"Job {job.id} failed: {e}")
+            traceback.print_exc()
+        job.finished_at = time.time()
+        with self._lock:
+            self._running -= 1
+            self._runs.append(job.finished_at - job.started_at)
+            self._counters[job.status] += 1
+        job.emit("finished", {"status": job.status, "result": job.result, "error": job.error})
+
+    @staticmethod
+    def _summary(samples) -> dict:
+        if not samples:
+            return {"avg_ms": None, "p95_ms": None, "max_ms": None}
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p95_ms": round(p95 * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": len(self._threads),
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "running": self._running,
+                "retained": len(self._jobs),
+                "wait": self._summary(self._waits),
+                "run": self._summary(self._runs),
+                **self._counters,
+            }
+
+
+_MANAGER: Optional[JobManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_manager() -> JobManager:
+    global _MANAGER
+    if _MANAGER is None:
+        with _MANAGER_LOCK:
+            if _MANAGER is None:
+                _MANAGER = JobManager()
+    return _MANAGER
@@ -0,0 +1,202 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import (
+    LLM_LATENCY_SLO_MS,
+    LLM_EWMA_ALPHA,
+    LLM_EXPLORE_RATE,
+    LLM_ERROR_THRESHOLD,
+    LLM_COOLDOWN_SECONDS,
+    LLM_PROBE_INTERVAL,
+)
+from .events import emit
+from .pools import LLM_EXECUTOR
+
+
+class RouteFallback(Exception):
+    """No backend answered within the latency budget; the caller should use its local fallback."""
+
+
+@dataclass
+class BackendStats:
+    name: str
+    latency_ms: Optional[float] = None  # EWMA of successful call latency
+    error_rate: float = 0.0  # EWMA of failures (1) vs successes (0)
+    calls: int = 0
+    errors: int = 0
+    unused: int = 0  # answers nobody waited for (timed-out requests and background probes)
+    last_error: Optional[str] = None
+    last_error_at: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {k: (round(v, 3) if isinstance(v, float) else v) for k, v in self.__dict__.items()}
+
+
+@dataclass
+class _Decision:
+    ts: float
+    backend: Optional[str]
+    reason: str
+    outcome: str = "pending"
+    ms: Optional[float] = None
+    candidates: List[str] = field(default_factory=list)
+
+
+class LLMRouter:
+    """Picks the chat backend for each request: the healthy one with the lowest EWMA latency.
+    Occasional exploration re-measures another backend with a background probe, so its numbers
+    stay current without a user request waiting on it. Requests that cannot be answered within
+    slo_ms raise RouteFallback instead of waiting.
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, Callable[..., Any]],
+        slo_ms: float = LLM_LATENCY_SLO_MS,
+        alpha: float = LLM_EWMA_ALPHA,
+        explore_rate: float = LLM_EXPLORE_RATE,
+        error_threshold: float = LLM_ERROR_THRESHOLD,
+        cooldown: float = LLM_COOLDOWN_SECONDS,
+        probe_interval: float = LLM_PROBE_INTERVAL,
+    ):
+        self.backends = backends
+        self.slo_ms = slo_ms
+        self.alpha = alpha
+        self.explore_rate = explore_rate
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._stats = {name: BackendStats(name) for name in backends}
+        self._decisions: deque = deque(maxlen=100)
+        self._probing: set = set()
+        self._last_probe: Dict[str, float] = {}
+
+    def _healthy(self, s: BackendStats, now: float) -> bool:
+        # An unhealthy backend gets one trial request again once its cooldown has passed
+        return s.error_rate < self.error_threshold or now - s.last_error_at > self.cooldown
+
+    def _ranked(self) -> List[str]:
+        """Healthy backends, best first."""
+        now = time.time()
+        with self._lock:
+            healthy = [s for s in self._stats.values() if self._healthy(s, now)]
+            # Unmeasured backends sort first so each gets measured once
+            healthy.sort(key=lambda s: (s.latency_ms is not None, s.latency_ms or 0.0))
+            return [s.name for s in healthy]
+
+    def _record(self, name: str, ms: Optional[float], error: Optional[str], unused: bool = False) -> None:
+        with self._lock:
+            s = self._stats[name]
+            s.calls += 1
+            s.error_rate = (1 - self.alpha) * s.error_rate + self.alpha * (1.0 if error else 0.0)
+            if error:
+                s.errors += 1
+                s.last_error = error
+                s.last_error_at = time.time()
+            elif ms is not None:
+                s.latency_ms = ms if s.latency_ms is None else (1 - self.alpha) * s.latency_ms + self.alpha * ms
+            if unused:
+                s.unused += 1
+
+    def _submit(self, name: str, args: tuple) -> Future:
+        started = time.perf_counter()
+        fut = LLM_EXECUTOR.submit(self.backends[name], *args)
+
+        def done(f: Future) -> None:
+            ms = (time.perf_counter() - started) * 1000
+            err = f.exception()
+            # Every completed call feeds the stats, including ones the caller stopped waiting for
+            self._record(name, ms, f"{err.__class__.__name__}: {err}" if err else None, unused=getattr(f, "abandoned", False))
+
+        fut.add_done_callback(done)
+        return fut
+
+    def _probe(self, name: str, args: tuple) -> None:
+        # Background refresh for a backend we are avoiding (too slow, or picked for exploration):
+        # at most one in flight and one per probe_interval per backend, whatever the request rate
+        now = time.monotonic()
+        with self._lock:
+            if name in self._probing or now - self._last_probe.get(name, float("-inf")) < self.probe_interval:
+                return
+            self._probing.add(name)
+            self._last_probe[name] = now
+        fut = self._submit(name, args)
+        fut.abandoned = True
+
+        def done(_f: Future) -> None:
+            with self._lock:
+                self._probing.discard(name)
+
+        fut.add_done_callback(done)
+
+    def _log(self, d: _Decision) -> None:
+        self._decisions.append(d)
+        ms = f" in {d.ms} ms" if d.ms is not None else ""
+        print(f"LLM route: {d.backend or 'local'} ({d.reason}) -> {d.outcome}{ms}")
+        emit("route", backend=d.backend, reason=d.reason, outcome=d.outcome, ms=d.ms)
+
+    def call(self, *args) -> Tuple[str, Any]:
+        """Call the chosen backend with args; returns (backend name, result) or raises RouteFallback."""
+        started = time.perf_counter()
+        names = self._ranked()
+        if len(names) > 1 and random.random() < self.explore_rate:
+            # Re-measure a non-preferred backend with the same request, off the caller's path
+            self._probe(random.choice(names[1:]), args)
+        decision = _Decision(time.time(), None, "no healthy backend", candidates=list(names))
+        for i, name in enumerate(names):
+            remaining = self.slo_ms - (time.perf_counter() - started) * 1000
+            if remaining <= 0:
+                decision.reason = "latency budget spent"
+                break
+            with self._lock:
+                predicted = self._stats[name].latency_ms
+            if predicted is not None and predicted > remaining:
+                # Expected to miss the SLO: skip it now, but keep its numbers fresh in the background
+                self._probe(name, args)
+                decision.reason = f"{name} predicted {round(predicted)} ms over budget"
+                continue
+            decision.backend = name
+            decision.reason = "fastest healthy" if i == 0 else "fallback backend"
+            fut = self._submit(name, args)
+            try:
+                result = fut.result(timeout=remaining / 1000)
+            except FutureTimeout:
+                fut.abandoned = True
+                decision.outcome = "timeout"
+                decision.ms = round((time.perf_counter() - started) * 1000, 1)
+                with self._lock:
+                    # Don't wait for the late answer to learn that this backend is slow right now
+                    s = self._stats[name]
+                    s.latency_ms = max(s.latency_ms or 0.0, decision.ms)
+                self._log(decision)
+                raise RouteFallback(f"{name} exceeded the {self.slo_ms} ms budget")
+            except Exception as e:
+                decision.outcome = f"error: {e.__class__.__name__}"
+                decision.ms = round((time.perf_counter() - started) * 1000, 1)
+                self._log(decision)
+                decision = _Decision(time.time(), None, "after error", candidates=list(names))
+                continue
+            decision.outcome = "ok"
+            decision.ms = round((time.perf_counter() - started) * 1000, 1)
+            self._log(decision)
+            return name, result
+        decision.outcome = "fallback"
+        decision.ms = round((time.perf_counter() - started) * 1000, 1)
+        self._log(decision)
+        raise RouteFallback(decision.reason)
+
+    def stats(self) -> dict:
+        with self._lock:
+            backends = [s.to_dict() for s in self._stats.values()]
+        return {
+            "slo_ms": self.slo_ms,
+            "explore_rate": self.explore_rate,
+            "backends": backends,
+            "recent": [d.__dict__ for d in list(self._decisions)[-20:]],
+        }
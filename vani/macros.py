@@ -0,0 +1,171 @@
+import difflib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .config import MACROS_FILE, MACRO_FUZZY_THRESHOLD, WAKE_WORD
+from .intent import ParsedIntent
+from .repo_pool import repo_info
+
+try:
+    import yaml
+except ImportError:  # YAML macro files are optional; JSON always works
+    yaml = None
+
+# Used when no macros file exists. Args may use {branch} and {default_branch} of the current repo.
+# Both change the repo, so they only run on an exact trigger ("skip it" must never ship).
+DEFAULT_MACROS = [
+    {
+        "name": "sync",
+        "exact": True,
+        "triggers": ["sync", "sync up", "sync repo", "sync the repo"],
+        "steps": [
+            {"intent": "git_operation", "args": {"operation": "pull"}},
+            {"intent": "git_operation", "args": {"operation": "status"}},
+        ],
+    },
+    {
+        "name": "ship",
+        "exact": True,
+        "triggers": ["ship", "ship it"],
+        "steps": [
+            {"intent": "git_operation", "args": {"operation": "add"}},
+            {"intent": "git_operation", "args": {"operation": "commit", "commit_message": "voice commit"}},
+            {"intent": "git_operation", "args": {"operation": "push"}},
+            {"intent": "github_operation", "args": {"operation": "create_pr", "title": "{branch}", "head": "{branch}", "base": "{default_branch}"}},
+        ],
+    },
+]
+
+# Politeness and lead-ins that should not stop a trigger from matching exactly
+_FILLER = re.compile(r"^(?:(?:ok(?:ay)?|hey|please|now|run|do|start|the|a)\s+)+|(?:\s+(?:please|now|macro))+$")
+
+
+def normalize(text: str) -> str:
+    t = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    t = " ".join(t.split())
+    if WAKE_WORD and t.startswith(WAKE_WORD):
+        t = t[len(WAKE_WORD):].strip()
+    return _FILLER.sub("", t).strip()
+
+
+@dataclass
+class Macro:
+    name: str
+    triggers: List[str]
+    steps: List[dict] = field(default_factory=list)
+    description: Optional[str] = None
+    # Only run on an exact (normalized) trigger, never on a fuzzy match
+    exact: bool = False
+
+    def to_intent(self) -> ParsedIntent:
+        steps = [_expand(s) for s in self.steps]
+        if len(steps) == 1:
+            return ParsedIntent(intent=steps[0]["intent"], args=steps[0]["args"])
+        return ParsedIntent(intent="plan", args={"steps": steps, "macro": self.name})
+
+
+def _expand(step: dict) -> dict:
+    args = dict(step.get("args") or {})
+    if any(isinstance(v, str) and "{" in v for v in args.values()):
+        try:
+            info = repo_info(args.get("repo_path") or os.getcwd())
+            values = {"branch": info.active_branch or "", "default_branch": info.default_branch or "main"}
+        except Exception:
+            values = {"branch": "", "default_branch": "main"}
+        for k, v in args.items():
+            if isinstance(v, str):
+                for name, value in values.items():
+                    v = v.replace("{" + name + "}", value)
+                args[k] = v
+    return {"intent": step.get("intent", "misc"), "args": args}
+
+
+class MacroRegistry:
+    """Trigger phrase -> stored intent plan, loaded from a JSON or YAML file and reloaded when it
+    changes. Utterances match a trigger exactly (after normalization) or by close string similarity.
+    """
+
+    def __init__(self, path: str = MACROS_FILE, threshold: float = MACRO_FUZZY_THRESHOLD):
+        self.path = os.path.expanduser(path)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = -1
+        self._macros: Dict[str, Macro] = {}
+        self._index: Dict[str, str] = {}
+
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        raw = DEFAULT_MACROS
+        if mtime is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    if self.path.endswith((".yaml", ".yml")):
+                        if yaml is None:
+                            raise ValueError("PyYAML is not installed")
+                        data = yaml.safe_load(f)
+                    else:
+                        data = json.load(f)
+                raw = data.get("macros", []) if isinstance(data, dict) else data
+            except (OSError, ValueError) as e:
+                print(f"Could not load macros from {self.path}, using defaults: {e}")
+        macros: Dict[str, Macro] = {}
+        index: Dict[str, str] = {}
+        for m in raw or []:
+            if not isinstance(m, dict) or not m.get("name") or not m.get("steps"):
+                continue
+            macro = Macro(
+                m["name"], list(m.get("triggers") or [m["name"]]), list(m["steps"]), m.get("description"), bool(m.get("exact"))
+            )
+            macros[macro.name] = macro
+            for trigger in macro.triggers:
+                index[normalize(trigger)] = macro.name
+        self._macros, self._index = macros, index
+
+    def match(self, text: str) -> Optional[Tuple[Macro, float]]:
+        """(macro, score) for the best trigger; score 1.0 is an exact match."""
+        t = normalize(text)
+        if not t:
+            return None
+        with self._lock:
+            self._load()
+            name = self._index.get(t)
+            if name:
+                return self._macros[name], 1.0
+            best: Optional[Tuple[str, float]] = None
+            words = t.split()
+            for trigger, name in self._index.items():
+                if self._macros[name].exact:
+                    continue
+                # Only near-verbatim utterances with the same first word ("skip it" is not "ship it");
+                # longer sentences go to the intent parser
+                if abs(len(trigger.split()) - len(words)) > 1 or trigger.split()[0] != words[0]:
+                    continue
+                score = difflib.SequenceMatcher(None, t, trigger).ratio()
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (name, score)
+            return (self._macros[best[0]], round(best[1], 3)) if best else None
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            self._load()
+            return [
+                {"name": m.name, "triggers": m.triggers, "steps": m.steps, "description": m.description, "exact": m.exact}
+                for m in self._macros.values()
+            ]
+
+
+_REGISTRY = MacroRegistry()
+
+
+def get_registry() -> MacroRegistry:
+    return _REGISTRY
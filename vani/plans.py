@@ -0,0 +1,186 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .audio import speak
+from .config import PLAN_MAX_STEPS, PLAN_WORKERS
+from .context import _REPO_OPS, SessionContext
+from .events import bind_sink, current_sink, emit
+from .intent import ParsedIntent
+from .repo_pool import repo_info
+from .taskgraph import Step, run_graph
+
+
+def _path_key(path: str) -> str:
+    """A checkout's GitHub owner/repo when origin is on GitHub, so local git ops and GitHub ops
+    naming that repo share one key; otherwise its real path.
+    """
+    real = os.path.realpath(os.path.expanduser(path))
+    try:
+        info = repo_info(real)
+    except Exception:
+        return real
+    if info.owner and info.name:
+        return f"github:{info.owner}/{info.name}".lower()
+    return real
+
+
+def ordering_key(intent: ParsedIntent) -> Optional[str]:
+    """Intents with the same key must run in order; None means independent.
+    Local git work (and GitHub ops that fall back to the current checkout) key on the checkout's
+    GitHub repo (or path), GitHub ops naming a repo on owner/repo (except create_repo/link_remote,
+    which change the checkout), terminal scaffolds on the project name.
+    """
+    args = intent.args or {}
+    if args.get("repo_path"):
+        return _path_key(args["repo_path"])
+    if intent.intent == "git_operation":
+        return _path_key(os.getcwd())
+    if intent.intent == "github_operation":
+        if args.get("operation") in {"create_repo", "link_remote"}:
+            # These set origin on the local checkout, so they order with that checkout's git ops
+            return _path_key(os.getcwd())
+        if args.get("owner") and (args.get("repo") or args.get("name")):
+            return f"github:{args['owner']}/{args.get('repo') or args.get('name')}".lower()
+        if args.get("operation") == "list_repos":
+            return None
+        return _path_key(os.getcwd())
+    if intent.intent == "terminal_task" and args.get("project_name"):
+        return f"terminal:{args['project_name']}"
+    return None
+
+
+def plan_steps(intent: ParsedIntent) -> List[ParsedIntent]:
+    """The steps of a 'plan' intent ({"steps": [{"intent", "args"}, ...]}), capped at PLAN_MAX_STEPS."""
+    steps = []
+    for s in (intent.args.get("steps") or [])[:PLAN_MAX_STEPS]:
+        if isinstance(s, dict) and s.get("intent"):
+            steps.append(ParsedIntent(intent=s["intent"], args=dict(s.get("args") or {})))
+    return steps
+
+
+class _StepFailed(Exception):
+    def __init__(self, result: Any):
+        super().__init__((result or {}).get("error") or "step failed")
+        self.result = result
+
+
+class _StepSink:
+    """Forwards a step's events to the job while holding back its spoken replies for the summary."""
+
+    mute_speech = True
+
+    def __init__(self, parent: Any, index: int):
+        self.parent = parent
+        self.index = index
+        self.spoken: List[str] = []
+
+    def emit(self, kind: str, data: dict) -> None:
+        if kind == "spoken":
+            self.spoken.append(data.get("text"))
+            kind = "step_spoken"
+        if self.parent is not None:
+            self.parent.emit(kind, {**data, "plan_step": self.index})
+
+    def cancelled(self) -> bool:
+        cancelled = getattr(self.parent, "cancelled", None)
+        return bool(cancelled()) if callable(cancelled) else False
+
+
+def _label(intent: ParsedIntent) -> str:
+    return str(intent.args.get("operation") or intent.intent).replace("_", " ")
+
+
+def summarize(steps: List[ParsedIntent], outcomes: List[dict]) -> str:
+    """One spoken summary: each step's own replies in plan order, noting failures and skips."""
+    done = sum(1 for o in outcomes if o["ok"])
+    parts = []
+    for step, o in zip(steps, outcomes):
+        if o.get("skipped"):
+            parts.append(f"Skipped {_label(step)}.")
+        elif o["spoken"]:
+            parts.extend(t.rstrip(".") + "." for t in o["spoken"] if t)
+        elif not o["ok"]:
+            parts.append(f"{_label(step).capitalize()} failed.")
+    head = "All steps done." if done == len(steps) else f"{done} of {len(steps)} steps done."
+    return " ".join([head, *parts])
+
+
+def _step_keys(steps: List[ParsedIntent], ctx: Optional[SessionContext] = None) -> List[Optional[str]]:
+    """ordering_key per step, keyed the way args will be filled when the step runs: a GitHub step
+    that names no repo ("merge it") works on the repo an earlier step named, or the remembered one.
+    """
+    lane: Optional[str] = None
+    if ctx is not None and ctx.get("owner") and ctx.get("repo"):
+        lane = f"github:{ctx.get('owner')}/{ctx.get('repo')}".lower()
+    keys = []
+    for intent in steps:
+        key = ordering_key(intent)
+        args = intent.args or {}
+        if intent.intent == "github_operation" and args.get("operation") in _REPO_OPS:
+            if args.get("owner") and args.get("repo"):
+                lane = key
+            elif not args.get("owner") and not args.get("repo") and not args.get("repo_path") and lane:
+                key = lane
+        keys.append(key)
+    return keys
+
+
+def run_plan(
+    steps: List[ParsedIntent],
+    dispatch: Callable[[ParsedIntent], Any],
+    workers: int = PLAN_WORKERS,
+    ctx: Optional[SessionContext] = None,
+) -> dict:
+    """Run an ordered plan: steps sharing an ordering_key run in plan order, others concurrently.
+    A failed step skips the later steps that depend on it. Speaks one combined summary.
+    ctx is the session context the dispatch fills args from, so steps are keyed accordingly.
+    """
+    started = time.perf_counter()
+    parent = current_sink()
+    sinks = [_StepSink(parent, i) for i in range(len(steps))]
+    last_for_key: Dict[str, str] = {}
+    graph = []
+    for i, (intent, key) in enumerate(zip(steps, _step_keys(steps, ctx))):
+        name = f"{i}:{_label(intent)}"
+        after = (last_for_key[key],) if key is not None and key in last_for_key else ()
+        if key is not None:
+            last_for_key[key] = name
+
+        def fn(_inputs, intent=intent, sink=sinks[i]):
+            with bind_sink(sink):
+                result = dispatch(intent)
+            if isinstance(result, dict) and result.get("ok") is False:
+                raise _StepFailed(result)
+            return result
+
+        graph.append(Step(name, fn, after))
+    results = run_graph(graph, max_workers=workers)
+    outcomes = []
+    for i, (step, intent) in enumerate(zip(graph, steps)):
+        r = results[step.name]
+        exc = r.get("exception")
+        result = exc.result if isinstance(exc, _StepFailed) else r.get("value")
+        outcomes.append({
+            "index": i,
+            "intent": intent.intent,
+            "args": intent.args,
+            "after": [int(a.split(":", 1)[0]) for a in step.after],
+            "ok": r["ok"],
+            "skipped": bool(r.get("skipped")),
+            "result": result,
+            "error": None if r["ok"] else r.get("error"),
+            "spoken": sinks[i].spoken,
+            "start_ms": r.get("start_ms"),
+            "ms": r.get("ms"),
+        })
+    summary = summarize(steps, outcomes)
+    speak(summary)
+    emit("plan", steps=len(steps), ok=sum(1 for o in outcomes if o["ok"]))
+    return {
+        "operation": "plan",
+        "ok": all(o["ok"] for o in outcomes),
+        "summary": summary,
+        "steps": outcomes,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,29 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from .config import GIT_WORKERS, AUDIO_WORKERS, BATCH_CONCURRENCY, LLM_WORKERS
+
+# Blocking work is kept off the event loop and off Starlette's shared threadpool:
+# git subprocesses get their own pool, and anything that may record or speak
+# (TTS, STT, full voice commands) gets a small one so audio devices are not oversubscribed.
+GIT_EXECUTOR = ThreadPoolExecutor(max_workers=GIT_WORKERS, thread_name_prefix="vani-git")
+AUDIO_EXECUTOR = ThreadPoolExecutor(max_workers=AUDIO_WORKERS, thread_name_prefix="vani-audio")
+# Items of POST /commands/batch (parse + dispatch); per-request limits are enforced on top
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, BATCH_CONCURRENCY), thread_name_prefix="vani-batch")
+# Intent-parsing LLM calls, so a caller can stop waiting at the latency SLO while the call finishes
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, LLM_WORKERS), thread_name_prefix="vani-llm")
+
+
+async def run_in(executor: ThreadPoolExecutor, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the given executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown() -> None:
+    GIT_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    AUDIO_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    BATCH_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    LLM_EXECUTOR.shutdown(wait=False, cancel_futures=True)
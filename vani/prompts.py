@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .config import INTENT_PROMPT_PROFILE
+
+# Single source for the intent schema; the compact prompts are rendered from it once at import
+SCHEMA = {
+    "git_operation": {
+        "operation": [
+            "status", "add", "commit", "push", "pull", "fetch", "checkout", "branch", "init",
+            "workspace_status", "workspace_fetch", "workspace_pull",
+        ],
+        "args": ["branch_name", "commit_message", "files:list", "root"],
+    },
+    "github_operation": {
+        "operation": [
+            "create_repo", "delete_repo", "link_remote", "list_repos", "list_prs", "create_pr", "merge_pr",
+            "list_issues", "create_issue", "close_issue", "repo_snapshot",
+        ],
+        "args": [
+            "name", "owner", "repo", "private:bool", "org", "description", "repo_path", "protocol:ssh|https",
+            "confirm:bool", "visibility:public|private|all", "title", "head", "base", "body", "labels:list",
+            "number:int", "state:open|closed|all", "push_local:bool", "commit_message",
+        ],
+    },
+    "terminal_task": {
+        "operation": [],
+        "args": ["language", "framework", "command", "project_name", "description"],
+    },
+}
+
+_LEGACY_PROMPT = (
+    "You are a voice agent that turns user speech into structured intents. "
+    "Supported intents: 'git_operation', 'terminal_task', 'github_operation', 'misc'. "
+    "For git_operation, args may include: operation (status, add, commit, push, pull, fetch, checkout, branch, init, "
+    "workspace_status, workspace_fetch, workspace_pull for all repos under a folder), "
+    "branch_name, commit_message, files (list), root (workspace folder). For terminal_task, args may include: language, framework, command, project_name. "
+    "For github_operation, args may include: operation (create_repo, delete_repo, link_remote, list_repos, list_prs, create_pr, merge_pr, list_issues, create_issue, close_issue, repo_snapshot), "
+    "name, owner, private (bool), org (string), description, repo_path, protocol (ssh or https), confirm (bool), visibility (public/private/all), "
+    "repo (string), title (string), head (branch), base (branch), body (string), labels (list of strings), number (int), state (open/closed/all), "
+    "push_local (bool), commit_message (string). "
+    "Omit args the user did not state (follow-ups like 'merge it' are completed from conversation context). "
+    "If user asks to create code or project, set intent=terminal_task and provide suggested commands. "
+    "Return {\"intent\": ..., \"args\": {...}}; if the user asks for several actions in one command, return "
+    "{\"plan\": [{\"intent\": ..., \"args\": {...}}, ...]} with one entry per action in the order spoken."
+)
+
+
+def render_schema(with_args: bool = True) -> str:
+    lines = []
+    for intent, spec in SCHEMA.items():
+        parts = []
+        if spec["operation"]:
+            parts.append("operation=" + "|".join(spec["operation"]))
+        if with_args:
+            parts.append(",".join(spec["args"]))
+        lines.append(f"{intent}: {'; '.join(parts)}")
+    return "\n".join(lines)
+
+
+def _compact_prompt(with_args: bool) -> str:
+    return (
+        "Map a voice command to JSON. Intents and args (omit args not stated):\n"
+        + render_schema(with_args)
+        + "\nmisc: anything else\n"
+        'Output {"intent":..,"args":{..}}; several actions in order: {"plan":[{"intent":..,"args":{..}},..]}. JSON only.'
+    )
+
+
+@dataclass(frozen=True)
+class PromptProfile:
+    """System prompt plus decoding settings for one intent-parsing style."""
+    name: str
+    system: str
+    temperature: float
+    max_tokens: int
+    # Sarvam chat reasoning effort (low/medium/high)
+    reasoning_effort: Optional[str]
+    # Ask the backend for a JSON object (OpenAI response_format) instead of relying on the prompt alone
+    json_mode: bool
+    user_template: str = "Command: {text}\nReturn JSON only."
+    # OpenAI create() kwargs that differ from the settings above; a None value omits the kwarg
+    openai_overrides: Optional[Dict[str, Any]] = None
+
+    def user(self, text: str) -> str:
+        return self.user_template.format(text=text)
+
+
+PROFILES: Dict[str, PromptProfile] = {
+    # The original prompt and settings, kept for comparison in the benchmark; the original OpenAI
+    # call differed from the Sarvam one (temperature 0, no max_tokens cap)
+    "legacy": PromptProfile(
+        "legacy", _LEGACY_PROMPT, 0.5, 800, "medium", False,
+        openai_overrides={"temperature": 0.0, "max_tokens": None},
+    ),
+    "compact": PromptProfile("compact", _compact_prompt(True), 0.0, 256, "low", True, "{text}"),
+    # Operations only: smallest prompt, for models that infer arg names well
+    "minimal": PromptProfile("minimal", _compact_prompt(False), 0.0, 160, "low", True, "{text}"),
+}
+
+
+def get_profile(name: Optional[str] = None) -> PromptProfile:
+    key = (name or INTENT_PROMPT_PROFILE or "compact").lower()
+    if key not in PROFILES:
+        print(f"Unknown prompt profile '{key}', using compact.")
+        key = "compact"
+    return PROFILES[key]
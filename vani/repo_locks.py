@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .config import REPO_LOCK_TIMEOUT
+
+
+class RepoLockTimeout(Exception):
+    pass
+
+
+class _RWLock:
+    """Reader/writer lock with writer preference. Re-entrant per thread: a thread holding the
+    write lock may take read or write again, and a reader may nest reads (but not upgrade).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    def acquire_read(self, timeout: Optional[float]) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return True
+            # Queue behind waiting writers so a stream of status calls cannot starve a push
+            ok = self._cond.wait_for(lambda: self._writer is None and not self._writers_waiting, timeout)
+            if ok:
+                self._readers[me] = 1
+            return ok
+
+    def release_read(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            self._readers[me] -= 1
+            if not self._readers[me]:
+                del self._readers[me]
+                self._cond.notify_all()
+
+    def acquire_write(self, timeout: Optional[float]) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("cannot upgrade a repo read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                ok = self._cond.wait_for(lambda: self._writer is None and not self._readers, timeout)
+            finally:
+                self._writers_waiting -= 1
+            if ok:
+                self._writer = me
+                self._writer_depth = 1
+            else:
+                self._cond.notify_all()
+            return ok
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    def state(self) -> dict:
+        with self._cond:
+            return {
+                "readers": sum(self._readers.values()),
+                "writer": self._writer is not None,
+                "writers_waiting": self._writers_waiting,
+            }
+
+
+class _RepoStats:
+    def __init__(self):
+        self.acquired = {"read": 0, "write": 0}
+        self.contended = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, mode: str, waited: float, ok: bool) -> None:
+        # Anything that had to block for more than a millisecond counts as contention
+        if waited > 0.001:
+            self.contended += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        if ok:
+            self.acquired[mode] += 1
+        else:
+            self.timeouts += 1
+
+
+class RepoLockManager:
+    """One reader/writer lock per working tree (keyed by realpath). Different repos never block each other."""
+
+    def __init__(self, timeout: float = REPO_LOCK_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._locks: Dict[str, _RWLock] = {}
+        self._stats: Dict[str, _RepoStats] = {}
+
+    @staticmethod
+    def key(path: Optional[str]) -> str:
+        return os.path.realpath(os.path.expanduser(path or os.getcwd()))
+
+    def _entry(self, key: str):
+        with self._lock:
+            if key not in self._locks:
+                self._locks[key] = _RWLock()
+                self._stats[key] = _RepoStats()
+            return self._locks[key], self._stats[key]
+
+    @contextmanager
+    def hold(self, path: Optional[str], mode: str = "write", timeout: Optional[float] = None):
+        """Hold the repo's lock in 'read' or 'write' mode; raises RepoLockTimeout if it cannot be taken in time."""
+        key = self.key(path)
+        lock, stats = self._entry(key)
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        acquire = lock.acquire_read if mode == "read" else lock.acquire_write
+        ok = acquire(timeout if timeout > 0 else None)
+        waited = time.monotonic() - started
+        with self._lock:
+            stats.record("read" if mode == "read" else "write", waited, ok)
+        if not ok:
+            raise RepoLockTimeout(f"repository {key} is busy (waited {waited:.1f}s for a {mode} lock)")
+        try:
+            yield key
+        finally:
+            if mode == "read":
+                lock.release_read()
+            else:
+                lock.release_write()
+
+    def read(self, path: Optional[str], timeout: Optional[float] = None):
+        return self.hold(path, "read", timeout)
+
+    def write(self, path: Optional[str], timeout: Optional[float] = None):
+        return self.hold(path, "write", timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            items = list(self._stats.items())
+            locks = dict(self._locks)
+        repos = {}
+        for key, s in items:
+            total = sum(s.acquired.values()) + s.timeouts
+            repos[key] = {
+                **s.acquired,
+                "contended": s.contended,
+                "timeouts": s.timeouts,
+                "wait_avg_ms": round(s.wait_total / total * 1000, 1) if total else None,
+                "wait_max_ms": round(s.wait_max * 1000, 1),
+                **locks[key].state(),
+            }
+        return {"timeout": self.timeout, "repos": repos}
+
+
+_MANAGER = RepoLockManager()
+
+
+def repo_lock(path: Optional[str], mode: str = "write", timeout: Optional[float] = None):
+    """Context manager for the shared lock manager, e.g. `with repo_lock(path, "read"): ...`."""
+    return _MANAGER.hold(path, mode, timeout)
+
+
+def lock_stats() -> dict:
+    return _MANAGER.stats()
@@ -0,0 +1,182 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from git import Repo
+
+from .config import REPO_POOL_SIZE
+
+
+@dataclass
+class RepoInfo:
+    """Remote metadata derived from a repo's config; refreshed when .git/config or HEAD change."""
+    owner: Optional[str]
+    name: Optional[str]
+    remote_url: Optional[str]
+    default_branch: Optional[str]
+    active_branch: Optional[str]
+
+
+@dataclass
+class _PoolEntry:
+    repo: Repo
+    stamp: Tuple[int, int]
+    info: Optional[RepoInfo] = None
+
+
+def parse_github_url(url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (owner, repo) from an ssh or https GitHub remote URL."""
+    if not url:
+        return None, None
+    if url.startswith("git@github.com:"):
+        path = url.split("git@github.com:")[-1]
+    elif "github.com/" in url:
+        path = url.split("github.com/")[-1]
+    else:
+        return None, None
+    if path.endswith(".git"):
+        path = path[:-4]
+    parts = path.split("/", 1)
+    if len(parts) != 2:
+        return None, None
+    return parts[0], parts[1]
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _read_symref(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.read().strip()
+    except OSError:
+        return None
+    if line.startswith("ref: "):
+        return line[5:]
+    return None
+
+
+class RepoPool:
+    """Process-wide LRU of git.Repo handles keyed by resolved path."""
+
+    def __init__(self, max_size: int = REPO_POOL_SIZE):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "info_refreshes": 0}
+
+    @staticmethod
+    def _stamp(repo: Repo) -> Tuple[int, int]:
+        common = getattr(repo, "common_dir", None) or repo.git_dir
+        return _mtime(os.path.join(common, "config")), _mtime(os.path.join(repo.git_dir, "HEAD"))
+
+    def get(self, path: Optional[str]) -> Repo:
+        """Return a cached Repo for path (cwd when None), opening it on first use. Raises like git.Repo(path)."""
+        key = os.path.realpath(path or os.getcwd())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and os.path.isdir(entry.repo.git_dir):
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.repo
+            if entry is not None:
+                # .git went away underneath us
+                self._drop(key)
+        repo = Repo(key)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread opened it first; keep one handle
+                repo.close()
+                return existing.repo
+            self._counters["misses"] += 1
+            self._entries[key] = _PoolEntry(repo=repo, stamp=self._stamp(repo))
+            while len(self._entries) > self.max_size:
+                old_key = next(iter(self._entries))
+                self._drop(old_key)
+                self._counters["evictions"] += 1
+        return repo
+
+    def info(self, path: Optional[str]) -> RepoInfo:
+        """Owner/repo/default-branch metadata, re-read only when .git/config or HEAD changed."""
+        repo = self.get(path)
+        key = os.path.realpath(path or os.getcwd())
+        stamp = self._stamp(repo)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.info is not None and entry.stamp == stamp:
+                return entry.info
+        info = self._read_info(repo)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.info = info
+                entry.stamp = stamp
+            self._counters["info_refreshes"] += 1
+        return info
+
+    @staticmethod
+    def _read_info(repo: Repo) -> RepoInfo:
+        url = None
+        try:
+            url = repo.remotes.origin.url
+        except Exception:
+            try:
+                remotes = list(repo.remotes)
+                url = remotes[0].url if remotes else None
+            except Exception:
+                url = None
+        owner, name = parse_github_url(url)
+        default_branch = None
+        origin_head = _read_symref(os.path.join(repo.git_dir, "refs", "remotes", "origin", "HEAD"))
+        if origin_head and origin_head.startswith("refs/remotes/origin/"):
+            default_branch = origin_head[len("refs/remotes/origin/"):]
+        head = _read_symref(os.path.join(repo.git_dir, "HEAD"))
+        active_branch = head[len("refs/heads/"):] if head and head.startswith("refs/heads/") else None
+        return RepoInfo(owner=owner, name=name, remote_url=url, default_branch=default_branch, active_branch=active_branch)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            try:
+                entry.repo.close()
+            except Exception:
+                pass
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Forget one path (or everything) so the next call re-discovers the repository."""
+        with self._lock:
+            if path is None:
+                for key in list(self._entries):
+                    self._drop(key)
+            else:
+                self._drop(os.path.realpath(path))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, **self._counters}
+
+
+_POOL = RepoPool()
+
+
+def get_repo(path: str) -> Repo:
+    return _POOL.get(path)
+
+
+def repo_info(path: str) -> RepoInfo:
+    return _POOL.info(path)
+
+
+def invalidate_repo(path: Optional[str] = None) -> None:
+    _POOL.invalidate(path)
+
+
+def pool_stats() -> dict:
+    return _POOL.stats()
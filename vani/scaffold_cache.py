@@ -0,0 +1,334 @@
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from .config import (
+    SCAFFOLD_CACHE_DIR,
+    SCAFFOLD_CACHE_MAX_ENTRIES,
+    SCAFFOLD_CACHE_MAX_AGE_DAYS,
+    SCAFFOLD_VERSION_TTL,
+)
+from .executors import PtyExecutor
+
+# npm package that generates each kind of project
+GENERATORS = {"vite": "create-vite", "next": "create-next-app"}
+# Package name used inside the pristine copy; replaced with the project name on clone
+_PLACEHOLDER = "vani-scaffold"
+_META = "meta.json"
+
+
+@dataclass
+class ScaffoldEntry:
+    generator: str
+    template: str
+    version: str
+    path: str
+    created_at: float
+    last_used: float
+    bytes: int = 0
+
+    @property
+    def key(self) -> str:
+        return _key(self.generator, self.template, self.version)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "key": self.key}
+
+
+def _key(generator: str, template: str, version: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", f"{generator}-{template}-{version}")
+
+
+def _generate_cmds(generator: str, template: str, version: str, workdir: str) -> List[str]:
+    # stdin from /dev/null keeps the generators non-interactive under the PTY
+    cd = f"cd {shlex.quote(workdir)}"
+    if generator == "vite":
+        return [
+            cd,
+            f"npm exec --yes -- create-vite@{version} {_PLACEHOLDER} --template {template} < /dev/null",
+            f"cd {_PLACEHOLDER} && npm install --no-audit --no-fund",
+        ]
+    # create-next-app installs dependencies itself; --yes takes the default options
+    return [cd, f"npm exec --yes -- create-next-app@{version} {_PLACEHOLDER} --yes --use-npm < /dev/null"]
+
+
+def _tree_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    # Dependencies are only read, so share them; project sources get private copies
+    if f"{os.sep}node_modules{os.sep}" in src:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # cross-device or unsupported filesystem
+    shutil.copy2(src, dst)
+
+
+def clone_tree(src: str, dest: str) -> str:
+    """Copy src to dest as cheaply as the filesystem allows. Returns the method used:
+    'clone' (APFS clonefile), 'reflink' (btrfs/xfs copy-on-write) or 'hardlink'.
+    """
+    cow = ["cp", "-c", "-R", src, dest] if sys.platform == "darwin" else ["cp", "-a", "--reflink=always", src, dest]
+    try:
+        if subprocess.run(cow, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+            return "clone" if sys.platform == "darwin" else "reflink"
+    except OSError:
+        pass
+    shutil.rmtree(dest, ignore_errors=True)
+    shutil.copytree(src, dest, symlinks=True, copy_function=_link_or_copy)
+    return "hardlink"
+
+
+def _npm_name(name: str) -> str:
+    name = re.sub(r"[^a-z0-9._~-]+", "-", name.lower()).strip("-._")
+    return name or "app"
+
+
+def rename_package(project_dir: str, name: str) -> None:
+    """Point package.json and package-lock.json at the new project name (new files, so hardlinks are not touched)."""
+    for filename in ("package.json", "package-lock.json"):
+        path = os.path.join(project_dir, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["name"] = name
+        if filename == "package-lock.json" and "" in data.get("packages", {}):
+            data["packages"][""]["name"] = name
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+
+
+class ScaffoldCache:
+    """Pristine generated projects (including node_modules) keyed by (generator, template, version).
+    New projects are cloned from an entry instead of re-running the generator and `npm install`.
+    Versions resolve through `npm view`; offline, the newest cached entry is used.
+    """
+
+    def __init__(
+        self,
+        root: str = SCAFFOLD_CACHE_DIR,
+        max_entries: int = SCAFFOLD_CACHE_MAX_ENTRIES,
+        max_age_days: float = SCAFFOLD_CACHE_MAX_AGE_DAYS,
+        version_ttl: float = SCAFFOLD_VERSION_TTL,
+    ):
+        self.root = os.path.expanduser(root)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.version_ttl = version_ttl
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._versions: Dict[str, tuple] = {}
+        self._refreshing: set = set()
+        self.stats = {"hits": 0, "misses": 0, "fills": 0, "refreshes": 0, "evictions": 0, "offline": 0}
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def latest_version(self, generator: str) -> Optional[str]:
+        """Latest published generator version, cached for version_ttl; None when npm is unreachable."""
+        now = time.time()
+        cached = self._versions.get(generator)
+        if cached and now - cached[1] < self.version_ttl:
+            return cached[0]
+        try:
+            out = subprocess.run(
+                ["npm", "view", GENERATORS[generator], "version"],
+                capture_output=True, text=True, timeout=15,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        version = out.stdout.strip()
+        if out.returncode != 0 or not re.fullmatch(r"[\w.+-]+", version or ""):
+            return None
+        self._versions[generator] = (version, now)
+        return version
+
+    def entries(self) -> List[ScaffoldEntry]:
+        found = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            meta = os.path.join(self.root, name, _META)
+            try:
+                with open(meta, "r", encoding="utf-8") as f:
+                    found.append(ScaffoldEntry(**{**json.load(f), "path": os.path.join(self.root, name, "project")}))
+            except (OSError, ValueError, TypeError):
+                continue  # partially written or foreign directory
+        return found
+
+    def _write_meta(self, entry: ScaffoldEntry) -> None:
+        meta = {k: v for k, v in asdict(entry).items() if k != "path"}
+        path = os.path.join(os.path.dirname(entry.path), _META)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _find(self, generator: str, template: str, version: Optional[str]) -> Optional[ScaffoldEntry]:
+        candidates = [e for e in self.entries() if e.generator == generator and e.template == template]
+        if version:
+            candidates = [e for e in candidates if e.version == version]
+        return max(candidates, key=lambda e: e.created_at, default=None)
+
+    def fill(self, generator: str, template: str, version: str) -> ScaffoldEntry:
+        """Generate a pristine project into the cache (replacing an existing entry for the same key)."""
+        os.makedirs(self.root, exist_ok=True)
+        key = _key(generator, template, version)
+        workdir = tempfile.mkdtemp(prefix=f".fill-{key}-", dir=self.root)
+        try:
+            print(f"Filling scaffold cache: {generator} {template} {version}")
+            result = PtyExecutor().run(_generate_cmds(generator, template, version, workdir))
+            if not result["ok"]:
+                raise RuntimeError(f"scaffold generation failed: {result.get('error')}")
+            os.rename(os.path.join(workdir, _PLACEHOLDER), os.path.join(workdir, "project"))
+            now = time.time()
+            entry = ScaffoldEntry(generator, template, version, os.path.join(workdir, "project"), now, now)
+            entry.bytes = _tree_bytes(entry.path)
+            self._write_meta(entry)
+            final = os.path.join(self.root, key)
+            with self._key_lock(key):
+                trash = None
+                if os.path.exists(final):
+                    trash = tempfile.mkdtemp(prefix=f".old-{key}-", dir=self.root)
+                    os.rename(final, os.path.join(trash, key))
+                os.rename(workdir, final)
+            if trash:
+                shutil.rmtree(trash, ignore_errors=True)
+            entry.path = os.path.join(final, "project")
+            self.stats["fills"] += 1
+            return entry
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _refresh_async(self, entry: ScaffoldEntry) -> None:
+        # Stale-while-revalidate: this request uses the old entry, later ones get the refreshed one
+        with self._lock:
+            if entry.key in self._refreshing:
+                return
+            self._refreshing.add(entry.key)
+
+        def work():
+            try:
+                self.fill(entry.generator, entry.template, entry.version)
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                print(f"Scaffold refresh failed for {entry.key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(entry.key)
+
+        threading.Thread(target=work, name=f"vani-scaffold-{entry.key}", daemon=True).start()
+
+    def get(self, generator: str, template: str) -> Optional[ScaffoldEntry]:
+        """Entry for the generator's latest version, filling it on a miss. Offline, falls back to the
+        newest cached entry for (generator, template); None when there is nothing usable.
+        """
+        if generator not in GENERATORS:
+            raise ValueError(f"unknown scaffold generator: {generator}")
+        version = self.latest_version(generator)
+        if version is None:
+            self.stats["offline"] += 1
+            entry = self._find(generator, template, None)
+            if entry:
+                self.stats["hits"] += 1
+            return entry
+        entry = self._find(generator, template, version)
+        if entry is None:
+            self.stats["misses"] += 1
+            entry = self.fill(generator, template, version)
+            self.evict()
+            return entry
+        self.stats["hits"] += 1
+        if time.time() - entry.created_at > self.max_age:
+            # Same generator version, but the template's dependency ranges may resolve newer packages
+            self._refresh_async(entry)
+        return entry
+
+    def create_project(self, generator: str, template: str, dest: str, name: Optional[str] = None) -> Optional[dict]:
+        """Clone a cached scaffold to dest and rename its package. None when no entry is available."""
+        dest = os.path.abspath(os.path.expanduser(dest))
+        if os.path.exists(dest):
+            raise FileExistsError(f"{dest} already exists")
+        entry = self.get(generator, template)
+        if entry is None:
+            return None
+        started = time.perf_counter()
+        with self._key_lock(entry.key):
+            method = clone_tree(entry.path, dest)
+            entry.last_used = time.time()
+            self._write_meta(entry)
+        rename_package(dest, _npm_name(name or os.path.basename(dest)))
+        return {
+            "path": dest,
+            "method": method,
+            "entry": entry.to_dict(),
+            "clone_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def evict(self) -> List[str]:
+        """Drop entries superseded by a newer version of the same template, then the least recently
+        used entries beyond max_entries. Age alone never evicts, so offline use keeps working.
+        """
+        entries = self.entries()
+        newest: Dict[tuple, ScaffoldEntry] = {}
+        for e in entries:
+            cur = newest.get((e.generator, e.template))
+            if cur is None or e.created_at > cur.created_at:
+                newest[(e.generator, e.template)] = e
+        keep = sorted(newest.values(), key=lambda e: e.last_used, reverse=True)[: max(1, self.max_entries)]
+        kept = {e.key for e in keep}
+        removed = []
+        for e in entries:
+            if e.key in kept:
+                continue
+            with self._key_lock(e.key):
+                shutil.rmtree(os.path.dirname(e.path), ignore_errors=True)
+            removed.append(e.key)
+        self.stats["evictions"] += len(removed)
+        return removed
+
+    def info(self) -> dict:
+        entries = self.entries()
+        return {
+            "root": self.root,
+            "entries": [e.to_dict() for e in sorted(entries, key=lambda e: e.key)],
+            "bytes": sum(e.bytes for e in entries),
+            **self.stats,
+        }
+
+
+_CACHE: Optional[ScaffoldCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> ScaffoldCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ScaffoldCache()
+        return _CACHE
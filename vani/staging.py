@@ -0,0 +1,102 @@
+import os
+import sys
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+
+from git import GitCommandError
+
+from .config import STAGE_BATCH_SIZE
+from .git_status import read_status
+from .repo_pool import get_repo
+
+
+@dataclass
+class StagePlan:
+    """Paths that differ between the working tree and the index, from one porcelain status pass."""
+    paths: List[str] = field(default_factory=list)
+    bytes: int = 0
+    deleted: int = 0
+    already_staged: int = 0
+
+
+@dataclass
+class StageResult:
+    paths_staged: int = 0
+    bytes_staged: int = 0
+    deleted_staged: int = 0
+    batches: int = 0
+    committed: bool = False
+    commit: Optional[str] = None
+    skipped: Optional[str] = None  # why no commit was made
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def plan_staging(repo_path: Optional[str] = None, files: Optional[List[str]] = None) -> StagePlan:
+    """Work out what `git add` needs to touch instead of rescanning the whole tree with `git add .`.
+    When files is given only those paths (or paths under those directories) are planned.
+    """
+    repo = get_repo(repo_path)
+    root = repo.working_tree_dir
+    status = read_status(repo_path, max_paths=sys.maxsize, untracked_all=True)
+    candidates = list(dict.fromkeys(status.unstaged + status.untracked + status.conflicted))
+    if files:
+        prefixes = [os.path.relpath(os.path.abspath(os.path.join(root, f)), root) for f in files]
+        candidates = [
+            p for p in candidates
+            if any(pre == "." or p == pre or p.startswith(pre.rstrip("/") + "/") for pre in prefixes)
+        ]
+    plan = StagePlan(paths=candidates, already_staged=status.staged_count)
+    for p in candidates:
+        try:
+            plan.bytes += os.lstat(os.path.join(root, p)).st_size
+        except FileNotFoundError:
+            plan.deleted += 1
+    return plan
+
+
+def index_matches_head(repo) -> bool:
+    try:
+        repo.git.diff("--cached", "--quiet")
+        return True
+    except GitCommandError:
+        # Exit status 1 means the index differs from HEAD
+        return False
+
+
+def stage_paths(repo, plan: StagePlan, batch_size: int = STAGE_BATCH_SIZE) -> StageResult:
+    """Stage plan.paths in batches (bounded argv); `git add` on a deleted path stages the removal."""
+    result = StageResult()
+    size = max(1, batch_size)
+    for i in range(0, len(plan.paths), size):
+        repo.git.add("-A", "--", *plan.paths[i:i + size])
+        result.batches += 1
+    result.paths_staged = len(plan.paths)
+    result.bytes_staged = plan.bytes
+    result.deleted_staged = plan.deleted
+    return result
+
+
+def stage_and_commit(
+    repo_path: Optional[str], commit_message: Optional[str] = None, files: Optional[List[str]] = None
+) -> StageResult:
+    """Stage only what changed, then commit unless the index already matches HEAD.
+    With commit_message=None nothing is committed (the `add` operation).
+    """
+    repo = get_repo(repo_path)
+    plan = plan_staging(repo_path, files)
+    result = stage_paths(repo, plan)
+    if commit_message is None:
+        return result
+    if repo.head.is_valid():
+        unchanged = index_matches_head(repo)
+    else:
+        # Unborn branch: only commit if something is in the index
+        unchanged = not (plan.paths or plan.already_staged)
+    if unchanged:
+        result.skipped = "nothing to commit"
+        return result
+    result.commit = repo.index.commit(commit_message).hexsha
+    result.committed = True
+    return result
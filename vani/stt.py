@@ -1,5 +1,10 @@
+import os
+import tempfile
 from typing import Tuple, Optional
 
+import numpy as np
+
+from .audio import save_wav_temp
 from .config import sarvam_client, SARVAM_MODEL, SARVAM_LANGUAGE_CODE, OPENAI_API_KEY, WHISPER_MODEL, STT_LANGUAGE
 
 
@@ -90,6 +95,18 @@ def transcribe_audio_with_lang(file_path: str) -> Tuple[str, Optional[str]]:
     return "", (STT_LANGUAGE if (STT_LANGUAGE and STT_LANGUAGE.lower() != "auto") else "en-IN")
 
 
+def transcribe_array(audio: np.ndarray) -> Tuple[str, Optional[str]]:
+    """transcribe_audio_with_lang for in-memory float32 mono audio at SAMPLE_RATE."""
+    fd, path = tempfile.mkstemp(suffix=".wav", prefix="vani-stt-")
+    os.close(fd)
+    try:
+        save_wav_temp(audio, path)
+        return transcribe_audio_with_lang(path)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
 # Preserve original API
 
 def transcribe_audio(file_path: str) -> str:
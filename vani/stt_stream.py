@@ -0,0 +1,436 @@
+import abc
+import base64
+import importlib.util
+import io
+import json
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from .config import (
+    SAMPLE_RATE,
+    STT_LANGUAGE,
+    STT_STREAMING,
+    STT_PARTIAL_STEP_MS,
+    STT_WINDOW_SECONDS,
+    STT_STREAM_FINAL_TIMEOUT,
+    VAD_ENERGY_THRESHOLD,
+    SARVAM_MODEL,
+    SARVAM_LANGUAGE_CODE,
+    WHISPER_MODEL,
+    sarvam_client,
+)
+from .stt import _extract_text_and_lang, transcribe_array
+from .vad import Endpointer
+
+_FRAME = SAMPLE_RATE * 30 // 1000
+
+
+@dataclass
+class Hypothesis:
+    text: str
+    language: Optional[str]
+    final: bool
+    # Leading part of text that is not expected to change any more (all of it once final)
+    stable: str = ""
+    audio_ms: float = 0.0
+    decode_ms: float = 0.0
+    backend: str = ""
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def _join(*parts: str) -> str:
+    return " ".join(p.strip() for p in parts if p and p.strip())
+
+
+def same_text(a: str, b: str) -> bool:
+    """Equal ignoring case, punctuation and spacing (partial and final decodes differ in these)."""
+    def norm(t: str) -> str:
+        return " ".join(re.sub(r"[^\w\s]", " ", (t or "").lower()).split())
+
+    return norm(a) == norm(b)
+
+
+def _voiced(audio: np.ndarray, threshold: float = VAD_ENERGY_THRESHOLD) -> bool:
+    """Whether any 30 ms frame of audio reaches the VAD energy threshold."""
+    n = len(audio) // _FRAME
+    if n == 0:
+        return len(audio) > 0 and float(np.sqrt(np.mean(audio * audio))) >= threshold
+    frames = audio[: n * _FRAME].reshape(n, _FRAME)
+    return bool((np.sqrt(np.mean(frames * frames, axis=1)) >= threshold).any())
+
+
+class StreamingRecognizer(abc.ABC):
+    """Audio frames in (float32 mono at SAMPLE_RATE), partial and final hypotheses out, for one
+    utterance. feed() only buffers and is cheap; partial() may block while decoding and returns
+    None when nothing changed; finish() returns the final hypothesis for all audio fed.
+    """
+
+    backend = "none"
+
+    def __init__(self):
+        self._buf_lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+        self._chunks: List[np.ndarray] = []
+        self._samples = 0
+        self._closed = False
+
+    def feed(self, samples: np.ndarray) -> None:
+        if len(samples) == 0:
+            return
+        with self._buf_lock:
+            self._chunks.append(np.asarray(samples, dtype=np.float32).reshape(-1))
+            self._samples += len(samples)
+
+    def audio(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        with self._buf_lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            whole = self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+        return whole[start:end]
+
+    def partial(self) -> Optional[Hypothesis]:
+        return None
+
+    @abc.abstractmethod
+    def finish(self) -> Hypothesis:
+        """Final hypothesis for all audio fed; each backend decodes (or waits for) it its own way."""
+
+    def close(self) -> None:
+        """Abandon the utterance (client went away) without producing a final result."""
+        self._closed = True
+
+
+# Local Whisper -------------------------------------------------------------------------------
+
+_WHISPER = None
+_WHISPER_LOCK = threading.Lock()
+_WHISPER_MISSING = False
+
+
+def whisper_available() -> bool:
+    """Whether local Whisper is installed (and its model has not failed to load)."""
+    return not _WHISPER_MISSING and importlib.util.find_spec("whisper") is not None
+
+
+def _whisper_model():
+    global _WHISPER, _WHISPER_MISSING
+    with _WHISPER_LOCK:
+        if _WHISPER is None and not _WHISPER_MISSING:
+            try:
+                import whisper
+
+                # WHISPER_MODEL defaults to the OpenAI API name, which is not a local checkpoint
+                name = WHISPER_MODEL if WHISPER_MODEL in whisper.available_models() else "base"
+                _WHISPER = whisper.load_model(name)
+            except Exception as e:
+                _WHISPER_MISSING = True
+                print(f"Local Whisper unavailable, streaming STT disabled: {e}")
+        return _WHISPER
+
+
+def _local_decode(audio: np.ndarray, prompt: str) -> Tuple[str, Optional[str], List[Tuple[float, str]]]:
+    """(text, language, [(segment end seconds, segment text), ...]) for one window of audio."""
+    model = _whisper_model()
+    if model is None:
+        # Only reached by a stream opened before the model failed to load; later ones use batch STT
+        text, lang = transcribe_array(audio)
+        return text, lang, []
+    lang = (STT_LANGUAGE or "").lower()
+    result = model.transcribe(
+        audio,
+        language=None if not lang or lang == "auto" else lang.split("-")[0],
+        initial_prompt=prompt or None,
+        condition_on_previous_text=False,
+        fp16=False,
+    )
+    segments = [(float(s["end"]), s["text"].strip()) for s in result.get("segments") or []]
+    return (result.get("text") or "").strip(), result.get("language"), segments
+
+
+class WhisperWindowRecognizer(StreamingRecognizer):
+    """Incremental decoding over a growing window. Every step_ms of new audio the window is
+    decoded again. Words that two consecutive decodes agree on are reported as stable. Once the
+    window is longer than window_s, every segment except the last is committed, and its audio is
+    dropped, so the cost of each decode stays bounded. The committed text is passed to the next
+    decode as a prompt.
+    """
+
+    backend = "whisper"
+
+    def __init__(
+        self,
+        decode: Optional[Callable[[np.ndarray, str], Tuple[str, Optional[str], list]]] = None,
+        step_ms: int = STT_PARTIAL_STEP_MS,
+        window_s: float = STT_WINDOW_SECONDS,
+    ):
+        super().__init__()
+        self._decode = decode or _local_decode
+        self.step = max(1, int(step_ms * SAMPLE_RATE / 1000))
+        self.window = max(self.step, int(window_s * SAMPLE_RATE))
+        self._offset = 0  # first sample not covered by committed text
+        self._committed = ""
+        self._decoded_to = 0
+        self._prev_words: List[str] = []
+        self._last: Optional[Hypothesis] = None
+
+    def _run(self, end: int, final: bool) -> Hypothesis:
+        committed = self._committed
+        t0 = time.perf_counter()
+        text, lang, segments = self._decode(self.audio(self._offset, end), committed)
+        decode_ms = round((time.perf_counter() - t0) * 1000, 1)
+        words = text.split()
+        agreed: List[str] = []
+        for a, b in zip(self._prev_words, words):
+            if a != b:
+                break
+            agreed.append(b)
+        self._prev_words = words
+        self._decoded_to = end
+        stable = _join(committed, " ".join(agreed))
+        # Once the window is full, commit all but its last segment and drop that audio
+        if not final and end - self._offset > self.window and len(segments) > 1:
+            done = segments[:-1]
+            self._committed = _join(committed, *(t for _, t in done))
+            self._offset += int(done[-1][0] * SAMPLE_RATE)
+            self._prev_words = segments[-1][1].split()
+            stable = self._committed
+        full = _join(committed, text)
+        return Hypothesis(
+            full, lang, final, full if final else stable, round(end * 1000 / SAMPLE_RATE, 1), decode_ms, self.backend
+        )
+
+    def partial(self) -> Optional[Hypothesis]:
+        with self._decode_lock:
+            end = self._samples
+            if self._closed or end - self._decoded_to < self.step:
+                return None
+            hyp = self._run(end, final=False)
+            changed = self._last is None or hyp.text != self._last.text or hyp.stable != self._last.stable
+            self._last = hyp
+            return hyp if changed else None
+
+    def finish(self) -> Hypothesis:
+        with self._decode_lock:
+            self._closed = True
+            end = self._samples
+            last = self._last
+            if last is not None and not _voiced(self.audio(self._decoded_to, end)):
+                # Only trailing silence since the last partial, so its text is already the final text
+                return Hypothesis(last.text, last.language, True, last.text, round(end * 1000 / SAMPLE_RATE, 1), 0.0, self.backend)
+            return self._run(end, final=True)
+
+
+# Sarvam streaming ----------------------------------------------------------------------------
+
+
+def _wav_b64(audio: np.ndarray) -> str:
+    buf = io.BytesIO()
+    sf.write(buf, audio, SAMPLE_RATE, format="WAV", subtype="PCM_16")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def sarvam_streaming_available() -> bool:
+    return sarvam_client is not None and hasattr(sarvam_client, "speech_to_text_streaming")
+
+
+class SarvamStreamRecognizer(StreamingRecognizer):
+    """Sarvam's streaming speech-to-text over a websocket. Audio is sent in chunk_ms pieces as it
+    is fed, and transcripts arrive in the background. If the stream fails or returns nothing,
+    finish() transcribes the buffered audio in one batch request.
+    """
+
+    backend = "sarvam"
+
+    def __init__(self, chunk_ms: int = STT_PARTIAL_STEP_MS, final_timeout: float = STT_STREAM_FINAL_TIMEOUT):
+        super().__init__()
+        self.chunk = max(1, int(chunk_ms * SAMPLE_RATE / 1000))
+        self.final_timeout = final_timeout
+        self._out: "queue.Queue" = queue.Queue()  # audio chunks to send; None ends the stream
+        self._sent = 0
+        self._segments: List[str] = []
+        self._lang: Optional[str] = None
+        self._changed = False
+        self._unanswered = 0  # chunks sent since the last transcript arrived
+        self._received = threading.Event()
+        self._done = threading.Event()
+        self._error: Optional[str] = None
+        self._final_wanted = True
+        threading.Thread(target=self._run, name="vani-stt-stream", daemon=True).start()
+
+    def feed(self, samples: np.ndarray) -> None:
+        super().feed(samples)
+        if self._samples - self._sent >= self.chunk:
+            self._send_pending()
+
+    def _send_pending(self) -> None:
+        end = self._samples
+        if end > self._sent:
+            self._out.put(self.audio(self._sent, end))
+            self._sent = end
+
+    def _run(self) -> None:
+        kwargs = {"model": SARVAM_MODEL}
+        if SARVAM_LANGUAGE_CODE and SARVAM_LANGUAGE_CODE.lower() != "auto":
+            kwargs["language_code"] = SARVAM_LANGUAGE_CODE
+        try:
+            with sarvam_client.speech_to_text_streaming.connect(**kwargs) as ws:
+                threading.Thread(target=self._receive, args=(ws,), name="vani-stt-recv", daemon=True).start()
+                while True:
+                    chunk = self._out.get()
+                    if chunk is None:
+                        break
+                    ws.transcribe(audio=_wav_b64(chunk), encoding="audio/wav", sample_rate=SAMPLE_RATE)
+                    with self._buf_lock:
+                        self._unanswered += 1
+                self._received.clear()
+                if self._unanswered and self._final_wanted:
+                    flush = getattr(ws, "flush", None)
+                    if callable(flush):
+                        flush()
+                    # Wait for the transcript of the last chunks, but never past the final timeout
+                    self._received.wait(self.final_timeout)
+        except Exception as e:
+            self._error = f"{e.__class__.__name__}: {e}"
+            print(f"Sarvam streaming STT failed: {e}")
+        finally:
+            self._done.set()
+
+    def _receive(self, ws) -> None:
+        while not self._done.is_set():
+            try:
+                msg = ws.recv()
+            except Exception:
+                return
+            if isinstance(msg, (str, bytes)):
+                try:
+                    msg = json.loads(msg)
+                except ValueError:
+                    continue
+            kind = msg.get("type") if isinstance(msg, dict) else getattr(msg, "type", None)
+            payload = msg.get("data") if isinstance(msg, dict) else getattr(msg, "data", None)
+            if kind == "error":
+                self._error = str(payload)
+                continue
+            text, lang = _extract_text_and_lang(payload if payload is not None else msg)
+            if text:
+                with self._buf_lock:
+                    self._segments.append(text)
+                    self._lang = lang
+                    self._changed = True
+                    self._unanswered = 0
+                self._received.set()
+
+    def partial(self) -> Optional[Hypothesis]:
+        with self._buf_lock:
+            if not self._changed:
+                return None
+            self._changed = False
+            text = _join(*self._segments)
+            lang = self._lang
+        # Each streamed transcript covers a finished stretch of speech, so it does not change later
+        return Hypothesis(text, lang, False, text, round(self._sent * 1000 / SAMPLE_RATE, 1), 0.0, self.backend)
+
+    def finish(self) -> Hypothesis:
+        with self._decode_lock:
+            self._closed = True
+            self._send_pending()
+            self._out.put(None)
+            self._done.wait(self.final_timeout + 5)
+            with self._buf_lock:
+                text = _join(*self._segments)
+                lang = self._lang
+            audio_ms = round(self._samples * 1000 / SAMPLE_RATE, 1)
+            if not text and (self._error or not self._done.is_set()) and _voiced(self.audio()):
+                t0 = time.perf_counter()
+                text, lang = transcribe_array(self.audio())
+                return Hypothesis(text, lang, True, text, audio_ms, round((time.perf_counter() - t0) * 1000, 1), "batch")
+            return Hypothesis(text, lang, True, text, audio_ms, 0.0, self.backend)
+
+    def close(self) -> None:
+        self._final_wanted = False
+        super().close()
+        self._out.put(None)
+
+
+def streaming_enabled(backend: Optional[str] = None) -> bool:
+    return (backend or STT_STREAMING or "auto").lower() not in {"off", "0", "false", "no"}
+
+
+def _stream_class(backend: Optional[str] = None) -> Optional[type]:
+    if not streaming_enabled(backend):
+        return None
+    mode = (backend or STT_STREAMING or "auto").lower()
+    if mode in {"auto", "sarvam"} and sarvam_streaming_available():
+        return SarvamStreamRecognizer
+    if mode in {"auto", "whisper"} and whisper_available():
+        return WhisperWindowRecognizer
+    return None
+
+
+def stream_available(backend: Optional[str] = None) -> bool:
+    """Whether open_stream would return a recognizer, i.e. streaming is on and a backend exists."""
+    return _stream_class(backend) is not None
+
+
+def open_stream(backend: Optional[str] = None) -> Optional[StreamingRecognizer]:
+    """A recognizer for one utterance, per STT_STREAMING (or backend). None when streaming is off
+    or no streaming backend exists: callers then transcribe the finished utterance once, rather
+    than sending the growing window to a batch API on every decode step.
+    """
+    cls = _stream_class(backend)
+    return cls() if cls is not None else None
+
+
+def listen(
+    on_partial: Optional[Callable[[Hypothesis], bool]] = None,
+    timeout: Optional[float] = None,
+    blocks: Optional[Iterable[np.ndarray]] = None,
+) -> Optional[Hypothesis]:
+    """Capture one utterance (from the microphone unless blocks are given) and recognize it while
+    it is spoken. Returns the final hypothesis at end of speech, or None if no speech started
+    within timeout seconds. on_partial may return True to stop early with that partial.
+    """
+    if blocks is None:
+        from .audio import microphone_blocks
+
+        blocks = microphone_blocks()
+    endpointer = Endpointer()
+    rec: Optional[StreamingRecognizer] = None
+    fed = 0
+    started = time.monotonic()
+    try:
+        for block in blocks:
+            for event in endpointer.feed(block):
+                if event.kind == "speech_start":
+                    rec, fed = open_stream(), 0
+                    continue
+                if rec is None:
+                    text, lang = transcribe_array(event.audio)
+                    return Hypothesis(text, lang, True, text, round(len(event.audio) * 1000 / SAMPLE_RATE, 1), backend="batch")
+                rec.feed(event.audio[fed:])
+                return rec.finish()
+            if endpointer.in_speech:
+                if rec is not None:
+                    rec.feed(endpointer.speech_audio(fed))
+                    fed = endpointer.speech_samples
+                    # Partials are only decoded for a consumer; otherwise finish() does all the work
+                    hyp = rec.partial() if on_partial is not None else None
+                    if hyp is not None and on_partial(hyp):
+                        rec.close()
+                        return hyp
+            elif timeout is not None and time.monotonic() - started > timeout:
+                return None
+    finally:
+        close = getattr(blocks, "close", None)
+        if callable(close):
+            close()
+    return None
@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from .events import bind_sink, current_sink, emit
+
+
+@dataclass
+class Step:
+    """A unit of work in a graph. fn receives {dependency name: its return value}."""
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    after: Tuple[str, ...] = ()
+
+
+def _run(step: Step, inputs: Dict[str, Any], sink, origin: float) -> dict:
+    started = time.perf_counter()
+    out = {"ok": True, "start_ms": round((started - origin) * 1000, 1)}
+    with bind_sink(sink):
+        emit("step", name=step.name, state="started")
+        try:
+            out["value"] = step.fn(inputs)
+        except Exception as e:
+            out.update({"ok": False, "error": str(e) or e.__class__.__name__, "exception": e})
+        out["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        emit("step", name=step.name, state="finished" if out["ok"] else "failed", ms=out["ms"])
+    return out
+
+
+def run_graph(steps: List[Step], max_workers: int = 4) -> Dict[str, dict]:
+    """Run steps as soon as their dependencies finish; independent steps run concurrently.
+    A step whose dependency failed is skipped. Returns {name: {ok, value, error, exception, skipped, start_ms, ms}}.
+    """
+    names = {s.name for s in steps}
+    for s in steps:
+        missing = set(s.after) - names
+        if missing:
+            raise ValueError(f"step {s.name} depends on unknown steps: {sorted(missing)}")
+    sink = current_sink()
+    origin = time.perf_counter()
+    results: Dict[str, dict] = {}
+    pending = {s.name: s for s in steps}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="vani-step") as pool:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, step in list(pending.items()):
+                    if any(d not in results for d in step.after):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    failed = [d for d in step.after if not results[d]["ok"]]
+                    if failed:
+                        results[name] = {"ok": False, "skipped": True, "error": f"skipped: {', '.join(failed)} failed", "ms": 0.0}
+                        continue
+                    inputs = {d: results[d].get("value") for d in step.after}
+                    running[pool.submit(_run, step, inputs, sink, origin)] = name
+            if not running:
+                if pending:
+                    raise ValueError(f"dependency cycle between steps: {sorted(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+    return results
+
+
+def timings(results: Dict[str, dict]) -> Dict[str, dict]:
+    """JSON-friendly step report without the step return values."""
+    return {name: {k: v for k, v in r.items() if k not in ("value", "exception")} for name, r in results.items()}
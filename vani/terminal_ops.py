@@ -1,10 +1,15 @@
 import os
+import re
+import shlex
 import time
-import subprocess
+from typing import Optional
 
 from .audio import record_audio_block, save_wav_temp, speak
+from .clarify import Slot, clarify, name_from_answer
 from .stt import transcribe_audio_with_lang
-from .config import TERMINAL_AUTO_APPROVE, sarvam_client
+from .config import SCAFFOLD_CACHE, TERMINAL_AUTO_APPROVE, sarvam_client
+from .executors import get_executor
+from .scaffold_cache import get_cache
 
 # Simple debounce to prevent multiple Terminal openings in quick succession
 _LAST_RUN_AT = 0.0
@@ -76,74 +81,105 @@ def _ask_and_listen(prompt: str, duration: float = 4.0) -> str:
     return text_en
 
 
+def _framework_from(text: str) -> Optional[str]:
+    for fw in ("react", "vue", "svelte"):
+        if fw in text:
+            return fw
+    if "vanilla" in text or "plain" in text or "basic" in text:
+        return "vanilla"
+    return None
+
+
+def _variant_from(text: str) -> Optional[str]:
+    if "typescript" in text or re.search(r"\bts\b", text):
+        return "ts"
+    if "javascript" in text or re.search(r"\bjs\b", text):
+        return "js"
+    return None
+
+
+# Words in a clarification answer that are never part of the project name
+_NAME_IGNORE = [
+    "react", "vue", "svelte", "vanilla", "plain", "basic", "javascript", "typescript", "js", "ts", "vite",
+    "use", "using", "with", "and", "in", "a", "an", "the", "it", "its", "please", "project", "app", "name",
+    "called", "named", "for", "my", "i", "want", "should", "be", "make", "framework", "is", "of", "ok", "okay",
+    "hmm", "um", "uh", "dunno", "don't", "know", "not", "sure", "whatever", "anything", "default", "yes", "no",
+]
+
+
 def _resolve_vite_template(args: dict) -> tuple[str, str]:
-    """Return (template, project_name). Ask user if missing.
+    """Return (template, project_name). Missing details are asked for together in one prompt.
     Maps framework+variant to Vite templates: react, react-ts, vue, vue-ts, svelte, svelte-ts, vanilla, vanilla-ts.
     """
     framework = (args.get("framework") or "").lower().strip()
     language = (args.get("language") or "").lower().strip()
     project_name = (args.get("project_name") or "").strip() or "voice-project"
 
-    # Determine framework
+    slots = []
     if framework not in {"react", "vue", "svelte", "vanilla"}:
-        said = _ask_and_listen(
-            "Which framework should I use: React, Vue, Svelte, or Vanilla?"
-        )
-        if "react" in said:
-            framework = "react"
-        elif "vue" in said:
-            framework = "vue"
-        elif "svelte" in said:
-            framework = "svelte"
-        elif "vanilla" in said or "plain" in said or "basic" in said:
-            framework = "vanilla"
-        else:
-            # Default to react if unclear
-            framework = "react"
-
-    # Determine variant JS or TS
-    variant = "js"
-    said2 = None
-    if not ("ts" in language or "typescript" in language or "js" in language or "javascript" in language):
-        said2 = _ask_and_listen("JavaScript or TypeScript?")
-    else:
-        said2 = language
-    if "ts" in said2 or "typescript" in said2:
-        variant = "ts"
-    else:
-        variant = "js"
-
-    # Confirm/ask project name if not set explicitly
+        slots.append(Slot("framework", "the framework (React, Vue, Svelte or Vanilla)", _framework_from, "react", "framework"))
+    variant = _variant_from(language)
+    if variant is None:
+        slots.append(Slot("variant", "whether to use JavaScript or TypeScript", _variant_from, "js", "language"))
     if not args.get("project_name"):
-        said3 = _ask_and_listen("What should be the project name?")
-        if said3 and len(said3) >= 2:
-            # Sanitize simple name (remove spaces)
-            project_name = "-".join(
-                [p for p in said3.strip().split() if p]
-            ).lower()
+        slots.append(Slot(
+            "project_name", "the project name",
+            lambda said: name_from_answer(said, _NAME_IGNORE), project_name, "project_name",
+        ))
+    if slots:
+        filled = clarify("vite_template", slots, _ask_and_listen, context="Create a Vite project")
+        framework = filled.get("framework", framework)
+        variant = filled.get("variant", variant)
+        project_name = filled.get("project_name", project_name)
 
     template = framework if variant == "js" else f"{framework}-ts"
     return template, project_name
 
 
+def _from_scaffold_cache(generator: str, template: str, project_name: str) -> list[str]:
+    """Clone a cached, pre-installed scaffold onto the Desktop; [] means generate from scratch."""
+    if not SCAFFOLD_CACHE:
+        return []
+    dest = os.path.join(os.path.expanduser("~/Desktop"), project_name)
+    if os.path.exists(dest):
+        return []
+    try:
+        created = get_cache().create_project(generator, template, dest)
+    except Exception as e:
+        print(f"Scaffold cache unavailable, generating from scratch: {e}")
+        return []
+    if not created:
+        return []
+    print(f"Created {dest} from cached {generator} {template} ({created['method']}, {created['clone_ms']} ms)")
+    return [f"cd {shlex.quote(dest)}", "npm run dev"]
+
+
 def _build_vite_cmds(template: str, project_name: str) -> list[str]:
+    cached = _from_scaffold_cache("vite", template, project_name)
+    if cached:
+        return cached
+    # --yes and stdin from /dev/null keep npm and the generator from waiting on prompts (nobody
+    # answers them under the PTY executor), as in scaffold_cache
     return [
         "cd ~/Desktop",
-        f"npm create vite@latest {project_name} -- --template {template}",
+        f"npm exec --yes -- create-vite@latest {project_name} --template {template} < /dev/null",
         f"cd {project_name} && npm install",
-        f"cd {project_name} && npm run dev",
+        "npm run dev",
     ]
 
 
 def _build_next_cmds(project_name: str) -> list[str]:
+    cached = _from_scaffold_cache("next", "default", project_name)
+    if cached:
+        return cached
     return [
         "cd ~/Desktop",
-        f"npm create next-app@latest {project_name}",
+        f"npm exec --yes -- create-next-app@latest {project_name} --yes --use-npm < /dev/null",
         f"cd {project_name} && npm run dev",
     ]
 
 
-def _create_program_file(language: str, file_base_name: str, description: str = "") -> None:
+def _create_program_file(language: str, file_base_name: str, description: str = "") -> str:
     """Create a single-source program file on the Desktop based on language and a short voice description."""
     # Determine language and file extension
     lang = (language or "").lower().strip()
@@ -214,22 +250,25 @@ def _create_program_file(language: str, file_base_name: str, description: str =
             f.write(code)
         print(f"Created program file: {path}")
         speak(f"Created the program file on your desktop: {safe_base}.{ext}")
+        return path
     except Exception as e:
         print(f"Failed to create file: {e}")
         speak("Sorry, I could not create the file.")
+        return ""
 
 
-def run_terminal_task(args: dict) -> None:
+def run_terminal_task(args: dict) -> dict:
+    """Create a program file or run a command plan in a terminal; returns a result dict."""
     global _LAST_RUN_AT
     # Debounce: skip if called again within a short interval
     now = time.time()
     if (now - _LAST_RUN_AT) < _DEBOUNCE_SECONDS:
         print("Skipping duplicate terminal task (debounced).")
-        return
+        return {"ok": False, "error": "debounced"}
 
     if not request_terminal_permission():
         print("Terminal permission denied.")
-        return
+        return {"ok": False, "error": "permission denied"}
 
     project_name = args.get("project_name", "voice-project")
     language = args.get("language", "python")
@@ -241,8 +280,8 @@ def run_terminal_task(args: dict) -> None:
         (args.get("description") or args.get("text") or args.get("problem") or args.get("prompt") or args.get("utterance") or "")
     ).strip()
     if not command and desc_arg:
-        _create_program_file(language, project_name, desc_arg)
-        return
+        path = _create_program_file(language, project_name, desc_arg)
+        return {"ok": bool(path), "file": path}
     if command:
         raw = (command or "").lower().strip()
         handled = False
@@ -285,8 +324,8 @@ def run_terminal_task(args: dict) -> None:
             )
             if not desc_arg or desc_arg.strip().lower() in {"create", "create_file", "write", "generate", "make", "program", "script", "code"}:
                 desc_arg = ""
-            _create_program_file(language, project_name, desc_arg)
-            return
+            path = _create_program_file(language, project_name, desc_arg)
+            return {"ok": bool(path), "file": path}
         # Normalize common requests only if not already handled
         if not handled:
             if "vite" in raw:
@@ -340,51 +379,36 @@ def run_terminal_task(args: dict) -> None:
             })
             cmds += _build_vite_cmds(template, final_name)
         elif language == "python" and framework == "fastapi":
+            # The working directory carries over between steps, so cd once; printf instead of a
+            # heredoc keeps the step valid when the Terminal backend joins steps with ";"
             cmds += [
-                f"mkdir -p {project_name}",
-                f"cd {project_name} && python3 -m venv venv && source venv/bin/activate && pip install fastapi uvicorn",
-                (f"cd {project_name} && " +
-                 "cat > main.py << 'PY'\nfrom fastapi import FastAPI\napp = FastAPI()\n@app.get('/')\ndef read_root():\n    return {'hello': 'world'}\nPY"),
-                f"cd {project_name} && uvicorn main:app --reload"
+                f"mkdir -p {project_name} && cd {project_name}",
+                "python3 -m venv venv && venv/bin/pip install fastapi uvicorn",
+                ("printf '%s\\n' \"from fastapi import FastAPI\" \"app = FastAPI()\" \"@app.get('/')\" "
+                 "\"def read_root():\" \"    return {'hello': 'world'}\" > main.py"),
+                "venv/bin/uvicorn main:app --reload",
             ]
         else:
             cmds.append(f"echo 'No predefined flow for {language} {framework}. Provide command.'")
 
-    script = " ; ".join(cmds)
-    if not script.strip():
+    if not any(c.strip() for c in cmds):
         print("No commands to run.")
-        return
-    # Escape for AppleScript string
-    script_escaped = script.replace("\\", "\\\\").replace("\"", "\\\"")
-    # Reuse existing window if Terminal is open; otherwise create one
-    osa_args = [
-        "osascript",
-        "-e",
-        'tell application "Terminal"',
-        "-e",
-        f'set cmd to "{script_escaped}"',
-        "-e",
-        'if (count of windows) is 0 then',
-        "-e",
-        'do script cmd',
-        "-e",
-        'else',
-        "-e",
-        'do script cmd in front window',
-        "-e",
-        'end if',
-        "-e",
-        'activate',
-        "-e",
-        'end tell',
-    ]
-    ret = subprocess.run(osa_args).returncode
-    if ret != 0:
-        print(f"AppleScript failed with status {ret}.")
-        return
-    print("Opened Terminal with commands:")
-    for c in cmds:
-        print("- ", c)
+        return {"ok": False, "error": "no commands"}
+    try:
+        executor = get_executor()
+    except ValueError as e:
+        print(f"Terminal backend error: {e}")
+        return {"ok": False, "commands": cmds, "error": str(e)}
+    result = executor.run(cmds)
+    if not result.get("ok"):
+        if executor.name != "applescript":
+            speak(f"The command plan stopped: {result.get('error', 'a step failed')}.")
+        return result
     # Update debounce timestamp
     _LAST_RUN_AT = now
-    # Do not speak here to avoid unnecessary chatter
\ No newline at end of file
+    if result.get("services"):
+        speak("Done. The server is running in the background.")
+    elif executor.name != "applescript":
+        speak("All commands finished.")
+    # Do not speak for the Terminal backend; the user watches the window
+    return result
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .config import SAMPLE_RATE, VAD_ENERGY_THRESHOLD, VAD_END_SILENCE_MS, VAD_MAX_UTTERANCE_SECONDS
+
+_FRAME_MS = 30
+
+
+@dataclass
+class VadEvent:
+    kind: str  # "speech_start" or "utterance"
+    audio: Optional[np.ndarray] = None  # float32 mono, set for "utterance"
+    truncated: bool = False
+
+
+class Endpointer:
+    """Energy-based endpointing over a stream of float32 mono samples.
+    Emits speech_start when voice begins and an utterance once trailing silence
+    reaches end_silence_ms (or the utterance hits max_seconds, which bounds memory).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        threshold: float = VAD_ENERGY_THRESHOLD,
+        end_silence_ms: int = VAD_END_SILENCE_MS,
+        max_seconds: float = VAD_MAX_UTTERANCE_SECONDS,
+        preroll_ms: int = 300,
+        start_frames: int = 3,
+    ):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.frame_len = sample_rate * _FRAME_MS // 1000
+        self.end_frames = max(1, end_silence_ms // _FRAME_MS)
+        self.max_frames = max(1, int(max_seconds * 1000 // _FRAME_MS))
+        self.preroll_frames = max(0, preroll_ms // _FRAME_MS)
+        self.start_frames = max(1, start_frames)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        self.in_speech = False
+        self._frames: List[np.ndarray] = []
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    @property
+    def speech_samples(self) -> int:
+        return len(self._frames) * self.frame_len
+
+    def speech_audio(self, start: int = 0) -> np.ndarray:
+        """Audio of the utterance in progress from sample offset start (empty outside speech)."""
+        frames = self._frames[start // self.frame_len:]
+        if not frames:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(frames)[start % self.frame_len:]
+
+    def feed(self, samples: np.ndarray) -> List[VadEvent]:
+        events: List[VadEvent] = []
+        buf = np.concatenate([self._pending, samples.astype(np.float32, copy=False)])
+        n = len(buf) // self.frame_len
+        for i in range(n):
+            frame = buf[i * self.frame_len:(i + 1) * self.frame_len]
+            ev = self._frame(frame)
+            if ev is not None:
+                events.append(ev)
+        self._pending = buf[n * self.frame_len:]
+        return events
+
+    def flush(self) -> Optional[VadEvent]:
+        """Force an endpoint (client said the utterance is over)."""
+        if not self.in_speech:
+            self.reset()
+            return None
+        return self._finish(truncated=False)
+
+    def _frame(self, frame: np.ndarray) -> Optional[VadEvent]:
+        voiced = float(np.sqrt(np.mean(frame * frame))) >= self.threshold
+        if not self.in_speech:
+            # Keep a short pre-roll so the first syllable is not clipped
+            self._frames.append(frame)
+            if len(self._frames) > self.preroll_frames + self.start_frames:
+                self._frames.pop(0)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                self.in_speech = True
+                self._silent_run = 0
+                return VadEvent("speech_start")
+            return None
+        self._frames.append(frame)
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self.end_frames:
+            return self._finish(truncated=False)
+        if len(self._frames) >= self.max_frames:
+            return self._finish(truncated=True)
+        return None
+
+    def _finish(self, truncated: bool) -> VadEvent:
+        audio = self.speech_audio()
+        self.reset()
+        return VadEvent("utterance", audio=audio, truncated=truncated)
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Optional, Set, Tuple
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+
+from .commands import prepare_intent, dispatch_in_context
+from .context import drop_context
+from .config import (
+    SAMPLE_RATE,
+    VOICE_WS_MAX_PENDING_FRAMES,
+    VOICE_WS_MAX_FRAME_BYTES,
+    VOICE_PARTIAL_INTERVAL,
+    STT_EARLY_INTENT,
+)
+from .intent import parse_intent
+from .jobs import QueueFull, get_manager
+from .pools import AUDIO_EXECUTOR, run_in
+from .stt import transcribe_array
+from .stt_stream import StreamingRecognizer, Hypothesis, open_stream, same_text
+from .vad import Endpointer
+
+# Protocol
+#   connect:          /ws/voice?session=<id> keeps conversational context across reconnects (default: per connection)
+#   client -> server: binary frames of 16 kHz mono int16 little-endian PCM;
+#                     text {"type": "flush"} ends the current utterance, {"type": "close"} ends the session.
+#   server -> client: JSON messages: ready, vad, transcript (final true/false; partials carry the
+#                     stable prefix), intent_guess (parsed early from a stable partial), intent, job,
+#                     job events (spoken, progress, ...), result, error.
+
+_CLOSE = object()
+
+
+def _dispatch(intent, session_id: str):
+    return dispatch_in_context(intent, session_id)[1]
+
+
+class VoiceSession:
+    """One /ws/voice connection: bounded frame inbox, endpointing, then STT -> intent -> dispatch."""
+
+    def __init__(self, ws: WebSocket):
+        self.ws = ws
+        # Bounded inbox: when full the reader stops receiving, which pushes back on the client via TCP
+        self.inbox: "asyncio.Queue" = asyncio.Queue(maxsize=VOICE_WS_MAX_PENDING_FRAMES)
+        self.endpointer = Endpointer()
+        self._partial_task: Optional[asyncio.Task] = None
+        self._last_partial = 0.0
+        # Streaming recognizer for the utterance in progress, and how many of its samples it has seen
+        self._stream: Optional[StreamingRecognizer] = None
+        self._fed = 0
+        self._guess: Optional[Tuple[str, asyncio.Task]] = None
+        # Dispatch-and-relay tasks of this connection, and the latest one (the next command waits for it)
+        self._jobs: Set[asyncio.Task] = set()
+        self._last_job: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+        self._own_session = not ws.query_params.get("session")
+        self.session_id = ws.query_params.get("session") or f"ws-{uuid.uuid4().hex[:12]}"
+
+    async def send(self, message: dict) -> None:
+        async with self._send_lock:
+            await self.ws.send_text(json.dumps(message, default=str))
+
+    async def run(self) -> None:
+        await self.ws.accept()
+        await self.send({
+            "type": "ready", "sample_rate": SAMPLE_RATE, "encoding": "pcm_s16le", "channels": 1, "session": self.session_id,
+        })
+        reader = asyncio.create_task(self._read())
+        try:
+            await self._process()
+            # Deliver the results of commands already spoken before closing
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+        finally:
+            reader.cancel()
+            for task in list(self._jobs):
+                task.cancel()
+            if self._partial_task is not None:
+                self._partial_task.cancel()
+            if self._stream is not None:
+                self._stream.close()
+            if self._guess is not None:
+                self._guess[1].cancel()
+            if self._own_session:
+                drop_context(self.session_id)
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                msg = await self.ws.receive()
+                if msg.get("type") == "websocket.disconnect":
+                    break
+                data = msg.get("bytes")
+                if data is not None:
+                    if len(data) > VOICE_WS_MAX_FRAME_BYTES:
+                        await self.send({"type": "error", "error": f"frame larger than {VOICE_WS_MAX_FRAME_BYTES} bytes"})
+                        continue
+                    await self.inbox.put(data)
+                    continue
+                try:
+                    control = json.loads(msg.get("text") or "{}")
+                except ValueError:
+                    control = {}
+                if control.get("type") == "close":
+                    break
+                await self.inbox.put(control)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await self.inbox.put(_CLOSE)
+
+    async def _process(self) -> None:
+        while True:
+            item = await self.inbox.get()
+            if item is _CLOSE:
+                event = self.endpointer.flush()
+                if event is not None:
+                    await self._handle_utterance(event.audio, truncated=False)
+                return
+            if isinstance(item, dict):
+                if item.get("type") == "flush":
+                    event = self.endpointer.flush()
+                    if event is not None:
+                        await self._handle_utterance(event.audio, truncated=False)
+                continue
+            samples = np.frombuffer(item, dtype="<i2").astype(np.float32) / 32768.0
+            for event in self.endpointer.feed(samples):
+                if event.kind == "speech_start":
+                    self._last_partial = time.monotonic()
+                    self._stream, self._fed, self._guess = open_stream(), 0, None
+                    await self.send({"type": "vad", "state": "speech_start"})
+                else:
+                    await self.send({"type": "vad", "state": "speech_end", "truncated": event.truncated})
+                    await self._handle_utterance(event.audio, truncated=event.truncated)
+            if self._stream is not None and self.endpointer.in_speech:
+                self._stream.feed(self.endpointer.speech_audio(self._fed))
+                self._fed = self.endpointer.speech_samples
+            self._maybe_partial()
+
+    def _maybe_partial(self) -> None:
+        if VOICE_PARTIAL_INTERVAL <= 0 or not self.endpointer.in_speech:
+            return
+        if self._partial_task is not None and not self._partial_task.done():
+            return
+        if self._stream is not None:
+            # The recognizer decides when there is enough new audio to decode
+            self._partial_task = asyncio.create_task(self._stream_partial(self._stream))
+            return
+        if time.monotonic() - self._last_partial < VOICE_PARTIAL_INTERVAL:
+            return
+        self._last_partial = time.monotonic()
+        self._partial_task = asyncio.create_task(self._partial(self.endpointer.speech_audio()))
+
+    async def _partial(self, audio: np.ndarray) -> None:
+        try:
+            text, lang = await run_in(AUDIO_EXECUTOR, transcribe_array, audio)
+        except Exception:
+            return
+        if text:
+            await self.send({"type": "transcript", "final": False, "text": text, "language": lang})
+
+    async def _stream_partial(self, stream: StreamingRecognizer) -> None:
+        try:
+            hyp = await run_in(AUDIO_EXECUTOR, stream.partial)
+        except Exception:
+            return
+        if hyp is None or not hyp.text:
+            return
+        await self.send({
+            "type": "transcript", "final": False, "text": hyp.text, "stable": hyp.stable,
+            "language": hyp.language, "backend": hyp.backend,
+        })
+        self._maybe_guess(hyp)
+
+    def _maybe_guess(self, hyp: Hypothesis) -> None:
+        # Only when the whole partial is stable, and only for English (other languages are
+        # translated first, which needs the final text)
+        if not STT_EARLY_INTENT or not hyp.stable or hyp.stable != hyp.text:
+            return
+        if not (hyp.language or "en").lower().startswith("en"):
+            return
+        if self._guess is not None:
+            if same_text(self._guess[0], hyp.text):
+                return
+            self._guess[1].cancel()
+        self._guess = (hyp.text, asyncio.create_task(self._guess_intent(hyp.text)))
+
+    async def _guess_intent(self, text: str):
+        intent = await run_in(AUDIO_EXECUTOR, parse_intent, text)
+        await self.send({"type": "intent_guess", "text": text, "intent": intent.intent, "args": intent.args})
+        return intent
+
+    async def _early_intent(self, text: str):
+        """The intent guessed from a partial that matches the final text, else None."""
+        guess, self._guess = self._guess, None
+        if guess is None:
+            return None
+        if not same_text(guess[0], text):
+            guess[1].cancel()
+            return None
+        try:
+            return await guess[1]
+        except Exception:
+            return None
+
+    async def _handle_utterance(self, audio: np.ndarray, truncated: bool) -> None:
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+            self._partial_task = None
+        stream, self._stream = self._stream, None
+        started = time.perf_counter()
+        try:
+            if stream is not None:
+                # Most of the utterance has been decoded already; only the tail is left
+                stream.feed(audio[self._fed:])
+                hyp = await run_in(AUDIO_EXECUTOR, stream.finish)
+                text, lang, backend = hyp.text, hyp.language, hyp.backend
+            else:
+                text, lang = await run_in(AUDIO_EXECUTOR, transcribe_array, audio)
+                backend = "batch"
+        except Exception as e:
+            await self.send({"type": "error", "stage": "stt", "error": str(e)})
+            return
+        await self.send({
+            "type": "transcript",
+            "final": True,
+            "text": text,
+            "language": lang,
+            "truncated": truncated,
+            "backend": backend,
+            "stt_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        if not text:
+            if self._guess is not None:
+                self._guess[1].cancel()
+                self._guess = None
+            return
+        early = await self._early_intent(text)
+        try:
+            english_text, intent = await run_in(AUDIO_EXECUTOR, prepare_intent, text, lang, self.session_id, early)
+        except Exception as e:
+            await self.send({"type": "error", "stage": "intent", "error": str(e)})
+            return
+        await self.send({
+            "type": "intent", "text": english_text, "intent": intent.intent, "args": intent.args, "early": early is not None,
+        })
+        # Dispatch and relay job events from a task so audio and control frames keep flowing while
+        # the command runs; a session's commands still run in order, since follow-ups use its context
+        task = asyncio.create_task(self._run_job(intent, english_text, self._last_job))
+        self._last_job = task
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _run_job(self, intent, english_text: str, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            try:
+                # The remote client plays replies itself, so keep the host silent
+                job = get_manager().submit(
+                    "voice", _dispatch, intent, self.session_id, params={"text": english_text}, mute_speech=True
+                )
+            except QueueFull as e:
+                await self.send({"type": "error", "stage": "dispatch", "error": str(e)})
+                return
+            await self.send({"type": "job", "job_id": job.id})
+            seq = 0
+            while True:
+                batch = job.events_since(seq)
+                for event in batch:
+                    seq = event["seq"] + 1
+                    if event["type"] == "finished":
+                        await self.send({"type": "result", "job_id": job.id, **{k: v for k, v in event.items() if k != "type"}})
+                        return
+                    await self.send({**event, "job_id": job.id})
+                if not batch:
+                    await asyncio.sleep(0.05)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # client went away; a submitted job keeps running
+
+
+async def voice_endpoint(ws: WebSocket) -> None:
+    await VoiceSession(ws).run()
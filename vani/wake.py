@@ -5,9 +5,10 @@ from difflib import SequenceMatcher
 from .config import WAKE_WORD, ACTIVE_WINDOW_SECONDS, USER_NAME, sarvam_client
 from .audio import record_audio_block, save_wav_temp, speak, set_language_code
 from .stt import transcribe_audio_with_lang
+from .stt_stream import listen, stream_available
 
 
-def _is_wake_detected(text: str, language_code: str) -> bool:
+def _is_wake_detected(text: str, language_code: str, translate: bool = True) -> bool:
     t = (text or "").lower().strip()
     # Simple direct check in English
     if WAKE_WORD in t:
@@ -47,7 +48,8 @@ def _is_wake_detected(text: str, language_code: str) -> bool:
     except Exception:
         pass
     # If Sarvam is available, translate the wake word to the detected language and compare
-    if sarvam_client is not None and language_code:
+    # (skipped for partial transcripts, which arrive several times a second)
+    if translate and sarvam_client is not None and language_code:
         try:
             resp = sarvam_client.text.translate(
                 input=WAKE_WORD,
@@ -73,9 +75,32 @@ def _is_wake_detected(text: str, language_code: str) -> bool:
     return False
 
 
+def _activate(lang_code: str) -> float:
+    active_until_ts = time.time() + ACTIVE_WINDOW_SECONDS
+    print("Wake word detected. Agent active for 2 minutes.")
+    # Set current language for speech responses
+    set_language_code(lang_code)
+    speak(f"Hey {USER_NAME}, how can I help you today?")
+    return active_until_ts
+
+
+def _wait_for_wake_streaming() -> float:
+    # Partials are checked as they arrive, so the wake word is usually caught before the speaker stops
+    while True:
+        hyp = listen(on_partial=lambda h: _is_wake_detected(h.text, h.language, translate=False))
+        if hyp is None:
+            continue
+        print(f"Heard (wake{'' if hyp.final else ', partial'}): {hyp.text} | language_code={hyp.language}")
+        if not hyp.final or (hyp.text and _is_wake_detected(hyp.text, hyp.language)):
+            return _activate(hyp.language)
+        print("Wake not detected. Say 'hello vani' clearly near the microphone.")
+
+
 def wait_for_wake() -> float:
     """Block until the wake word is detected, then return active_until timestamp."""
     print(f"Say the wake word to start: '{WAKE_WORD}'")
+    if stream_available():
+        return _wait_for_wake_streaming()
     while True:
         audio = record_audio_block(duration_sec=3.5)
         tmp = "./wake.wav"
@@ -90,11 +115,6 @@ def wait_for_wake() -> float:
             if os.path.exists(tmp):
                 os.remove(tmp)
         if text and _is_wake_detected(text, lang_code):
-            active_until_ts = time.time() + ACTIVE_WINDOW_SECONDS
-            print("Wake word detected. Agent active for 2 minutes.")
-            # Set current language for speech responses
-            set_language_code(lang_code)
-            speak(f"Hey {USER_NAME}, how can I help you today?")
-            return active_until_ts
+            return _activate(lang_code)
         else:
             print("Wake not detected. Say 'hello vani' clearly near the microphone.")
\ No newline at end of file
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .config import WORKSPACE_ROOT, WORKSPACE_MAX_DEPTH, WORKSPACE_WORKERS, WORKSPACE_REPO_TIMEOUT
+from .events import emit
+from .git_status import read_status
+from .repo_locks import repo_lock
+from .repo_pool import get_repo
+
+OPERATIONS = {"status", "fetch", "pull"}
+# Never worth descending into when looking for repos
+_SKIP_DIRS = {"node_modules", "__pycache__", "venv", ".venv", "dist", "build", "target"}
+
+
+@dataclass
+class _DirEntry:
+    mtime: int
+    is_repo: bool
+    children: List[str] = field(default_factory=list)
+
+
+class RepoIndex:
+    """Cached list of git repos under a root. A refresh only re-lists directories whose mtime
+    changed (a repo added, removed or renamed changes its parent's mtime); unchanged ones cost a stat.
+    """
+
+    def __init__(self, max_depth: int = WORKSPACE_MAX_DEPTH):
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, _DirEntry] = {}
+        self.scans = 0
+        self.listings = 0
+
+    def repos(self, root: str) -> List[str]:
+        root = os.path.realpath(os.path.expanduser(root))
+        found: List[str] = []
+        seen = set()
+        with self._lock:
+            self.scans += 1
+            self._walk(root, 0, found, seen)
+            # Forget directories under this root that no longer exist
+            for path in [p for p in self._dirs if (p == root or p.startswith(root + os.sep)) and p not in seen]:
+                del self._dirs[path]
+        return sorted(found)
+
+    def _walk(self, path: str, depth: int, found: List[str], seen: set) -> None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        seen.add(path)
+        entry = self._dirs.get(path)
+        if entry is None or entry.mtime != mtime:
+            entry = self._list(path, mtime)
+            self._dirs[path] = entry
+        if entry.is_repo:
+            found.append(path)
+            return  # nested repos (submodules, vendored checkouts) belong to their parent
+        if depth >= self.max_depth:
+            return
+        for child in entry.children:
+            self._walk(os.path.join(path, child), depth + 1, found, seen)
+
+    def _list(self, path: str, mtime: int) -> _DirEntry:
+        self.listings += 1
+        is_repo = os.path.exists(os.path.join(path, ".git"))
+        # Bare repos (e.g. local mirrors) have no working tree; skip them without descending
+        bare = not is_repo and os.path.isfile(os.path.join(path, "HEAD")) and os.path.isdir(os.path.join(path, "objects"))
+        children: List[str] = []
+        if not is_repo and not bare:
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False) and not e.name.startswith(".") and e.name not in _SKIP_DIRS:
+                            children.append(e.name)
+            except OSError:
+                pass
+        return _DirEntry(mtime=mtime, is_repo=is_repo, children=sorted(children))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"directories": len(self._dirs), "scans": self.scans, "listings": self.listings}
+
+
+_INDEX = RepoIndex()
+
+
+def workspace_root(root: Optional[str] = None) -> str:
+    return os.path.realpath(os.path.expanduser(root or WORKSPACE_ROOT or os.getcwd()))
+
+
+def discover_repos(root: Optional[str] = None) -> List[str]:
+    return _INDEX.repos(workspace_root(root))
+
+
+def index_stats() -> dict:
+    return _INDEX.stats()
+
+
+def _error_line(e: Exception) -> str:
+    text = str(e).strip()
+    return text.splitlines()[-1].strip() if text else e.__class__.__name__
+
+
+def _run_one(path: str, operation: str, timeout: float) -> dict:
+    started = time.perf_counter()
+    result = {"path": path, "name": os.path.basename(path), "ok": False}
+    try:
+        if operation != "status":
+            # fetch only touches refs, but pull rewrites the tree; both exclude concurrent local writers
+            with repo_lock(path, "write", timeout=timeout):
+                repo = get_repo(path)
+                if not repo.remotes:
+                    result["skipped"] = "no remote"
+                elif operation == "fetch":
+                    repo.git.fetch("--prune", kill_after_timeout=timeout)
+                else:
+                    repo.git.pull("--ff-only", kill_after_timeout=timeout)
+    except Exception as e:
+        result["error"] = _error_line(e)
+    try:
+        # Report status even when fetch/pull failed so the summary still shows dirty/behind repos
+        with repo_lock(path, "read", timeout=timeout):
+            status = read_status(path, timeout=timeout)
+        result.update({
+            "ok": "error" not in result,
+            "branch": status.branch,
+            "upstream": status.upstream,
+            "ahead": status.ahead,
+            "behind": status.behind,
+            "dirty": not status.clean,
+            "staged": status.staged_count,
+            "unstaged": status.unstaged_count,
+            "untracked": status.untracked_count,
+            "conflicted": status.conflicted_count,
+        })
+    except Exception as e:
+        result.setdefault("error", _error_line(e))
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def summarize(results: List[dict], operation: str) -> str:
+    """One sentence for speech, e.g. '12 repos: 3 behind, 1 ahead, 1 dirty, 1 failed.'"""
+    if not results:
+        return "I found no git repositories in the workspace."
+    n = len(results)
+    counts = [
+        (sum(1 for r in results if r.get("behind")), "behind"),
+        (sum(1 for r in results if r.get("ahead")), "ahead"),
+        (sum(1 for r in results if r.get("dirty")), "dirty"),
+        (sum(1 for r in results if not r["ok"]), "failed"),
+    ]
+    parts = [f"{c} {label}" for c, label in counts if c]
+    noun = "repo" if n == 1 else "repos"
+    verb = {"status": "Checked", "fetch": "Fetched", "pull": "Pulled"}[operation]
+    if not parts:
+        return f"{verb} {n} {noun}. All clean and up to date."
+    return f"{verb} {n} {noun}: " + ", ".join(parts) + "."
+
+
+def run_workspace(
+    operation: str = "status",
+    root: Optional[str] = None,
+    workers: int = WORKSPACE_WORKERS,
+    timeout: float = WORKSPACE_REPO_TIMEOUT,
+) -> dict:
+    """Run status/fetch/pull on every repo under root concurrently and aggregate the results."""
+    if operation not in OPERATIONS:
+        raise ValueError(f"unsupported workspace operation: {operation}")
+    started = time.perf_counter()
+    root = workspace_root(root)
+    repos = _INDEX.repos(root)
+    results: List[dict] = []
+    if repos:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(repos))), thread_name_prefix="vani-ws") as pool:
+            futures = [pool.submit(_run_one, path, operation, timeout) for path in repos]
+            for fut in as_completed(futures):
+                r = fut.result()
+                results.append(r)
+                emit("repo_done", **r)
+    results.sort(key=lambda r: r["path"])
+    return {
+        "operation": operation,
+        "root": root,
+        "count": len(results),
+        "behind": [r["name"] for r in results if r.get("behind")],
+        "ahead": [r["name"] for r in results if r.get("ahead")],
+        "dirty": [r["name"] for r in results if r.get("dirty")],
+        "failed": [r["name"] for r in results if not r["ok"]],
+        "summary": summarize(results, operation),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "repos": results,
+    }